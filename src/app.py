@@ -5,7 +5,7 @@ import math
 import os
 import subprocess
 import json
-from sounds import SoundManager
+from sounds import MusicService, SoundManager
 
 # Initialize Pygame
 pygame.init()
@@ -20,7 +20,8 @@ ASSETS_DIR = os.path.join(BASE_DIR, "assets")
 SPRITES_DIR = os.path.join(ASSETS_DIR, "sprites")
 
 sound = SoundManager()
-sound.play_music()
+music = MusicService()
+music.play("game")
 
 # Load settings
 SETTINGS_FILE = os.path.join(BASE_DIR, "settings.json")
@@ -42,7 +43,7 @@ def load_settings():
                     settings["sound"].update(loaded["sound"])
         except:
             pass
-    pygame.mixer.music.set_volume(settings["sound"]["music"])
+    music.set_volume(settings["sound"]["music"])
 
 def save_settings():
     try:
@@ -955,7 +956,7 @@ while running:
                     # Calculate volume based on click position
                     relative_x = max(0, min(mouse_x - vol_bar_x, vol_bar_width))
                     settings["sound"]["music"] = relative_x / vol_bar_width
-                    pygame.mixer.music.set_volume(0.0 if settings["sound"]["muted"] else settings["sound"]["music"])
+                    music.set_volume(settings["sound"]["music"], settings["sound"]["muted"])
                     save_settings()
                 elif sfx_slider_rect and sfx_slider_rect.collidepoint(mouse_x, mouse_y):
                     sfx_slider_dragging = True
@@ -965,7 +966,7 @@ while running:
                     save_settings()
                 elif mute_rect and mute_rect.collidepoint(mouse_x, mouse_y):
                     settings["sound"]["muted"] = not settings["sound"]["muted"]
-                    pygame.mixer.music.set_volume(0.0 if settings["sound"]["muted"] else settings["sound"]["music"])
+                    music.set_volume(settings["sound"]["music"], settings["sound"]["muted"])
                     save_settings()
                 elif back_rect and back_rect.collidepoint(mouse_x, mouse_y):
                     settings_open = False
@@ -979,7 +980,7 @@ while running:
                 if music_slider_dragging and music_slider_rect:
                     relative_x = max(0, min(mouse_x - vol_bar_x, vol_bar_width))
                     settings["sound"]["music"] = relative_x / vol_bar_width
-                    pygame.mixer.music.set_volume(0.0 if settings["sound"]["muted"] else settings["sound"]["music"])
+                    music.set_volume(settings["sound"]["music"], settings["sound"]["muted"])
                     save_settings()
                 elif sfx_slider_dragging and sfx_slider_rect:
                     relative_x = max(0, min(mouse_x - sfx_vol_bar_x, vol_bar_width))
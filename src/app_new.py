@@ -1,62 +1,152 @@
+# Startup timing has to begin before the heavy imports (see startup.py, --startup-report)
+from startup import StartupTracer
+startup = StartupTracer()
+
 import pygame
+from pygame._sdl2.video import Window
 import sys
 import random
 import math
 import os
 import subprocess
 import json
-from sounds import SoundManager
+import argparse
+import time
+import tracemalloc
+from rng import GameRNG
+from replay import ReplayRecorder, ReplayPlayer
+from scenarios import SCENARIOS, ScenarioPlayer
+from profiler import FrameProfiler
+from surface_tracker import SurfaceTracker
+from frame_scheduler import FrameScheduler
+from settings_store import SETTINGS_DEFAULTS, get_settings_store
+from input_map import InputMap
+from round_results import write_result
+from game_launcher import wait_for_start
+from sounds import SoundManager, MusicService
+from audio_queue import AudioQueue
+
+startup.mark("imports")
+
+def parse_size(text):
+    """Parse a WIDTHxHEIGHT window size such as 1920x1080"""
+    try:
+        width, height = text.lower().split("x")
+        return int(width), int(height)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {text!r}")
+
+# Command line options
+parser = argparse.ArgumentParser(description="Fly Feast")
+parser.add_argument("--seed", type=int, default=None, help="seed for gameplay randomness (same seed + same input = same game)")
+parser.add_argument("--record", metavar="FILE", help="record every step's input to a replay log")
+parser.add_argument("--replay", metavar="FILE", help="play back a replay log recorded with --record")
+parser.add_argument("--headless", action="store_true", help="run without display or audio device: dummy SDL drivers, uncapped frame rate, fixed 60 Hz game clock")
+parser.add_argument("--no-render", action="store_true", help="skip all drawing and only run the simulation")
+parser.add_argument("--frames", type=int, default=0, help="stop after this many steps (0 = run until quit)")
+parser.add_argument("--size", type=parse_size, default=None, metavar="WxH", help="window size instead of fullscreen (headless default 1920x1080)")
+parser.add_argument("--scenario", choices=sorted(SCENARIOS), help="play a scripted benchmark scenario instead of live input (implies --headless)")
+parser.add_argument("--flies", type=int, default=None, help="number of flies (default 12)")
+parser.add_argument("--bench-out", metavar="FILE", help="write per-frame simulation/render times to a JSON file when the game exits")
+parser.add_argument("--bench-alloc", action="store_true", help="also trace Python allocations per frame (slow, use a separate run for timings)")
+parser.add_argument("--trace", metavar="FILE", help="write a Chrome trace (chrome://tracing) of the main loop sections when the game exits")
+parser.add_argument("--startup-report", nargs="?", const="-", metavar="FILE", help="report how long every load phase took once the first frame is shown (printed, or written as JSON to FILE)")
+parser.add_argument("--track-surfaces", nargs="?", const="-", metavar="FILE", help="account every Surface the game creates and report memory per category on exit (printed, or written as JSON to FILE)")
+parser.add_argument("--startup-budget", type=float, default=None, metavar="MS", help="time-to-first-frame budget checked by --startup-report; the game exits with status 1 when it is exceeded")
+parser.add_argument("--username", default=None, help="player name; the result of every round is handed to the front page (see round_results.py)")
+parser.add_argument("--high-score", type=int, default=0, metavar="SCORE", help="the player's best score so far")
+parser.add_argument("--warm", action="store_true", help="load everything, then wait with a hidden window for a start message on stdin (see game_launcher.py)")
+args = parser.parse_args()
+
+# Headless mode is also used when SDL is already set up with the dummy video driver
+headless = args.headless or args.scenario is not None or os.environ.get("SDL_VIDEODRIVER") == "dummy"
+if headless:
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+render_enabled = not args.no_render
+# Game clock step in headless mode, where the loop runs uncapped
+HEADLESS_STEP_MS = 1000 / 60
+
+# A replay carries its own seed and screen size so the simulation plays out exactly as recorded
+replay_player = ReplayPlayer(args.replay) if args.replay else None
+
+# Main loop section timings, overlay toggled with F3 (see profiler.py)
+profiler = FrameProfiler(args.trace)
+
+# Surface memory per category, only collected with --track-surfaces (see surface_tracker.py)
+surfaces = SurfaceTracker(args.track_surfaces is not None)
+
+# Gameplay randomness (independent seeded streams, see rng.py)
+rng = GameRNG(replay_player.seed if replay_player else args.seed)
 
 # Initialize Pygame
 pygame.init()
+# A warm process keeps its window hidden until the round starts
+display_flags = pygame.HIDDEN if args.warm else 0
 try:
-    screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+    if replay_player:
+        screen = pygame.display.set_mode(replay_player.screen_size, display_flags)
+    elif args.size or headless:
+        screen = pygame.display.set_mode(args.size or (1920, 1080), display_flags)
+    else:
+        screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN | display_flags)
     SCREEN_WIDTH, SCREEN_HEIGHT = screen.get_size()
 except:
     # Fallback to a default window size if fullscreen fails
     SCREEN_WIDTH, SCREEN_HEIGHT = 1920, 1080
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), display_flags)
 pygame.display.set_caption("Fly Feast")
 clock = pygame.time.Clock()
+# Drops to a low frame rate while nothing changes on screen (see frame_scheduler.py)
+frame_scheduler = FrameScheduler(clock)
+startup.mark("display")
 
 # Get the directory where this script is located, then go up one level to project root
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 ASSETS_DIR = os.path.join(BASE_DIR, "assets")
 SPRITES_DIR = os.path.join(ASSETS_DIR, "sprites")
 
+# Effects and music are decoded on background threads, the first frame does not wait for them
 sound = SoundManager()
-sound.play_music()
-
-# Load settings
-SETTINGS_FILE = os.path.join(BASE_DIR, "settings.json")
-settings = {
-    "sound": {
-        "music": 0.25,
-        "sfx": 0.5,
-        "muted": False
-    }
-}
-
-def load_settings():
-    global settings
-    if os.path.exists(SETTINGS_FILE):
-        try:
-            with open(SETTINGS_FILE, 'r') as f:
-                loaded = json.load(f)
-                if "sound" in loaded:
-                    settings["sound"].update(loaded["sound"])
-        except:
-            pass
-    pygame.mixer.music.set_volume(settings["sound"]["music"])
-
-def save_settings():
-    try:
-        with open(SETTINGS_FILE, 'w') as f:
-            json.dump(settings, f, indent=2)
-    except:
-        pass
-
-load_settings()
+music = MusicService()
+# Sound effects of a frame are collected and sent to the mixer once per frame (see audio_queue.py)
+audio = AudioQueue(sound)
+startup.mark("sounds")
+
+# Load settings (shared with the front page, written to disk in the background, see settings_store.py)
+settings_store = get_settings_store()
+settings = settings_store.data
+
+def apply_music_volume():
+    music.set_volume(settings["sound"]["music"], settings["sound"]["muted"])
+
+# Keybinds resolved into a key -> action table (see input_map.py)
+# Scripted input gets fixed keybinds, so the player's own cannot change what it does:
+# a replay the ones it was recorded with, a benchmark scenario the defaults
+if replay_player and replay_player.keybinds:
+    scripted_keybinds = replay_player.keybinds
+elif args.scenario:
+    scripted_keybinds = SETTINGS_DEFAULTS["keybinds"]
+else:
+    scripted_keybinds = None
+input_map = InputMap(scripted_keybinds or settings["keybinds"])
+
+def on_setting_changed(section, key, value):
+    if section == "sound" and key in ("music", "muted"):
+        apply_music_volume()
+    elif section == "keybinds" and scripted_keybinds is None:
+        input_map.rebind(settings["keybinds"])
+
+apply_music_volume()
+settings_store.subscribe(on_setting_changed)
+if not args.warm:
+    music.play("game")
+
+def play_sfx(name):
+    """Queue a sound effect at the volume from the settings"""
+    if not settings["sound"]["muted"]:
+        audio.play(name, settings["sound"]["sfx"])
+startup.mark("settings")
 
 # Constants
 GROUND_Y = SCREEN_HEIGHT - 150
@@ -77,6 +167,10 @@ PLATFORM_Y = GROUND_Y - 80
 platforms = []
 
 NUM_FLIES = 12
+if args.flies is not None:
+    NUM_FLIES = args.flies
+elif args.scenario and SCENARIOS[args.scenario][1] is not None:
+    NUM_FLIES = SCENARIOS[args.scenario][1]
 TIMER_START_SECONDS = 90
 SCORE_ANIMATION_DURATION = 200
 ANIMATION_SPEED = 150
@@ -110,7 +204,7 @@ def load_image(path, convert_alpha=False):
         return None, False
     try:
         img = pygame.image.load(path)
-        return img.convert_alpha() if convert_alpha else img.convert(), True
+        return surfaces.track(img.convert_alpha() if convert_alpha else img.convert(), "image"), True
     except Exception:
         return None, False
 
@@ -119,12 +213,14 @@ def darken_image(image, factor=0.7):
     if not image:
         return None
     try:
-        darkened = image.copy()
+        darkened = surfaces.track(image.copy(), "darken")
         has_alpha = image.get_flags() & pygame.SRCALPHA
-        dark_surface = pygame.Surface(darkened.get_size(), pygame.SRCALPHA if has_alpha else 0)
+        dark_surface = surfaces.track(pygame.Surface(darkened.get_size(), pygame.SRCALPHA if has_alpha else 0), "darken")
         dark_surface.fill((int(255 * factor), int(255 * factor), int(255 * factor), 255 if has_alpha else 0))
         darkened.blit(dark_surface, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-        return darkened.convert_alpha() if has_alpha and not (darkened.get_flags() & pygame.SRCALPHA) else darkened
+        if has_alpha and not (darkened.get_flags() & pygame.SRCALPHA):
+            return surfaces.track(darkened.convert_alpha(), "darken")
+        return darkened
     except Exception:
         return image if image else None
 
@@ -134,7 +230,7 @@ def scale_branch(branch_img, scale):
         return None
     w = int(branch_img.get_width() * scale)
     h = int(branch_img.get_height() * scale)
-    return pygame.transform.scale(branch_img, (w, h))
+    return surfaces.track(pygame.transform.scale(branch_img, (w, h)), "branch")
 
 def create_platform_segments_from_branch(branch_img, branch_x, branch_y, scan_step=2):
     """Create platform segments from branch image by scanning for solid pixels"""
@@ -188,15 +284,18 @@ def create_platform_segments_from_branch(branch_img, branch_x, branch_y, scan_st
     
     return platform_segments
 
-def check_branch_horizontal_collision(character, branch_img, branch_x, branch_y, prev_x, prev_y, sprite_padding_offset, is_left_side=True):
-    """Check horizontal collision with a branch and adjust character position"""
+def check_branch_horizontal_collision(character, branch, prev_x, prev_y, sprite_padding_offset):
+    """Check horizontal collision with a registered branch and adjust character position"""
     char_left = character["x"]
     char_right = character["x"] + character["width"]
     char_top = character["y"]
     char_bottom = character["y"] + character["height"]
-    branch_width = branch_img.get_width()
-    branch_height = branch_img.get_height()
-    branch_right = branch_x + branch_width
+    branch_x = branch["x"]
+    branch_y = branch["y"]
+    branch_mask = branch["mask"]
+    branch_width = branch["rect"].width
+    branch_height = branch["rect"].height
+    branch_right = branch["rect"].right
     
     if not (char_right > branch_x and char_left < branch_right and char_bottom > branch_y and char_top < branch_y + branch_height):
         return
@@ -217,14 +316,9 @@ def check_branch_horizontal_collision(character, branch_img, branch_x, branch_y,
     sample_step = 4
     for y in range(int(char_rel_y_start), int(char_rel_y_end), sample_step):
         for x in range(int(char_rel_x_start), int(char_rel_x_end), sample_step):
-            try:
-                pixel_color = branch_img.get_at((x, y))
-                r, g, b, a = pixel_color
-                if a > 128:
-                    has_collision = True
-                    break
-            except:
-                pass
+            if branch_mask.get_at((x, y)):
+                has_collision = True
+                break
         if has_collision:
             break
     
@@ -232,33 +326,72 @@ def check_branch_horizontal_collision(character, branch_img, branch_x, branch_y,
         return
     
     char_rel_y = int((char_top + char_bottom) // 2 - branch_y)
-    if is_left_side:
+    # When the frog's middle is above or below the branch there is no row to scan,
+    # the frog is still pushed out to the edge of the branch image
+    row_in_branch = 0 <= char_rel_y < branch_height
+    if branch["is_left_side"]:
         if prev_x + character["width"] <= branch_right and char_left < branch_right and character["x"] > prev_x:
             rightmost_solid = branch_x
-            for x in range(branch_width - 1, -1, -sample_step):
-                try:
-                    pixel_color = branch_img.get_at((x, char_rel_y))
-                    r, g, b, a = pixel_color
-                    if a > 128:
+            if row_in_branch:
+                for x in range(branch_width - 1, -1, -sample_step):
+                    if branch_mask.get_at((x, char_rel_y)):
                         rightmost_solid = branch_x + x + sample_step
                         break
-                except:
-                    pass
             character["x"] = rightmost_solid
     else:
         if prev_x >= branch_right and char_right > branch_right and character["x"] < prev_x:
             leftmost_solid = branch_x + branch_width
-            for x in range(0, branch_width, sample_step):
-                try:
-                    pixel_color = branch_img.get_at((x, char_rel_y))
-                    r, g, b, a = pixel_color
-                    if a > 128:
+            if row_in_branch:
+                for x in range(0, branch_width, sample_step):
+                    if branch_mask.get_at((x, char_rel_y)):
                         leftmost_solid = branch_x + x
                         break
-                except:
-                    pass
             character["x"] = leftmost_solid - character["width"]
 
+def build_trunk_extents(trunk_img):
+    """Precompute the leftmost and rightmost solid x for every row of the trunk tile (None if the row is empty)"""
+    leftmost = []
+    rightmost = []
+    if not trunk_img:
+        return leftmost, rightmost
+    width = trunk_img.get_width()
+    for y in range(trunk_img.get_height()):
+        solid = [x for x in range(width) if trunk_img.get_at((x, y))[3] > 128]
+        leftmost.append(solid[0] if solid else None)
+        rightmost.append(solid[-1] if solid else None)
+    return leftmost, rightmost
+
+def check_trunk_collision(character, trunk_x, is_left_side=True):
+    """Check collision with a trunk column and push the character out, using the precomputed row extents"""
+    wood_width = thumbnail_wood_img.get_width()
+    wood_height = thumbnail_wood_img.get_height()
+    char_rel_left = character["x"] - trunk_x
+    char_rel_right = char_rel_left + character["width"]
+    if not (char_rel_right > 0 and char_rel_left < wood_width):
+        return
+
+    # The trunk repeats vertically, so every screen row maps onto a tile row
+    has_collision = False
+    for y in range(max(0, int(character["y"])), int(character["y"] + character["height"])):
+        row = y % wood_height
+        leftmost = trunk_left_extents[row]
+        if leftmost is not None and leftmost < char_rel_right and trunk_right_extents[row] >= char_rel_left:
+            has_collision = True
+            break
+
+    if not has_collision:
+        return
+
+    # Push out using the trunk edge at the character's vertical middle
+    char_mid_y = int(character["y"] + character["y"] + character["height"]) // 2
+    trunk_tile_y = char_mid_y % wood_height
+    if is_left_side:
+        rightmost = trunk_right_extents[trunk_tile_y]
+        character["x"] = trunk_x + (rightmost + 1 if rightmost is not None else wood_width)
+    else:
+        leftmost = trunk_left_extents[trunk_tile_y]
+        character["x"] = trunk_x + (leftmost if leftmost is not None else 0) - character["width"]
+
 fly_img, _ = load_image(os.path.join(SPRITES_DIR, "fly", "fly.png"), convert_alpha=True)
 fly_img_frame2, _ = load_image(os.path.join(SPRITES_DIR, "fly", "fly_second_frame.png"), convert_alpha=True)
 background_img, background_loaded = load_image(os.path.join(ASSETS_DIR, "background.png"))
@@ -273,6 +406,13 @@ FLY_ANIMATION_SPEED = 8  # Frames per animation cycle (lower = faster chirping)
 # Load UI images
 UI_DIR = os.path.join(ASSETS_DIR, "ui")
 wooden_sign_img, wooden_sign_loaded = load_image(os.path.join(UI_DIR, "wooden_sign_transparent_cleared.png"), convert_alpha=True)
+# Every menu shows the sign at the same size, so it is scaled once instead of every frame
+wooden_sign_scaled = None
+if wooden_sign_loaded and wooden_sign_img:
+    sign_scale = min(SCREEN_WIDTH * 0.6 / wooden_sign_img.get_width(), SCREEN_HEIGHT * 0.6 / wooden_sign_img.get_height())
+    wooden_sign_scaled = surfaces.track(pygame.transform.scale(wooden_sign_img, (int(wooden_sign_img.get_width() * sign_scale),
+                                                                                 int(wooden_sign_img.get_height() * sign_scale))), "menu")
+startup.mark("images: flies, background, ui")
 
 # Load water tiles and crocodile
 WATER_TILE_SCALE = 2.3  # Scale adjusted to ensure no gaps
@@ -344,6 +484,7 @@ if crocodile_frame_2_loaded and crocodile_frame_2_raw:
     crocodile_frame_2 = darken_image(scaled, CROCODILE_DARKEN_FACTOR)
 else:
     crocodile_frame_2 = None
+startup.mark("images: water + crocodile")
 
 # Water animation state
 water_animation_timer = 0
@@ -376,6 +517,7 @@ ground_tile_upper = scale_and_darken_tile(ground_tile_upper_raw, GROUND_TILE_SCA
 ground_tile_main = scale_and_darken_tile(ground_tile_main_raw, GROUND_TILE_SCALE, GROUND_TILE_DARKEN_FACTOR) if ground_tile_main_loaded else None
 ground_tile_corner = scale_and_darken_tile(ground_tile_corner_raw, GROUND_TILE_SCALE, GROUND_TILE_DARKEN_FACTOR) if ground_tile_corner_loaded else None
 ground_tile_left_corner = scale_and_darken_tile(ground_tile_left_corner_raw, GROUND_TILE_SCALE, GROUND_TILE_DARKEN_FACTOR) if ground_tile_left_corner_loaded else None
+startup.mark("images: ground tiles")
 
 # Load tree images
 tree_images = None
@@ -391,6 +533,7 @@ if tree_left and tree_middle and tree_right:
         pygame.transform.scale(tree_right, (tree_width, tree_height))
     ]
     tree_loaded = True
+startup.mark("images: trees")
 
 # Load plant for water
 plant_img, plant_loaded = load_image(os.path.join(SPRITES_DIR, "trees", "plant_for_water_big.png"), convert_alpha=True)
@@ -401,9 +544,12 @@ plant_red_img, plant_red_loaded = load_image(os.path.join(SPRITES_DIR, "trees",
 small_plant_img, small_plant_loaded = load_image(f"{SPRITES_DIR}/trees/plant_for_water_smaller (1).png", convert_alpha=True)
 # Load red version of small plant (background layer, for collision detection)
 small_plant_red_img, small_plant_red_loaded = load_image(f"{SPRITES_DIR}/trees/small_plant_red.png", convert_alpha=True)
+startup.mark("images: plants")
 
 # Load tree trunk design for left side
 thumbnail_wood_img, thumbnail_wood_loaded = load_image(f"{SPRITES_DIR}/trees/thumbnail_wood.png", convert_alpha=True)
+# Per-row solid extents of the trunk tile, used for trunk collision instead of sampling pixels every frame
+trunk_left_extents, trunk_right_extents = build_trunk_extents(thumbnail_wood_img)
 
 # Load tree branches for left trunk
 branch_1_img, branch_1_loaded = load_image(f"{SPRITES_DIR}/trees/branches_left_separated/branches_left_part_1.png", convert_alpha=True)
@@ -417,6 +563,51 @@ branch_right_2_img, branch_right_2_loaded = load_image(f"{SPRITES_DIR}/trees/bra
 branch_right_3_img, branch_right_3_loaded = load_image(f"{SPRITES_DIR}/trees/branches_right_separated/branches_right_part_3.png", convert_alpha=True)
 branch_right_4_img, branch_right_4_loaded = load_image(f"{SPRITES_DIR}/trees/branches_right_separated/branches_right_part_4.png", convert_alpha=True)
 
+# Branch shadow settings (same for both trunks, shadow is offset away from the trunk)
+BRANCH_SHADOW_OFFSET = 8
+BRANCH_SHADOW_ALPHA = 120
+
+def build_branch_registry():
+    """Scale every branch once and record its world position, shadow, mask and bounding rect.
+    Drawing, collision and platform generation all read branch geometry from here."""
+    registry = []
+    if not (thumbnail_wood_loaded and thumbnail_wood_img):
+        return registry
+    trunk_width = thumbnail_wood_img.get_width()
+    sides = [
+        (True, 0, LEFT_BRANCH_POSITIONS, [branch_1_img, branch_2_img, branch_3_img, branch_4_img],
+         branch_1_loaded and branch_2_loaded and branch_3_loaded and branch_4_loaded),
+        (False, SCREEN_WIDTH - trunk_width, RIGHT_BRANCH_POSITIONS, [branch_right_1_img, branch_right_2_img, branch_right_3_img, branch_right_4_img],
+         branch_right_1_loaded and branch_right_2_loaded and branch_right_3_loaded and branch_right_4_loaded),
+    ]
+    for is_left_side, trunk_x, positions, branch_imgs, loaded in sides:
+        if not loaded:
+            continue
+        for pos, branch_img in zip(positions, branch_imgs):
+            scaled = scale_branch(branch_img, BRANCH_SCALE)
+            if not scaled:
+                continue
+            branch_x = trunk_x + trunk_width - scaled.get_width() // 2 + pos["offset"]
+            branch_y = int(SCREEN_HEIGHT * pos["y"])
+
+            shadow = surfaces.track(pygame.Surface(scaled.get_size(), pygame.SRCALPHA), "shadow")
+            shadow.fill((0, 0, 0, BRANCH_SHADOW_ALPHA))
+            shadow.blit(scaled, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+
+            registry.append({
+                "img": scaled,
+                "shadow": shadow,
+                "x": branch_x,
+                "y": branch_y,
+                "mask": pygame.mask.from_surface(scaled, 128),  # solid where alpha > 128
+                "rect": pygame.Rect(branch_x, branch_y, scaled.get_width(), scaled.get_height()),
+                "is_left_side": is_left_side
+            })
+    return registry
+
+branch_registry = build_branch_registry()
+startup.mark("images: trunk + branches")
+
 # Load tree tiles for top rows
 TREE_TILE_SCALE = 0.7  # Scale tiles down
 TREE_TILE_DARKEN_FACTOR = 0.7  # Darken tiles to match theme
@@ -458,6 +649,15 @@ if tree_tile_23_loaded and tree_tile_23_raw:
 else:
     tree_tile_23_img = None
 
+# Rotation for every top-row tile 16 position, seeded by the tile index so the pattern never changes.
+# Uses a private Random per tile instead of reseeding the global random module every frame.
+tree_tile_16_rotations = []
+if tree_tile_16_img:
+    tile_16_spacing = tree_tile_16_img.get_width() - tree_tile_16_img.get_width() * 0.4
+    for tx in range(int(math.ceil(SCREEN_WIDTH / tile_16_spacing)) + 3):
+        tree_tile_16_rotations.append(random.Random(tx).choice([0, 90, 180, 270]))
+startup.mark("images: tree tiles")
+
 # Load rocks to place between water areas
 rocks_img_raw, rocks_loaded = load_image(os.path.join(SPRITES_DIR, "rocks.png"), convert_alpha=True)
 # Darken rocks to match theme
@@ -485,6 +685,7 @@ if red_rocks_loaded and red_rocks_img_raw:
          int(red_rocks_img_raw.get_height() * ROCKS_SCALE)))
 else:
     red_rocks_img = None
+startup.mark("images: rocks + mushroom")
 
 # Load vines image
 vines_img, vines_loaded = load_image(os.path.join(SPRITES_DIR, "vines.png"), convert_alpha=True)
@@ -493,6 +694,7 @@ vines_img, vines_loaded = load_image(os.path.join(SPRITES_DIR, "vines.png"), con
 vines_top_1_img, vines_top_1_loaded = load_image(os.path.join(SPRITES_DIR, "vines_separated", "vines_part_1.png"), convert_alpha=True)
 vines_top_2_img, vines_top_2_loaded = load_image(os.path.join(SPRITES_DIR, "vines_separated", "vines_part_2.png"), convert_alpha=True)
 vines_top_3_img, vines_top_3_loaded = load_image(os.path.join(SPRITES_DIR, "vines_separated", "vines_part_3.png"), convert_alpha=True)
+startup.mark("images: vines")
 
 # Load tongue sprites
 tongue_frames = []
@@ -534,6 +736,7 @@ for i in range(1, 3):
     if loaded and frame:
         dying_frames.append(frame)
 dying_frames_loaded = len(dying_frames) > 0
+startup.mark("images: frog + tongue")
 
 # Animation state
 animation_frames = {key: 0 for key in frog_frames.keys()} if sprite_sheet_loaded else {}
@@ -558,10 +761,12 @@ if pixel_font_images:
     pixel_font_loaded = True
     default_char_width = pixel_font_images['0'].get_width()
     default_char_height = pixel_font_images['0'].get_height()
+startup.mark("images: pixel font")
 
 # Game state
 score = 0
-high_score = 0
+high_score = args.high_score
+round_reported = False  # the result of the current round was handed to the front page
 score_animation_time = 0
 timer_start_time = None
 timer_remaining = TIMER_START_SECONDS
@@ -606,15 +811,15 @@ game_end_menu_visible = False
 
 # Helper: spawn a fly anywhere + random movement pattern
 def make_fly():
-    ang = random.uniform(0, math.tau)         # random direction
-    spd = random.uniform(2.0, 4.0)            # base speed
+    ang = rng.spawn.uniform(0, math.tau)         # random direction
+    spd = rng.spawn.uniform(2.0, 4.0)            # base speed
     # movement pattern: after some frames, pick a new random direction/speed
-    change_timer = random.randint(30, 120)
+    change_timer = rng.spawn.randint(30, 120)
     # Animation state: random offset so flies don't all chirp at the same time
-    animation_timer = random.randint(0, FLY_ANIMATION_SPEED - 1)
+    animation_timer = rng.spawn.randint(0, FLY_ANIMATION_SPEED - 1)
     return {
-        "x": random.randint(50, SCREEN_WIDTH - FLY_W - 50),
-        "y": random.randint(50, GROUND_Y - FLY_H - 50),
+        "x": rng.spawn.randint(50, SCREEN_WIDTH - FLY_W - 50),
+        "y": rng.spawn.randint(50, GROUND_Y - FLY_H - 50),
         "vx": math.cos(ang) * spd,
         "vy": math.sin(ang) * spd,
         "change_timer": change_timer,
@@ -658,10 +863,11 @@ character = {
 }
 
 def reset_game():
-    global score, score_animation_time, timer_start_time, timer_remaining, flies, game_end, total_paused_time, dying_frame_index, dying_animation_timer
+    global score, score_animation_time, timer_start_time, timer_remaining, flies, game_end, total_paused_time, dying_frame_index, dying_animation_timer, round_reported
     score = 0
+    round_reported = False
     score_animation_time = 0
-    timer_start_time = pygame.time.get_ticks()
+    timer_start_time = current_time
     timer_remaining = TIMER_START_SECONDS
     total_paused_time = 0
     game_end = False
@@ -694,6 +900,10 @@ def reset_game():
     for _ in range(NUM_FLIES):
         flies.append(make_fly())
 
+    # Sounds scheduled during the last round must not play in the new one
+    audio.clear()
+    surfaces.new_round()
+
 # Cache for all platforms (generated once, reused every frame)
 cached_all_platforms = None
 
@@ -702,28 +912,9 @@ def generate_all_platforms():
     global cached_all_platforms
     all_platforms = list(platforms)  # Copy the platforms list
     
-    # Add left tree branches as platforms
-    if thumbnail_wood_loaded and thumbnail_wood_img and (branch_1_loaded and branch_2_loaded and branch_3_loaded and branch_4_loaded):
-        trunk_width = thumbnail_wood_img.get_width()
-        branch_imgs = [branch_1_img, branch_2_img, branch_3_img, branch_4_img]
-        for pos, branch_img in zip(LEFT_BRANCH_POSITIONS, branch_imgs):
-            scaled = scale_branch(branch_img, BRANCH_SCALE)
-            if scaled:
-                branch_x = trunk_width - scaled.get_width() // 2 + pos["offset"]
-                branch_y = int(SCREEN_HEIGHT * pos["y"])
-                all_platforms.extend(create_platform_segments_from_branch(scaled, branch_x, branch_y))
-    
-    # Add right tree branches as platforms
-    if thumbnail_wood_loaded and thumbnail_wood_img and (branch_right_1_loaded and branch_right_2_loaded and branch_right_3_loaded and branch_right_4_loaded):
-        trunk_width = thumbnail_wood_img.get_width()
-        right_trunk_x = SCREEN_WIDTH - trunk_width
-        branch_imgs = [branch_right_1_img, branch_right_2_img, branch_right_3_img, branch_right_4_img]
-        for pos, branch_img in zip(RIGHT_BRANCH_POSITIONS, branch_imgs):
-            scaled = scale_branch(branch_img, BRANCH_SCALE)
-            if scaled:
-                branch_x = right_trunk_x + trunk_width - scaled.get_width() // 2 + pos["offset"]
-                branch_y = int(SCREEN_HEIGHT * pos["y"])
-                all_platforms.extend(create_platform_segments_from_branch(scaled, branch_x, branch_y))
+    # Add left and right tree branches as platforms
+    for branch in branch_registry:
+        all_platforms.extend(create_platform_segments_from_branch(branch["img"], branch["x"], branch["y"]))
     
     # Add hanging vine leaves as platforms
     if vines_top_1_loaded and vines_top_2_loaded and vines_top_3_loaded:
@@ -978,9 +1169,9 @@ def draw_pixel_text(surface, text, x, y, scale=1.0, color=None):
             scaled_char = pygame.transform.scale(char_img, (scaled_width, scaled_height))
             
             if color:
-                color_surface = pygame.Surface(scaled_char.get_size(), pygame.SRCALPHA)
+                color_surface = surfaces.track(pygame.Surface(scaled_char.get_size(), pygame.SRCALPHA), "text")
                 color_surface.fill(color)
-                scaled_char = scaled_char.copy()
+                scaled_char = surfaces.track(scaled_char.copy(), "text")
                 scaled_char.blit(color_surface, (0, 0), special_flags=pygame.BLEND_MULT)
             
             surface.blit(scaled_char, (current_x, y))
@@ -999,7 +1190,7 @@ def draw_pause_menu(surface, menu_y):
     scale_factor = min(SCREEN_WIDTH * 0.6 / sign_width, SCREEN_HEIGHT * 0.6 / sign_height)
     scaled_width = int(sign_width * scale_factor)
     scaled_height = int(sign_height * scale_factor)
-    scaled_sign = pygame.transform.scale(wooden_sign_img, (scaled_width, scaled_height))
+    scaled_sign = wooden_sign_scaled
 
     sign_x = (SCREEN_WIDTH - scaled_width) // 2
     sign_y = menu_y
@@ -1092,7 +1283,7 @@ def draw_settings_menu(surface, menu_y):
     scale_factor = min(SCREEN_WIDTH * 0.6 / sign_width, SCREEN_HEIGHT * 0.6 / sign_height)
     scaled_width = int(sign_width * scale_factor)
     scaled_height = int(sign_height * scale_factor)
-    scaled_sign = pygame.transform.scale(wooden_sign_img, (scaled_width, scaled_height))
+    scaled_sign = wooden_sign_scaled
 
     sign_x = (SCREEN_WIDTH - scaled_width) // 2
     sign_y = menu_y
@@ -1212,7 +1403,7 @@ def draw_game_end_menu(surface, menu_y):
     scale_factor = min(SCREEN_WIDTH * 0.6 / sign_width, SCREEN_HEIGHT * 0.6 / sign_height)
     scaled_width = int(sign_width * scale_factor)
     scaled_height = int(sign_height * scale_factor)
-    scaled_sign = pygame.transform.scale(wooden_sign_img, (scaled_width, scaled_height))
+    scaled_sign = wooden_sign_scaled
 
     sign_x = (SCREEN_WIDTH - scaled_width) // 2
     sign_y = menu_y
@@ -1280,1641 +1471,1663 @@ def draw_game_end_menu(surface, menu_y):
 
     return None, None, None
 
-# Generate all platforms once at initialization (expensive operation)
-generate_all_platforms()
+def draw_world(surface, shake_x, shake_y):
+    """Draw the scenery: background, vines, trees, ground, water, plants, rocks and mushroom"""
+    # Draw background
+    if background_loaded and background_img:
+        if background_img.get_size() != (SCREEN_WIDTH, SCREEN_HEIGHT):
+            surface.blit(pygame.transform.scale(background_img, (SCREEN_WIDTH, SCREEN_HEIGHT)), (shake_x, shake_y))
+        else:
+            surface.blit(background_img, (0, 0))
+    else:
+        surface.fill(BG_COLOR)
 
-# Main game loop
-running = True
-if timer_start_time is None:
-    timer_start_time = pygame.time.get_ticks()
+    # Draw hanging vines from top of surface
+    if vines_top_1_loaded and vines_top_2_loaded and vines_top_3_loaded:
+        VINE_SCALE = 3.0  # Scale vines to be much bigger
+        vines_top_imgs = [vines_top_1_img, vines_top_2_img, vines_top_3_img]
+        # Position vines across the surface, hanging from top
+        vine_positions = [
+            {"x": int(SCREEN_WIDTH * 0.15), "img": vines_top_1_img},
+            {"x": int(SCREEN_WIDTH * 0.5), "img": vines_top_2_img},
+            {"x": int(SCREEN_WIDTH * 0.85), "img": vines_top_3_img}
+        ]
+        # Shadow settings for vines
+        vine_shadow_offset_x = 8
+        vine_shadow_offset_y = 8
+        vine_shadow_alpha = 120
+        
+        for vine_data in vine_positions:
+            vine_img = vine_data["img"]
+            # Scale the vine image
+            scaled_width = int(vine_img.get_width() * VINE_SCALE)
+            scaled_height = int(vine_img.get_height() * VINE_SCALE)
+            vine_scaled = pygame.transform.scale(vine_img, (scaled_width, scaled_height))
+            
+            # Create shadow surface for vine
+            vine_shadow_surface = surfaces.track(pygame.Surface((scaled_width, scaled_height), pygame.SRCALPHA), "shadow")
+            vine_shadow_surface.fill((0, 0, 0, vine_shadow_alpha))
+            vine_shadow_surface.blit(vine_scaled, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+            
+            vine_x = vine_data["x"] - vine_scaled.get_width() // 2
+            vine_y = 0  # Hang from top of surface
+            
+            # Draw shadow first
+            surface.blit(vine_shadow_surface, (vine_x + vine_shadow_offset_x, vine_y + vine_shadow_offset_y))
+            # Draw vine on top
+            surface.blit(vine_scaled, (vine_x, vine_y))
+
+    # Draw tree branches (shadow first, offset away from the trunk)
+    for branch in branch_registry:
+        if branch["is_left_side"]:
+            shadow_x = branch["x"] + BRANCH_SHADOW_OFFSET
+        else:
+            shadow_x = branch["x"] - BRANCH_SHADOW_OFFSET
+        surface.blit(branch["shadow"], (shadow_x, branch["y"] + BRANCH_SHADOW_OFFSET))
+        surface.blit(branch["img"], (branch["x"], branch["y"]))
 
-while running:
-        clock.tick(60)
-        current_time = pygame.time.get_ticks()
+    # Draw tree trunk design on both left and right sides - fill the edges vertically with no gaps
+    if thumbnail_wood_loaded and thumbnail_wood_img:
+        tile_width = thumbnail_wood_img.get_width()
+        tile_height = thumbnail_wood_img.get_height()
+        
+        # Shadow settings
+        shadow_offset_x = 8
+    shadow_offset_y = 8
+    shadow_alpha = 120  # Shadow opacity (0-255)
     
-        # Handle pause menu animation
-        if paused and not settings_open:
-            if pause_menu_target_y is None and wooden_sign_loaded and wooden_sign_img:
-                pause_menu_target_y = 0
-
-        if pause_menu_target_y is not None:
-            if pause_menu_y < pause_menu_target_y:
-                pause_menu_y += pause_menu_slide_speed
-                if pause_menu_y >= pause_menu_target_y:
-                    pause_menu_y = pause_menu_target_y
-                    pause_menu_visible = True
-            else:
-                pause_menu_visible = True
+    # Create shadow surface from thumbnail_wood's alpha channel
+    shadow_surface = surfaces.track(pygame.Surface(thumbnail_wood_img.get_size(), pygame.SRCALPHA), "shadow")
+    shadow_surface.fill((0, 0, 0, shadow_alpha))
+    shadow_surface.blit(thumbnail_wood_img, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+    
+    # Calculate how many tiles needed to fill the surface height (add extra to ensure no gaps)
+    num_tiles_y = int(math.ceil(SCREEN_HEIGHT / tile_height)) + 2
+    
+    # Draw tiles vertically on the left edge
+    for ty in range(num_tiles_y):
+        tree_tile_y = ty * tile_height
+        # Skip tiles that extend beyond surface bounds
+        if tree_tile_y >= SCREEN_HEIGHT:
+            continue
+        # Draw shadow first
+        surface.blit(shadow_surface, (shadow_offset_x, tree_tile_y + shadow_offset_y))
+        # Draw thumbnail_wood tile on the left
+        surface.blit(thumbnail_wood_img, (0, tree_tile_y))
+    
+    # Draw tiles vertically on the right edge (symmetrically)
+    right_edge_x = SCREEN_WIDTH - tile_width
+    for ty in range(num_tiles_y):
+        tree_tile_y = ty * tile_height
+        # Skip tiles that extend beyond surface bounds
+        if tree_tile_y >= SCREEN_HEIGHT:
+            continue
+        # Draw shadow first (offset to the left for right side)
+        surface.blit(shadow_surface, (right_edge_x - shadow_offset_x, tree_tile_y + shadow_offset_y))
+        # Draw thumbnail_wood tile on the right
+        surface.blit(thumbnail_wood_img, (right_edge_x, tree_tile_y))
+
+    # Draw tree tile 16 along the top row with random orientations (overlapping to fill gaps)
+    if tree_tile_16_loaded and tree_tile_16_img:
+        tile_16_width = tree_tile_16_img.get_width()
+    tile_16_height = tree_tile_16_img.get_height()
+    
+    # Shadow settings
+    shadow_offset_x = 8
+    shadow_offset_y = 8
+    shadow_alpha = 120  # Shadow opacity (0-255)
+    
+    # Calculate spacing to ensure tiles overlap and fill the surface
+    # Use a smaller spacing than tile width to create overlap
+    overlap_amount = tile_16_width * 0.4  # 40% overlap for better coverage
+    tile_spacing = tile_16_width - overlap_amount
+    
+    # Calculate how many tiles needed to cover the surface width (more tiles for better coverage)
+    num_tiles_x = int(math.ceil(SCREEN_WIDTH / tile_spacing)) + 3
+    
+    # Draw tiles along the top row with overlap
+    for tx in range(num_tiles_x):
+        tile_x = tx * tile_spacing
+        if tile_x >= SCREEN_WIDTH + tile_16_width:
+            continue
+        
+        # Consistent rotation per tile (precomputed at load, seeded by tile position)
+        rotation = tree_tile_16_rotations[tx]
+        rotated_tile = pygame.transform.rotate(tree_tile_16_img, rotation)
+        
+        # Create shadow surface for rotated tile
+        shadow_surface = surfaces.track(pygame.Surface(rotated_tile.get_size(), pygame.SRCALPHA), "shadow")
+        shadow_surface.fill((0, 0, 0, shadow_alpha))
+        shadow_surface.blit(rotated_tile, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+        
+        # Adjust position if rotated (to keep tiles aligned)
+        if rotation == 90 or rotation == 270:
+            # For 90/270 degree rotations, swap width and height
+            offset_x = (tile_16_height - tile_16_width) // 2
+            offset_y = (tile_16_width - tile_16_height) // 2
         else:
-            if pause_menu_y > -500:
-                pause_menu_y -= pause_menu_slide_speed
-            if pause_menu_y <= -500:
-                pause_menu_y = -500
-                pause_menu_visible = False
-                pause_menu_target_y = None
-
-        # Handle settings menu animation
-        if settings_open:
-            if settings_menu_target_y is None and wooden_sign_loaded and wooden_sign_img:
-                settings_menu_target_y = 0
+            offset_x = 0
+            offset_y = 0
+        
+        # Draw shadow first
+        surface.blit(shadow_surface, (tile_x + offset_x + shadow_offset_x, offset_y + shadow_offset_y))
+        # Draw tile on top
+        surface.blit(rotated_tile, (tile_x + offset_x, offset_y))
 
-        if settings_menu_target_y is not None:
-            if settings_menu_y < settings_menu_target_y:
-                settings_menu_y += settings_menu_slide_speed
-                if settings_menu_y >= settings_menu_target_y:
-                    settings_menu_y = settings_menu_target_y
-                    settings_menu_visible = True
-            else:
-                settings_menu_visible = True
+    # Draw animated tree tiles 21, 22, 23 just below the top row (overlapping to fill gaps)
+    if tree_tile_21_loaded and tree_tile_22_loaded and tree_tile_23_loaded:
+        if tree_tile_21_img and tree_tile_22_img and tree_tile_23_img:
+            tile_21_width = tree_tile_21_img.get_width()
+            tile_21_height = tree_tile_21_img.get_height()
+            
+            # Shadow settings
+        shadow_offset_x = 8
+        shadow_offset_y = 8
+        shadow_alpha = 120  # Shadow opacity (0-255)
+        
+        # Change tile every 200ms for animation effect
+        animation_frame = (current_time // 200) % 3
+        
+        # Select which tile to show based on animation frame
+        if animation_frame == 0:
+            current_animated_tile = tree_tile_21_img
+        elif animation_frame == 1:
+            current_animated_tile = tree_tile_22_img
         else:
-            if settings_menu_y > -500:
-                settings_menu_y -= settings_menu_slide_speed
-            if settings_menu_y <= -500:
-                settings_menu_y = -500
-                settings_menu_visible = False
-                settings_menu_target_y = None
+            current_animated_tile = tree_tile_23_img
+        
+        # Create shadow surface for animated tile
+        shadow_surface = surfaces.track(pygame.Surface(current_animated_tile.get_size(), pygame.SRCALPHA), "shadow")
+        shadow_surface.fill((0, 0, 0, shadow_alpha))
+        shadow_surface.blit(current_animated_tile, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+        
+        # Calculate spacing to ensure tiles overlap and fill the surface
+        # Use a smaller spacing than tile width to create overlap
+        overlap_amount = tile_21_width * 0.4  # 40% overlap for better coverage
+        tile_spacing = tile_21_width - overlap_amount
+        
+        # Calculate how many tiles needed to cover the surface width (more tiles for better coverage)
+        num_tiles_x = int(math.ceil(SCREEN_WIDTH / tile_spacing)) + 3
+        
+        # Get the height of tile 16 to position animated tiles overlapping with it
+        tile_16_height = tree_tile_16_img.get_height() if tree_tile_16_loaded and tree_tile_16_img else tile_21_height
+        
+        # Calculate overlap amount between rows (overlap by 15% of tile height for less overlap)
+        row_overlap = tile_16_height * 0.15
+        
+        # Draw tiles in the row just below the top row with overlap
+        for tx in range(num_tiles_x):
+            tile_x = tx * tile_spacing
+            if tile_x >= SCREEN_WIDTH + tile_21_width:
+                continue
+            
+            # Position overlapping with the top row but lower (move up by smaller overlap amount)
+            tile_y = tile_16_height - row_overlap
+            
+            # Draw shadow first
+            surface.blit(shadow_surface, (tile_x + shadow_offset_x, tile_y + shadow_offset_y))
+            # Draw tile on top
+            surface.blit(current_animated_tile, (tile_x, tile_y))
 
-        # Handle game end menu animation
-        if game_end:
-            if game_end_menu_target_y is None and wooden_sign_loaded and wooden_sign_img:
-                game_end_menu_target_y = 0
+    profiler.mark("static draw")
 
-        if game_end_menu_target_y is not None:
-            if game_end_menu_y < game_end_menu_target_y:
-                game_end_menu_y += game_end_menu_slide_speed
-                if game_end_menu_y >= game_end_menu_target_y:
-                    game_end_menu_y = game_end_menu_target_y
-                    game_end_menu_visible = True
-            else:
-                game_end_menu_visible = True
+    # Draw ground and swamp
+    if ground_tile_upper_loaded and ground_tile_upper:
+        upper_tile_width = ground_tile_upper.get_width()
+        upper_tile_height = ground_tile_upper.get_height()
 
-        # Update water and crocodile animations
-        if current_time - water_animation_timer >= water_animation_speed:
-            water_animation_timer = current_time
-            water_frame = 1 - water_frame  # Toggle between 0 and 1
-    
-        if current_time - crocodile_animation_timer >= crocodile_animation_speed:
-            crocodile_animation_timer = current_time
-            crocodile_frame = 1 - crocodile_frame  # Toggle between 0 and 1
+        top_right_corner_x = ((SWAMP_START_X - 1) // upper_tile_width) * upper_tile_width
+        top_right_corner_y = GROUND_Y
 
-        # Skip game updates when paused, game ended, or game over
-        if not paused and not game_end and not game_over:
-            # Update timer (subtract total paused time to account for pauses)
-            elapsed_seconds = (current_time - timer_start_time - total_paused_time) // 1000
-            timer_remaining = max(0, TIMER_START_SECONDS - elapsed_seconds)
-        if timer_remaining <= 0 and not game_end:
-            game_end = True
-            game_end_start_time = current_time
-            game_end_menu_y = -500
-            game_end_menu_visible = False
-        elif paused:
-            # When paused, also account for current pause session in timer calculation
-            current_pause_duration = current_time - pause_start_time if pause_start_time > 0 else 0
-            elapsed_seconds = (current_time - timer_start_time - total_paused_time - current_pause_duration) // 1000
-            timer_remaining = max(0, TIMER_START_SECONDS - elapsed_seconds)
-        elif game_over:
-            # When game over, timer stops - don't update it
-            # Timer remains at the value it had when game_over was set
-            pass
+        top_left_right_ground_x = ((SWAMP_START_X + SWAMP_WIDTH) // upper_tile_width) * upper_tile_width
+        top_left_right_ground_y = GROUND_Y
+        
+        # Calculate left water corner positions
+        left_water_left_corner_x = ((LEFT_WATER_START_X - 1) // upper_tile_width) * upper_tile_width
+        left_water_right_corner_x = ((LEFT_WATER_START_X + LEFT_WATER_WIDTH) // upper_tile_width) * upper_tile_width
 
-        keys = pygame.key.get_pressed()
+        num_tiles_upper_x = int(math.ceil(SCREEN_WIDTH / upper_tile_width)) + 1
+        num_tiles_upper_y = int(math.ceil(GROUND_HEIGHT / upper_tile_height)) + 1
+        
+        for ty in range(num_tiles_upper_y):
+            for tx in range(num_tiles_upper_x):
+                tile_x = tx * upper_tile_width
+                tile_y = GROUND_Y + ty * upper_tile_height
+                tile_right = tile_x + upper_tile_width
+                
+                # Skip tiles that overlap with the left water area
+                if tile_right > LEFT_WATER_START_X and tile_x < LEFT_WATER_START_X + LEFT_WATER_WIDTH:
+                    continue
+                # Skip tiles that overlap with the swamp area
+                if tile_right > SWAMP_START_X and tile_x < SWAMP_START_X + SWAMP_WIDTH:
+                    continue
+                
+                # Skip corner tiles that are in the left water area (only for first row)
+                if ty == 0 and (tile_x == left_water_left_corner_x or tile_x == left_water_right_corner_x):
+                    continue
+                
+                # Skip corner positions (only for first row)
+                if ty == 0:
+                    if (tile_x == top_right_corner_x and tile_y == top_right_corner_y) or \
+                       (tile_x == top_left_right_ground_x and tile_y == top_left_right_ground_y):
+                        continue
+                
+                surface.blit(ground_tile_upper, (tile_x, tile_y))
 
-        # Event handling
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
+        # Only draw corner tiles if they're not in the left water area
+        if ground_tile_corner_loaded and ground_tile_corner:
+            if not (top_right_corner_x >= LEFT_WATER_START_X and top_right_corner_x < LEFT_WATER_START_X + LEFT_WATER_WIDTH):
+                surface.blit(ground_tile_corner, (top_right_corner_x, top_right_corner_y))
 
-            elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                if settings_open:
-                    # Close settings menu and return to pause menu
-                    settings_open = False
-                    settings_menu_y = -500
-                    settings_menu_visible = False
-                    settings_menu_target_y = None
-                elif not game_over:
-                    paused = not paused
-                    if paused:
-                        pause_start_time = current_time
-                        pause_menu_y = -500
-                        pause_menu_visible = False
-                    else:
-                        # When unpausing, add the paused duration to total_paused_time
-                        if pause_start_time > 0:
-                            total_paused_time += current_time - pause_start_time
-                            pause_start_time = 0
-                        pause_menu_y = -500
-                        pause_menu_visible = False
-                        pause_menu_target_y = None
+        if ground_tile_left_corner_loaded and ground_tile_left_corner:
+            if not (top_left_right_ground_x >= LEFT_WATER_START_X and top_left_right_ground_x < LEFT_WATER_START_X + LEFT_WATER_WIDTH):
+                surface.blit(ground_tile_left_corner, (top_left_right_ground_x, top_left_right_ground_y))
+    else:
+        # Draw ground rectangles, but skip left water and right swamp areas
+        pygame.draw.rect(surface, GROUND_COLOR, (0, GROUND_Y, LEFT_WATER_START_X, GROUND_HEIGHT))
+        pygame.draw.rect(surface, GROUND_COLOR, (LEFT_WATER_START_X + LEFT_WATER_WIDTH, GROUND_Y, 
+                                               SWAMP_START_X - (LEFT_WATER_START_X + LEFT_WATER_WIDTH), GROUND_HEIGHT))
+        pygame.draw.rect(surface, GROUND_COLOR, (SWAMP_START_X + SWAMP_WIDTH, GROUND_Y, 
+                                               SCREEN_WIDTH - (SWAMP_START_X + SWAMP_WIDTH), GROUND_HEIGHT))
+
+    # Draw main ground tiles below the top row (always draw if loaded, regardless of upper tiles)
+    if ground_tile_main_loaded and ground_tile_main:
+        tile_width = ground_tile_main.get_width()
+        tile_height = ground_tile_main.get_height()
+        
+        # Draw left ground (before left water area)
+        left_ground_before_water_width = LEFT_WATER_START_X
+        left_ground_height = SWAMP_HEIGHT - GROUND_HEIGHT
+        left_ground_x = 0
+        left_ground_y = GROUND_Y + GROUND_HEIGHT
+        
+        # Calculate left water area boundaries
+        left_water_top = GROUND_Y + SWAMP_HEIGHT - LEFT_WATER_HEIGHT
+        left_water_bottom = GROUND_Y + SWAMP_HEIGHT
 
-            elif event.type == pygame.KEYDOWN and (event.key == pygame.K_UP or event.key == pygame.K_w):
-                if not paused and not game_end and not game_over:
-                    sfx_vol = 0.0 if settings["sound"]["muted"] else settings["sound"]["sfx"]
-                    sound.play("jump", sfx_vol)
-                if character["on_ground"]:
-                    character["velocity_y"] = character["jump_speed"]
-                    character["on_ground"] = False
-                elif not character["on_ground"] and character["has_double_jump"] and current_time >= character["double_jump_cooldown_end"]:
-                    character["velocity_y"] = character["jump_speed"]
-                    character["has_double_jump"] = False
-                    character["double_jump_cooldown_end"] = current_time + 500
-
-            elif event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
-                if not paused and not game_end and not game_over:
-                    if not character["tongue_extended"]:
-                        mouse_x, mouse_y = pygame.mouse.get_pos()
-                        frog_center_x = character["x"] + character["width"] // 2
-                        frog_center_y = character["y"] + character["height"] // 2
-                        character["tongue_angle"] = math.atan2(mouse_y - frog_center_y, mouse_x - frog_center_x)
-                        character["tongue_extended"] = True
-                        character["tongue_retracting"] = False
-                        character["tongue_length"] = 0
-                        character["tongue_end_time"] = current_time + 300
+        num_tiles_x = int(math.ceil(left_ground_before_water_width / tile_width)) + 1
+        num_tiles_y = int(math.ceil(left_ground_height / tile_height)) + 1
 
-            elif paused and pause_menu_visible and event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                mouse_x, mouse_y = pygame.mouse.get_pos()
-                continue_rect, settings_rect, main_menu_rect, exit_rect, _ = draw_pause_menu(screen, pause_menu_y)
+        for ty in range(num_tiles_y):
+            for tx in range(num_tiles_x):
+                tile_x = left_ground_x + tx * tile_width
+                tile_y = left_ground_y + ty * tile_height
+                tile_right = tile_x + tile_width
+                tile_bottom = tile_y + tile_height
+                
+                # Skip all tiles that are horizontally within the left water area bounds
+                # (both above and within the water area)
+                if tile_right > LEFT_WATER_START_X and tile_x < LEFT_WATER_START_X + LEFT_WATER_WIDTH:
+                    # Skip if tile is not completely below the water (i.e., above or overlapping)
+                    if tile_y < left_water_bottom:
+                        continue
+                
+                surface.blit(ground_tile_main, (tile_x, tile_y))
 
-                if continue_rect and continue_rect.collidepoint(mouse_x, mouse_y):
-                    # When unpausing, add the paused duration to total_paused_time
-                    if pause_start_time > 0:
-                        total_paused_time += current_time - pause_start_time
-                        pause_start_time = 0
-                    paused = False
-                    pause_menu_y = -500
-                    pause_menu_visible = False
-                elif settings_rect and settings_rect.collidepoint(mouse_x, mouse_y):
-                    settings_open = True
-                    settings_menu_y = -500
-                    settings_menu_target_y = None
-                    settings_menu_visible = False
-                elif main_menu_rect and main_menu_rect.collidepoint(mouse_x, mouse_y):
-                    # Launch frontpage and exit game
-                    FRONTPAGE_DIR = os.path.dirname(os.path.abspath(__file__))
-                    FRONTPAGE_PATH = os.path.join(FRONTPAGE_DIR, "frontpage.py")
-                    PROJECT_ROOT = os.path.dirname(FRONTPAGE_DIR)
-                    if os.path.exists(FRONTPAGE_PATH):
-                        subprocess.Popen([sys.executable, os.path.abspath(FRONTPAGE_PATH)], cwd=PROJECT_ROOT)
-                    running = False
-                elif exit_rect and exit_rect.collidepoint(mouse_x, mouse_y):
-                    running = False
-
-            elif settings_open and settings_menu_visible:
-                mouse_x, mouse_y = pygame.mouse.get_pos()
-                result = draw_settings_menu(screen, settings_menu_y)
-                if result:
-                    music_slider_rect, sfx_slider_rect, mute_rect, back_rect, vol_bar_x, vol_bar_width, sfx_vol_bar_x = result
-                else:
-                    music_slider_rect = sfx_slider_rect = mute_rect = back_rect = vol_bar_x = vol_bar_width = sfx_vol_bar_x = None
-                
-                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                    if music_slider_rect and music_slider_rect.collidepoint(mouse_x, mouse_y):
-                        music_slider_dragging = True
-                        # Calculate volume based on click position
-                        relative_x = max(0, min(mouse_x - vol_bar_x, vol_bar_width))
-                        settings["sound"]["music"] = relative_x / vol_bar_width
-                        pygame.mixer.music.set_volume(0.0 if settings["sound"]["muted"] else settings["sound"]["music"])
-                        save_settings()
-                    elif sfx_slider_rect and sfx_slider_rect.collidepoint(mouse_x, mouse_y):
-                        sfx_slider_dragging = True
-                        # Calculate volume based on click position
-                        relative_x = max(0, min(mouse_x - sfx_vol_bar_x, vol_bar_width))
-                        settings["sound"]["sfx"] = relative_x / vol_bar_width
-                        save_settings()
-                    elif mute_rect and mute_rect.collidepoint(mouse_x, mouse_y):
-                        settings["sound"]["muted"] = not settings["sound"]["muted"]
-                        pygame.mixer.music.set_volume(0.0 if settings["sound"]["muted"] else settings["sound"]["music"])
-                        save_settings()
-                    elif back_rect and back_rect.collidepoint(mouse_x, mouse_y):
-                        settings_open = False
-                        settings_menu_y = -500
-                        settings_menu_visible = False
-                        settings_menu_target_y = None
-                        music_slider_dragging = False
-                        sfx_slider_dragging = False
+        # Draw ground between left water and right swamp
+        middle_ground_start_x = LEFT_WATER_START_X + LEFT_WATER_WIDTH
+        middle_ground_width = SWAMP_START_X - middle_ground_start_x
+        middle_ground_height = SWAMP_HEIGHT - GROUND_HEIGHT
+        middle_ground_y = GROUND_Y + GROUND_HEIGHT
+        
+        num_tiles_middle_x = int(math.ceil(middle_ground_width / tile_width)) + 1
+        num_tiles_middle_y = int(math.ceil(middle_ground_height / tile_height)) + 1
+        
+        for ty in range(num_tiles_middle_y):
+            for tx in range(num_tiles_middle_x):
+                tile_x = middle_ground_start_x + tx * tile_width
+                tile_y = middle_ground_y + ty * tile_height
+                tile_right = tile_x + tile_width
+                tile_bottom = tile_y + tile_height
                 
-                elif event.type == pygame.MOUSEMOTION:
-                    if music_slider_dragging and music_slider_rect:
-                        relative_x = max(0, min(mouse_x - vol_bar_x, vol_bar_width))
-                        settings["sound"]["music"] = relative_x / vol_bar_width
-                        pygame.mixer.music.set_volume(0.0 if settings["sound"]["muted"] else settings["sound"]["music"])
-                        save_settings()
-                    elif sfx_slider_dragging and sfx_slider_rect:
-                        relative_x = max(0, min(mouse_x - sfx_vol_bar_x, vol_bar_width))
-                        settings["sound"]["sfx"] = relative_x / vol_bar_width
-                        save_settings()
+                # Skip tiles that overlap with left water area (horizontally and vertically)
+                if tile_right > LEFT_WATER_START_X and tile_x < LEFT_WATER_START_X + LEFT_WATER_WIDTH:
+                    # Skip if tile is not completely below the water (i.e., above or overlapping)
+                    if tile_y < left_water_bottom:
+                        continue
                 
-                elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
-                    music_slider_dragging = False
-                    sfx_slider_dragging = False
-
-            elif game_end and game_end_menu_visible and event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                mouse_x, mouse_y = pygame.mouse.get_pos()
-                restart_rect, main_menu_rect, _ = draw_game_end_menu(screen, game_end_menu_y)
-
-                if restart_rect and restart_rect.collidepoint(mouse_x, mouse_y):
-                    reset_game()
-                    game_end = False
-                    game_end_menu_y = -500
-                    game_end_menu_visible = False
-                    game_end_menu_target_y = None
-                elif main_menu_rect and main_menu_rect.collidepoint(mouse_x, mouse_y):
-                    # Launch frontpage and exit game
-                    FRONTPAGE_DIR = os.path.dirname(os.path.abspath(__file__))
-                    FRONTPAGE_PATH = os.path.join(FRONTPAGE_DIR, "frontpage.py")
-                    PROJECT_ROOT = os.path.dirname(FRONTPAGE_DIR)
-                    if os.path.exists(FRONTPAGE_PATH):
-                        subprocess.Popen([sys.executable, os.path.abspath(FRONTPAGE_PATH)], cwd=PROJECT_ROOT)
-                    running = False
-
-            elif game_over and event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                mouse_x, mouse_y = pygame.mouse.get_pos()
-                if restart_rect.collidepoint(mouse_x, mouse_y):
-                    reset_game()
-                    game_over = False
-
-            elif not paused and not game_end and not game_over and event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                sfx_vol = 0.0 if settings["sound"]["muted"] else settings["sound"]["sfx"]
-                sound.play("hit", sfx_vol)
-                if not character["tongue_extended"]:
-                    mouse_x, mouse_y = pygame.mouse.get_pos()
-                    frog_center_x = character["x"] + character["width"] // 2
-                    frog_center_y = character["y"] + character["height"] // 2
-                    character["tongue_angle"] = math.atan2(mouse_y - frog_center_y, mouse_x - frog_center_x)
-                    character["tongue_extended"] = True
-                    character["tongue_retracting"] = False
-                    character["tongue_length"] = 0
-                    character["tongue_end_time"] = current_time + 300
-
+                surface.blit(ground_tile_main, (tile_x, tile_y))
+
+        # Draw ground after right swamp
+        # The top part (GROUND_HEIGHT) is already handled by ground_tile_upper above
+        # Only draw the bottom part (SWAMP_HEIGHT - GROUND_HEIGHT) using main tiles
+        right_ground_start_x = SWAMP_START_X + SWAMP_WIDTH
+        right_ground_width = SCREEN_WIDTH - right_ground_start_x
+        right_ground_height = SWAMP_HEIGHT - GROUND_HEIGHT
+        right_ground_y = GROUND_Y + GROUND_HEIGHT
+        
+        num_tiles_right_x = int(math.ceil(right_ground_width / tile_width)) + 1
+        num_tiles_right_y = int(math.ceil(right_ground_height / tile_height)) + 1
+        
+        for ty in range(num_tiles_right_y):
+            for tx in range(num_tiles_right_x):
+                tile_x = right_ground_start_x + tx * tile_width
+                tile_y = right_ground_y + ty * tile_height
+                surface.blit(ground_tile_main, (tile_x, tile_y))
+    else:
+        # Draw ground rectangles, but skip left water and right swamp areas
+        pygame.draw.rect(surface, GROUND_COLOR, (0, GROUND_Y + GROUND_HEIGHT, LEFT_WATER_START_X, SWAMP_HEIGHT - GROUND_HEIGHT))
+        pygame.draw.rect(surface, GROUND_COLOR, (LEFT_WATER_START_X + LEFT_WATER_WIDTH, GROUND_Y + GROUND_HEIGHT, 
+                                               SWAMP_START_X - (LEFT_WATER_START_X + LEFT_WATER_WIDTH), SWAMP_HEIGHT - GROUND_HEIGHT))
+        pygame.draw.rect(surface, GROUND_COLOR, (SWAMP_START_X + SWAMP_WIDTH, GROUND_Y + GROUND_HEIGHT, 
+                                               SCREEN_WIDTH - (SWAMP_START_X + SWAMP_WIDTH), SWAMP_HEIGHT - GROUND_HEIGHT))
+
+    # Draw water tiles and crocodile in swamp area
+    if water_tile_1_loaded and water_tile_2_loaded and water_tile_3_loaded and water_tile_4_loaded:
+        # Get tile dimensions (already scaled)
+        tile_width = water_tile_1.get_width()
+    tile_height = water_tile_1.get_height()
     
-        shake_x, shake_y = 0, 0
-        if game_over:
-            elapsed = pygame.time.get_ticks() - game_over_start_time
-            if elapsed < shake_duration:
-                shake_x = random.randint(-shake_magnitude, shake_magnitude)
-            shake_y = random.randint(-shake_magnitude, shake_magnitude)
-
-        # Draw background
-        if background_loaded and background_img:
-            if background_img.get_size() != (SCREEN_WIDTH, SCREEN_HEIGHT):
-                screen.blit(pygame.transform.scale(background_img, (SCREEN_WIDTH, SCREEN_HEIGHT)), (shake_x, shake_y))
-            else:
-                screen.blit(background_img, (0, 0))
-        else:
-            screen.fill(BG_COLOR)
-    
-        # Draw hanging vines from top of screen
-        if vines_top_1_loaded and vines_top_2_loaded and vines_top_3_loaded:
-            VINE_SCALE = 3.0  # Scale vines to be much bigger
-            vines_top_imgs = [vines_top_1_img, vines_top_2_img, vines_top_3_img]
-            # Position vines across the screen, hanging from top
-            vine_positions = [
-                {"x": int(SCREEN_WIDTH * 0.15), "img": vines_top_1_img},
-                {"x": int(SCREEN_WIDTH * 0.5), "img": vines_top_2_img},
-                {"x": int(SCREEN_WIDTH * 0.85), "img": vines_top_3_img}
-            ]
-            # Shadow settings for vines
-            vine_shadow_offset_x = 8
-            vine_shadow_offset_y = 8
-            vine_shadow_alpha = 120
-            
-            for vine_data in vine_positions:
-                vine_img = vine_data["img"]
-                # Scale the vine image
-                scaled_width = int(vine_img.get_width() * VINE_SCALE)
-                scaled_height = int(vine_img.get_height() * VINE_SCALE)
-                vine_scaled = pygame.transform.scale(vine_img, (scaled_width, scaled_height))
-                
-                # Create shadow surface for vine
-                vine_shadow_surface = pygame.Surface((scaled_width, scaled_height), pygame.SRCALPHA)
-                vine_shadow_surface.fill((0, 0, 0, vine_shadow_alpha))
-                vine_shadow_surface.blit(vine_scaled, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-                
-                vine_x = vine_data["x"] - vine_scaled.get_width() // 2
-                vine_y = 0  # Hang from top of screen
-                
-                # Draw shadow first
-                screen.blit(vine_shadow_surface, (vine_x + vine_shadow_offset_x, vine_y + vine_shadow_offset_y))
-                # Draw vine on top
-                screen.blit(vine_scaled, (vine_x, vine_y))
-    
-        # Draw left tree branches
-        if thumbnail_wood_loaded and thumbnail_wood_img and (branch_1_loaded and branch_2_loaded and branch_3_loaded and branch_4_loaded):
-            trunk_width = thumbnail_wood_img.get_width()
-            branch_imgs = [branch_1_img, branch_2_img, branch_3_img, branch_4_img]
-            # Shadow settings for branches
-            branch_shadow_offset_x = 8
-            branch_shadow_offset_y = 8
-            branch_shadow_alpha = 120
-            
-            for i, (pos, branch_img) in enumerate(zip(LEFT_BRANCH_POSITIONS, branch_imgs)):
-                scaled = scale_branch(branch_img, BRANCH_SCALE)
-                if scaled:
-                    branch_x = trunk_width - scaled.get_width() // 2 + pos["offset"]
-                    branch_y = int(SCREEN_HEIGHT * pos["y"])
-                    
-                    # Create shadow surface for branch
-                    branch_shadow_surface = pygame.Surface(scaled.get_size(), pygame.SRCALPHA)
-                    branch_shadow_surface.fill((0, 0, 0, branch_shadow_alpha))
-                    branch_shadow_surface.blit(scaled, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-                    
-                    # Draw shadow first
-                    screen.blit(branch_shadow_surface, (branch_x + branch_shadow_offset_x, branch_y + branch_shadow_offset_y))
-                    # Draw branch on top
-                    screen.blit(scaled, (branch_x, branch_y))
-    
-        # Draw right tree branches
-        if thumbnail_wood_loaded and thumbnail_wood_img and (branch_right_1_loaded and branch_right_2_loaded and branch_right_3_loaded and branch_right_4_loaded):
-            trunk_width = thumbnail_wood_img.get_width()
-            right_trunk_x = SCREEN_WIDTH - trunk_width
-            branch_imgs = [branch_right_1_img, branch_right_2_img, branch_right_3_img, branch_right_4_img]
-            # Shadow settings for branches (same as left branches)
-            branch_shadow_offset_x = 8
-            branch_shadow_offset_y = 8
-            branch_shadow_alpha = 120
-            
-            for pos, branch_img in zip(RIGHT_BRANCH_POSITIONS, branch_imgs):
-                scaled = scale_branch(branch_img, BRANCH_SCALE)
-                if scaled:
-                    branch_x = right_trunk_x + trunk_width - scaled.get_width() // 2 + pos["offset"]
-                    branch_y = int(SCREEN_HEIGHT * pos["y"])
-                    
-                    # Create shadow surface for branch
-                    branch_shadow_surface = pygame.Surface(scaled.get_size(), pygame.SRCALPHA)
-                    branch_shadow_surface.fill((0, 0, 0, branch_shadow_alpha))
-                    branch_shadow_surface.blit(scaled, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-                    
-                    # Draw shadow first (offset to the left for right side)
-                    screen.blit(branch_shadow_surface, (branch_x - branch_shadow_offset_x, branch_y + branch_shadow_offset_y))
-                    # Draw branch on top
-                    screen.blit(scaled, (branch_x, branch_y))
-    
-        # Draw tree trunk design on both left and right sides - fill the edges vertically with no gaps
-        if thumbnail_wood_loaded and thumbnail_wood_img:
-            tile_width = thumbnail_wood_img.get_width()
-            tile_height = thumbnail_wood_img.get_height()
-            
-            # Shadow settings
-            shadow_offset_x = 8
-        shadow_offset_y = 8
-        shadow_alpha = 120  # Shadow opacity (0-255)
-        
-        # Create shadow surface from thumbnail_wood's alpha channel
-        shadow_surface = pygame.Surface(thumbnail_wood_img.get_size(), pygame.SRCALPHA)
-        shadow_surface.fill((0, 0, 0, shadow_alpha))
-        shadow_surface.blit(thumbnail_wood_img, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-        
-        # Calculate how many tiles needed to fill the screen height (add extra to ensure no gaps)
-        num_tiles_y = int(math.ceil(SCREEN_HEIGHT / tile_height)) + 2
-        
-        # Draw tiles vertically on the left edge
-        for ty in range(num_tiles_y):
-            tree_tile_y = ty * tile_height
-            # Skip tiles that extend beyond screen bounds
-            if tree_tile_y >= SCREEN_HEIGHT:
-                continue
-            # Draw shadow first
-            screen.blit(shadow_surface, (shadow_offset_x, tree_tile_y + shadow_offset_y))
-            # Draw thumbnail_wood tile on the left
-            screen.blit(thumbnail_wood_img, (0, tree_tile_y))
-        
-        # Draw tiles vertically on the right edge (symmetrically)
-        right_edge_x = SCREEN_WIDTH - tile_width
-        for ty in range(num_tiles_y):
-            tree_tile_y = ty * tile_height
-            # Skip tiles that extend beyond screen bounds
-            if tree_tile_y >= SCREEN_HEIGHT:
-                continue
-            # Draw shadow first (offset to the left for right side)
-            screen.blit(shadow_surface, (right_edge_x - shadow_offset_x, tree_tile_y + shadow_offset_y))
-            # Draw thumbnail_wood tile on the right
-            screen.blit(thumbnail_wood_img, (right_edge_x, tree_tile_y))
+    # Calculate crocodile position (will be set when crocodile is loaded)
+    crocodile_x = SWAMP_START_X + (SWAMP_WIDTH // 2)
+    crocodile_y = GROUND_Y
+    crocodile_width = 0
+    crocodile_height = 0
     
-        # Draw tree tile 16 along the top row with random orientations (overlapping to fill gaps)
-        if tree_tile_16_loaded and tree_tile_16_img:
-            tile_16_width = tree_tile_16_img.get_width()
-        tile_16_height = tree_tile_16_img.get_height()
+    if crocodile_frame_1_loaded and crocodile_frame_2_loaded and crocodile_frame_1 and crocodile_frame_2:
+        # Use pre-scaled and darkened crocodile frames
+        current_crocodile = crocodile_frame_1 if crocodile_frame == 0 else crocodile_frame_2
+        crocodile_width = current_crocodile.get_width()
+        crocodile_height = current_crocodile.get_height()
+        # Center crocodile horizontally
+        crocodile_x = SWAMP_START_X + (SWAMP_WIDTH - crocodile_width) // 2
+        # Position crocodile a little higher than water tiles
+        crocodile_y = GROUND_Y - 10  # Move up by 10 pixels
+    
+    # Draw plant in water first (so water tiles and crocodile can overlap it)
+    if plant_loaded and plant_img:
+        plant_width = plant_img.get_width()
+        plant_height = plant_img.get_height()
+        # Center plant horizontally in the swamp
+        plant_x = SWAMP_START_X + (SWAMP_WIDTH - plant_width) // 2
+        # Position plant at the bottom of the water (ground level)
+        plant_y = GROUND_Y + SWAMP_HEIGHT - plant_height
         
-        # Shadow settings
+        # Red plant is not drawn - it's only used for platform collision detection
+        
+        # Draw shadow first (offset down and to the right)
         shadow_offset_x = 8
         shadow_offset_y = 8
         shadow_alpha = 120  # Shadow opacity (0-255)
         
-        # Calculate spacing to ensure tiles overlap and fill the screen
-        # Use a smaller spacing than tile width to create overlap
-        overlap_amount = tile_16_width * 0.4  # 40% overlap for better coverage
-        tile_spacing = tile_16_width - overlap_amount
-        
-        # Calculate how many tiles needed to cover the screen width (more tiles for better coverage)
-        num_tiles_x = int(math.ceil(SCREEN_WIDTH / tile_spacing)) + 3
+        # Create shadow surface from plant's alpha channel
+        shadow_surface = surfaces.track(pygame.Surface(plant_img.get_size(), pygame.SRCALPHA), "shadow")
+        # Create a dark shadow by extracting alpha from plant and applying dark color
+        # Fill with black at the shadow alpha level
+        shadow_surface.fill((0, 0, 0, shadow_alpha))
+        # Use the plant's alpha channel to shape the shadow
+        shadow_surface.blit(plant_img, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+        # Draw shadow with offset
+        surface.blit(shadow_surface, (plant_x + shadow_offset_x, plant_y + shadow_offset_y))
         
-        # Draw tiles along the top row with overlap
+        # Draw plant on top of shadow and red plant
+        surface.blit(plant_img, (plant_x, plant_y))
+    
+    # Calculate how many tiles fit in the swamp (add extra to ensure no gaps)
+    num_tiles_x = int(math.ceil(SWAMP_WIDTH / tile_width)) + 2
+    num_tiles_y = int(math.ceil(SWAMP_HEIGHT / tile_height)) + 2
+    
+    # Draw water tiles (on top of plant)
+    for ty in range(num_tiles_y):
         for tx in range(num_tiles_x):
-            tile_x = tx * tile_spacing
-            if tile_x >= SCREEN_WIDTH + tile_16_width:
-                continue
+            tile_x = SWAMP_START_X + tx * tile_width
+            tile_y = GROUND_Y + ty * tile_height
+            tile_right = tile_x + tile_width
+            tile_bottom = tile_y + tile_height
             
-            # Use tile position as seed for consistent rotation per tile
-            # Save random state to avoid affecting other random operations
-            random_state = random.getstate()
-            random.seed(tx)
-            rotation = random.choice([0, 90, 180, 270])
-            random.setstate(random_state)  # Restore random state
-            rotated_tile = pygame.transform.rotate(tree_tile_16_img, rotation)
-            
-            # Create shadow surface for rotated tile
-            shadow_surface = pygame.Surface(rotated_tile.get_size(), pygame.SRCALPHA)
-            shadow_surface.fill((0, 0, 0, shadow_alpha))
-            shadow_surface.blit(rotated_tile, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-            
-            # Adjust position if rotated (to keep tiles aligned)
-            if rotation == 90 or rotation == 270:
-                # For 90/270 degree rotations, swap width and height
-                offset_x = (tile_16_height - tile_16_width) // 2
-                offset_y = (tile_16_width - tile_16_height) // 2
-            else:
-                offset_x = 0
-                offset_y = 0
+            # Skip tiles that extend outside the swamp boundaries
+            if tile_x >= SWAMP_START_X + SWAMP_WIDTH or tile_right <= SWAMP_START_X:
+                continue
+            if tile_y >= GROUND_Y + SWAMP_HEIGHT or tile_bottom <= GROUND_Y:
+                continue
             
-            # Draw shadow first
-            screen.blit(shadow_surface, (tile_x + offset_x + shadow_offset_x, offset_y + shadow_offset_y))
-            # Draw tile on top
-            screen.blit(rotated_tile, (tile_x + offset_x, offset_y))
+            # Determine which tile to use based on position
+            if ty == 0:  # Top row
+                # Check if this position overlaps with crocodile
+                if crocodile_frame_1_loaded and crocodile_frame_2_loaded and crocodile_width > 0:
+                    crocodile_left = crocodile_x
+                    crocodile_right = crocodile_x + crocodile_width
+                    tile_right = tile_x + tile_width
+                    tile_center = tile_x + tile_width // 2
+                    crocodile_center = crocodile_x + crocodile_width // 2
+                    
+                    # If tile center is to the left of crocodile center, use tile 1 (left side)
+                    if tile_center < crocodile_center:
+                        # Animate between tile 1 and tile 2
+                        current_tile = water_tile_1 if water_frame == 0 else water_tile_2
+                    # If tile center is to the right of crocodile center, use tile 2 (right side)
+                    else:
+                        # Animate between tile 2 and tile 1
+                        current_tile = water_tile_2 if water_frame == 0 else water_tile_1
+                else:
+                    # No crocodile, alternate between tile 1 and 2
+                    current_tile = water_tile_1 if (tx + water_frame) % 2 == 0 else water_tile_2
+            else:  # Bottom rows
+                # Use tiles 3 and 4, animate between tile 3 and 4
+                current_tile = water_tile_3 if water_frame == 0 else water_tile_4
+            
+            # Draw tile even if it overlaps with crocodile (crocodile will be drawn on top)
+            surface.blit(current_tile, (tile_x, tile_y))
     
-        # Draw animated tree tiles 21, 22, 23 just below the top row (overlapping to fill gaps)
-        if tree_tile_21_loaded and tree_tile_22_loaded and tree_tile_23_loaded:
-            if tree_tile_21_img and tree_tile_22_img and tree_tile_23_img:
-                tile_21_width = tree_tile_21_img.get_width()
-                tile_21_height = tree_tile_21_img.get_height()
-                
-                # Shadow settings
-            shadow_offset_x = 8
-            shadow_offset_y = 8
-            shadow_alpha = 120  # Shadow opacity (0-255)
-            
-            # Get current time for animation
-            current_time = pygame.time.get_ticks()
-            # Change tile every 200ms for animation effect
-            animation_frame = (current_time // 200) % 3
-            
-            # Select which tile to show based on animation frame
-            if animation_frame == 0:
-                current_animated_tile = tree_tile_21_img
-            elif animation_frame == 1:
-                current_animated_tile = tree_tile_22_img
-            else:
-                current_animated_tile = tree_tile_23_img
-            
-            # Create shadow surface for animated tile
-            shadow_surface = pygame.Surface(current_animated_tile.get_size(), pygame.SRCALPHA)
-            shadow_surface.fill((0, 0, 0, shadow_alpha))
-            shadow_surface.blit(current_animated_tile, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-            
-            # Calculate spacing to ensure tiles overlap and fill the screen
-            # Use a smaller spacing than tile width to create overlap
-            overlap_amount = tile_21_width * 0.4  # 40% overlap for better coverage
-            tile_spacing = tile_21_width - overlap_amount
-            
-            # Calculate how many tiles needed to cover the screen width (more tiles for better coverage)
-            num_tiles_x = int(math.ceil(SCREEN_WIDTH / tile_spacing)) + 3
-            
-            # Get the height of tile 16 to position animated tiles overlapping with it
-            tile_16_height = tree_tile_16_img.get_height() if tree_tile_16_loaded and tree_tile_16_img else tile_21_height
-            
-            # Calculate overlap amount between rows (overlap by 15% of tile height for less overlap)
-            row_overlap = tile_16_height * 0.15
-            
-            # Draw tiles in the row just below the top row with overlap
-            for tx in range(num_tiles_x):
-                tile_x = tx * tile_spacing
-                if tile_x >= SCREEN_WIDTH + tile_21_width:
-                    continue
-                
-                # Position overlapping with the top row but lower (move up by smaller overlap amount)
-                tile_y = tile_16_height - row_overlap
-                
-                # Draw shadow first
-                screen.blit(shadow_surface, (tile_x + shadow_offset_x, tile_y + shadow_offset_y))
-                # Draw tile on top
-                screen.blit(current_animated_tile, (tile_x, tile_y))
+    # Draw crocodile on top (at top middle, overlapping plant and water)
+    if crocodile_frame_1_loaded and crocodile_frame_2_loaded and crocodile_frame_1 and crocodile_frame_2 and crocodile_width > 0:
+        surface.blit(current_crocodile, (crocodile_x, crocodile_y))
+
+    # Draw left water section (smaller than right side)
+    if water_tile_1_loaded and water_tile_2_loaded and water_tile_3_loaded and water_tile_4_loaded:
+        tile_width = water_tile_1.get_width()
+    tile_height = water_tile_1.get_height()
     
-        # Draw ground and swamp
-        if ground_tile_upper_loaded and ground_tile_upper:
-            upper_tile_width = ground_tile_upper.get_width()
-            upper_tile_height = ground_tile_upper.get_height()
-
-            top_right_corner_x = ((SWAMP_START_X - 1) // upper_tile_width) * upper_tile_width
-            top_right_corner_y = GROUND_Y
-
-            top_left_right_ground_x = ((SWAMP_START_X + SWAMP_WIDTH) // upper_tile_width) * upper_tile_width
-            top_left_right_ground_y = GROUND_Y
+    # Calculate crocodile position for left water area
+    left_crocodile_x = LEFT_WATER_START_X + (LEFT_WATER_WIDTH // 2)
+    left_crocodile_y = GROUND_Y + SWAMP_HEIGHT - LEFT_WATER_HEIGHT
+    left_crocodile_width = 0
+    left_crocodile_height = 0
+    
+    if crocodile_frame_1_loaded and crocodile_frame_2_loaded and crocodile_frame_1 and crocodile_frame_2:
+        # Use pre-scaled and darkened crocodile frames
+        current_left_crocodile = crocodile_frame_1 if crocodile_frame == 0 else crocodile_frame_2
+        left_crocodile_width = current_left_crocodile.get_width()
+        left_crocodile_height = current_left_crocodile.get_height()
+        # Center crocodile horizontally in left water area
+        left_crocodile_x = LEFT_WATER_START_X + (LEFT_WATER_WIDTH - left_crocodile_width) // 2
+        # Position crocodile at the top of the left water area
+        left_crocodile_y = GROUND_Y + SWAMP_HEIGHT - LEFT_WATER_HEIGHT - 10  # Move up by 10 pixels
+    
+    # Calculate how many tiles fit in the left water area (add extra to ensure no gaps)
+    num_tiles_x = int(math.ceil(LEFT_WATER_WIDTH / tile_width)) + 2
+    num_tiles_y = int(math.ceil(LEFT_WATER_HEIGHT / tile_height)) + 2
+    
+    # Offset to slide water texture to the left
+    water_texture_offset_x = -15
+    
+    # Draw water tiles for left water section
+    for ty in range(num_tiles_y):
+        for tx in range(num_tiles_x):
+            tile_x = LEFT_WATER_START_X + tx * tile_width + water_texture_offset_x
+            tile_y = GROUND_Y + SWAMP_HEIGHT - LEFT_WATER_HEIGHT + ty * tile_height
+            tile_right = tile_x + tile_width
+            tile_bottom = tile_y + tile_height
             
-            # Calculate left water corner positions
-            left_water_left_corner_x = ((LEFT_WATER_START_X - 1) // upper_tile_width) * upper_tile_width
-            left_water_right_corner_x = ((LEFT_WATER_START_X + LEFT_WATER_WIDTH) // upper_tile_width) * upper_tile_width
-
-            num_tiles_upper_x = int(math.ceil(SCREEN_WIDTH / upper_tile_width)) + 1
-            num_tiles_upper_y = int(math.ceil(GROUND_HEIGHT / upper_tile_height)) + 1
+            # Skip tiles that extend outside the left water boundaries
+            if tile_x >= LEFT_WATER_START_X + LEFT_WATER_WIDTH or tile_right <= LEFT_WATER_START_X:
+                continue
+            if tile_y >= GROUND_Y + SWAMP_HEIGHT or tile_bottom <= GROUND_Y + SWAMP_HEIGHT - LEFT_WATER_HEIGHT:
+                continue
             
-            for ty in range(num_tiles_upper_y):
-                for tx in range(num_tiles_upper_x):
-                    tile_x = tx * upper_tile_width
-                    tile_y = GROUND_Y + ty * upper_tile_height
-                    tile_right = tile_x + upper_tile_width
-                    
-                    # Skip tiles that overlap with the left water area
-                    if tile_right > LEFT_WATER_START_X and tile_x < LEFT_WATER_START_X + LEFT_WATER_WIDTH:
-                        continue
-                    # Skip tiles that overlap with the swamp area
-                    if tile_right > SWAMP_START_X and tile_x < SWAMP_START_X + SWAMP_WIDTH:
-                        continue
-                    
-                    # Skip corner tiles that are in the left water area (only for first row)
-                    if ty == 0 and (tile_x == left_water_left_corner_x or tile_x == left_water_right_corner_x):
-                        continue
-                    
-                    # Skip corner positions (only for first row)
-                    if ty == 0:
-                        if (tile_x == top_right_corner_x and tile_y == top_right_corner_y) or \
-                           (tile_x == top_left_right_ground_x and tile_y == top_left_right_ground_y):
-                            continue
+            # Determine which tile to use based on position
+            if ty == 0:  # Top row
+                # Check if this position overlaps with crocodile
+                if crocodile_frame_1_loaded and crocodile_frame_2_loaded and left_crocodile_width > 0:
+                    left_crocodile_left = left_crocodile_x
+                    left_crocodile_right = left_crocodile_x + left_crocodile_width
+                    tile_center = tile_x + tile_width // 2
+                    left_crocodile_center = left_crocodile_x + left_crocodile_width // 2
                     
-                    screen.blit(ground_tile_upper, (tile_x, tile_y))
-
-            # Only draw corner tiles if they're not in the left water area
-            if ground_tile_corner_loaded and ground_tile_corner:
-                if not (top_right_corner_x >= LEFT_WATER_START_X and top_right_corner_x < LEFT_WATER_START_X + LEFT_WATER_WIDTH):
-                    screen.blit(ground_tile_corner, (top_right_corner_x, top_right_corner_y))
+                    # If tile center is to the left of crocodile center, use tile 1 (left side)
+                    if tile_center < left_crocodile_center:
+                        # Animate between tile 1 and tile 2
+                        current_tile = water_tile_1 if water_frame == 0 else water_tile_2
+                    # If tile center is to the right of crocodile center, use tile 2 (right side)
+                    else:
+                        # Animate between tile 2 and tile 1
+                        current_tile = water_tile_2 if water_frame == 0 else water_tile_1
+                else:
+                    # No crocodile, alternate between tile 1 and 2
+                    current_tile = water_tile_1 if (tx + water_frame) % 2 == 0 else water_tile_2
+            else:  # Bottom rows
+                # Use tiles 3 and 4, animate between tile 3 and 4
+                current_tile = water_tile_3 if water_frame == 0 else water_tile_4
+            
+            # Draw tile even if it overlaps with crocodile (crocodile will be drawn on top)
+            surface.blit(current_tile, (tile_x, tile_y))
+    
+    # Draw crocodile on top of left water section
+    if crocodile_frame_1_loaded and crocodile_frame_2_loaded and crocodile_frame_1 and crocodile_frame_2 and left_crocodile_width > 0:
+        surface.blit(current_left_crocodile, (left_crocodile_x, left_crocodile_y))
+    else:
+        # Fallback to solid color if tiles not loaded
+        pygame.draw.rect(surface, SWAMP_COLOR, (SWAMP_START_X, GROUND_Y, SWAMP_WIDTH, SWAMP_HEIGHT))
 
-            if ground_tile_left_corner_loaded and ground_tile_left_corner:
-                if not (top_left_right_ground_x >= LEFT_WATER_START_X and top_left_right_ground_x < LEFT_WATER_START_X + LEFT_WATER_WIDTH):
-                    screen.blit(ground_tile_left_corner, (top_left_right_ground_x, top_left_right_ground_y))
-        else:
-            # Draw ground rectangles, but skip left water and right swamp areas
-            pygame.draw.rect(screen, GROUND_COLOR, (0, GROUND_Y, LEFT_WATER_START_X, GROUND_HEIGHT))
-            pygame.draw.rect(screen, GROUND_COLOR, (LEFT_WATER_START_X + LEFT_WATER_WIDTH, GROUND_Y, 
-                                                   SWAMP_START_X - (LEFT_WATER_START_X + LEFT_WATER_WIDTH), GROUND_HEIGHT))
-            pygame.draw.rect(screen, GROUND_COLOR, (SWAMP_START_X + SWAMP_WIDTH, GROUND_Y, 
-                                                   SCREEN_WIDTH - (SWAMP_START_X + SWAMP_WIDTH), GROUND_HEIGHT))
-
-        # Draw main ground tiles below the top row (always draw if loaded, regardless of upper tiles)
-        if ground_tile_main_loaded and ground_tile_main:
-            tile_width = ground_tile_main.get_width()
-            tile_height = ground_tile_main.get_height()
-            
-            # Draw left ground (before left water area)
-            left_ground_before_water_width = LEFT_WATER_START_X
-            left_ground_height = SWAMP_HEIGHT - GROUND_HEIGHT
-            left_ground_x = 0
-            left_ground_y = GROUND_Y + GROUND_HEIGHT
-            
-            # Calculate left water area boundaries
-            left_water_top = GROUND_Y + SWAMP_HEIGHT - LEFT_WATER_HEIGHT
-            left_water_bottom = GROUND_Y + SWAMP_HEIGHT
+    profiler.mark("ground/water")
 
-            num_tiles_x = int(math.ceil(left_ground_before_water_width / tile_width)) + 1
-            num_tiles_y = int(math.ceil(left_ground_height / tile_height)) + 1
+    # Draw smaller plant to the left of the rock and right of the left water
+    if small_plant_loaded and small_plant_img:
+        small_plant_width = small_plant_img.get_width()
+    small_plant_height = small_plant_img.get_height()
+    
+    # Calculate position: to the left of rock, right of left water
+    left_water_end = LEFT_WATER_START_X + LEFT_WATER_WIDTH
+    space_between = SWAMP_START_X - left_water_end
+    
+    # Calculate rock position first to position plant relative to it
+    if rocks_loaded and rocks_img:
+        rocks_width = rocks_img.get_width()
+        rocks_x = left_water_end + int(space_between * 0.5) - rocks_width // 2
+    else:
+        rocks_x = left_water_end + int(space_between * 0.5)
+    
+    # Position plant between left water and rock (about 30% from left water)
+    small_plant_x = left_water_end + int((rocks_x - left_water_end) * 0.3) - small_plant_width // 2
+    small_plant_y = GROUND_Y - small_plant_height
+    
+    # Draw red plant behind (invisible, for collision detection)
+    if small_plant_red_loaded and small_plant_red_img:
+        surface.blit(small_plant_red_img, (small_plant_x, small_plant_y))
+    
+    # Draw shadow first
+    shadow_offset_x = 8
+    shadow_offset_y = 8
+    shadow_alpha = 120
+    shadow_surface = surfaces.track(pygame.Surface(small_plant_img.get_size(), pygame.SRCALPHA), "shadow")
+    shadow_surface.fill((0, 0, 0, shadow_alpha))
+    shadow_surface.blit(small_plant_img, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+    surface.blit(shadow_surface, (small_plant_x + shadow_offset_x, small_plant_y + shadow_offset_y))
+    
+    # Draw small plant
+    surface.blit(small_plant_img, (small_plant_x, small_plant_y))
 
-            for ty in range(num_tiles_y):
-                for tx in range(num_tiles_x):
-                    tile_x = left_ground_x + tx * tile_width
-                    tile_y = left_ground_y + ty * tile_height
-                    tile_right = tile_x + tile_width
-                    tile_bottom = tile_y + tile_height
-                    
-                    # Skip all tiles that are horizontally within the left water area bounds
-                    # (both above and within the water area)
-                    if tile_right > LEFT_WATER_START_X and tile_x < LEFT_WATER_START_X + LEFT_WATER_WIDTH:
-                        # Skip if tile is not completely below the water (i.e., above or overlapping)
-                        if tile_y < left_water_bottom:
-                            continue
-                    
-                    screen.blit(ground_tile_main, (tile_x, tile_y))
+    # Draw smaller plant to the left of the rock and right of the left water
+    if small_plant_loaded and small_plant_img:
+        small_plant_width = small_plant_img.get_width()
+    small_plant_height = small_plant_img.get_height()
+    
+    # Calculate position: to the left of rock, right of left water
+    left_water_end = LEFT_WATER_START_X + LEFT_WATER_WIDTH
+    space_between = SWAMP_START_X - left_water_end
+    
+    # Calculate rock position first to position plant relative to it
+    if rocks_loaded and rocks_img:
+        rocks_width = rocks_img.get_width()
+        rocks_x = left_water_end + int(space_between * 0.5) - rocks_width // 2
+    else:
+        rocks_x = left_water_end + int(space_between * 0.5)
+    
+    # Position plant between left water and rock (about 30% from left water)
+    small_plant_x = left_water_end + int((rocks_x - left_water_end) * 0.3) - small_plant_width // 2
+    small_plant_y = GROUND_Y - small_plant_height
+    
+    # Draw red plant behind (invisible, for collision detection)
+    if small_plant_red_loaded and small_plant_red_img:
+        surface.blit(small_plant_red_img, (small_plant_x, small_plant_y))
+    
+    # Draw shadow first
+    shadow_offset_x = 8
+    shadow_offset_y = 8
+    shadow_alpha = 120
+    shadow_surface = surfaces.track(pygame.Surface(small_plant_img.get_size(), pygame.SRCALPHA), "shadow")
+    shadow_surface.fill((0, 0, 0, shadow_alpha))
+    shadow_surface.blit(small_plant_img, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+    surface.blit(shadow_surface, (small_plant_x + shadow_offset_x, small_plant_y + shadow_offset_y))
+    
+    # Draw small plant
+    surface.blit(small_plant_img, (small_plant_x, small_plant_y))
 
-            # Draw ground between left water and right swamp
-            middle_ground_start_x = LEFT_WATER_START_X + LEFT_WATER_WIDTH
-            middle_ground_width = SWAMP_START_X - middle_ground_start_x
-            middle_ground_height = SWAMP_HEIGHT - GROUND_HEIGHT
-            middle_ground_y = GROUND_Y + GROUND_HEIGHT
-            
-            num_tiles_middle_x = int(math.ceil(middle_ground_width / tile_width)) + 1
-            num_tiles_middle_y = int(math.ceil(middle_ground_height / tile_height)) + 1
-            
-            for ty in range(num_tiles_middle_y):
-                for tx in range(num_tiles_middle_x):
-                    tile_x = middle_ground_start_x + tx * tile_width
-                    tile_y = middle_ground_y + ty * tile_height
-                    tile_right = tile_x + tile_width
-                    tile_bottom = tile_y + tile_height
-                    
-                    # Skip tiles that overlap with left water area (horizontally and vertically)
-                    if tile_right > LEFT_WATER_START_X and tile_x < LEFT_WATER_START_X + LEFT_WATER_WIDTH:
-                        # Skip if tile is not completely below the water (i.e., above or overlapping)
-                        if tile_y < left_water_bottom:
-                            continue
-                    
-                    screen.blit(ground_tile_main, (tile_x, tile_y))
-
-            # Draw ground after right swamp
-            # The top part (GROUND_HEIGHT) is already handled by ground_tile_upper above
-            # Only draw the bottom part (SWAMP_HEIGHT - GROUND_HEIGHT) using main tiles
-            right_ground_start_x = SWAMP_START_X + SWAMP_WIDTH
-            right_ground_width = SCREEN_WIDTH - right_ground_start_x
-            right_ground_height = SWAMP_HEIGHT - GROUND_HEIGHT
-            right_ground_y = GROUND_Y + GROUND_HEIGHT
-            
-            num_tiles_right_x = int(math.ceil(right_ground_width / tile_width)) + 1
-            num_tiles_right_y = int(math.ceil(right_ground_height / tile_height)) + 1
-            
-            for ty in range(num_tiles_right_y):
-                for tx in range(num_tiles_right_x):
-                    tile_x = right_ground_start_x + tx * tile_width
-                    tile_y = right_ground_y + ty * tile_height
-                    screen.blit(ground_tile_main, (tile_x, tile_y))
+    # Draw rocks between the two water areas (natural positioning, not perfectly centered)
+    if rocks_loaded and rocks_img:
+        rocks_width = rocks_img.get_width()
+    rocks_height = rocks_img.get_height()
+    
+    # Calculate the space between water areas
+    left_water_end = LEFT_WATER_START_X + LEFT_WATER_WIDTH
+    space_between = SWAMP_START_X - left_water_end
+    
+    # Position rocks naturally - slightly offset from center (moved more to the right)
+    rocks_x = left_water_end + int(space_between * 0.5) - rocks_width // 2
+    # Position at ground level (bottom of rocks sits on ground)
+    rocks_y = GROUND_Y - rocks_height
+    
+    # Draw shadow first
+    shadow_offset_x = 8
+    shadow_offset_y = 8
+    shadow_alpha = 120
+    shadow_surface = surfaces.track(pygame.Surface(rocks_img.get_size(), pygame.SRCALPHA), "shadow")
+    shadow_surface.fill((0, 0, 0, shadow_alpha))
+    shadow_surface.blit(rocks_img, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+    surface.blit(shadow_surface, (rocks_x + shadow_offset_x, rocks_y + shadow_offset_y))
+    
+    # Draw rocks
+    surface.blit(rocks_img, (rocks_x, rocks_y))
+    
+    # Draw mushroom on top of the rock
+    if mushroom_tall_loaded and mushroom_tall_img and mushroom_squished_loaded and mushroom_squished_img:
+        # Calculate mushroom position (centered on top of rock)
+        if rocks_loaded and rocks_img:
+            mushroom_width = int(mushroom_tall_img.get_width() * MUSHROOM_SCALE)
+            mushroom_height = int(mushroom_tall_img.get_height() * MUSHROOM_SCALE)
+            mushroom_x = rocks_x + rocks_width // 2 - mushroom_width // 2
+            # Position halfway between last (lower) and current (higher) position, then move higher by frog height, then 15px lower, then 4px lower, then 2px lower
+            mushroom_y = rocks_y + int(rocks_height * 0.3) - int(mushroom_height * 0.7) - character["height"] + 15 + 4 + 2
+            
+            # Check if mushroom should be squished
+            if mushroom_squished and (current_time - mushroom_squish_start_time) < MUSHROOM_SQUISH_DURATION:
+                # Draw squished mushroom
+                mushroom_squished_scaled = pygame.transform.scale(mushroom_squished_img, (mushroom_width, mushroom_height))
+                surface.blit(mushroom_squished_scaled, (mushroom_x, mushroom_y))
+            else:
+                # Draw normal tall mushroom
+                mushroom_tall_scaled = pygame.transform.scale(mushroom_tall_img, (mushroom_width, mushroom_height))
+                surface.blit(mushroom_tall_scaled, (mushroom_x, mushroom_y))
+    
+    # Draw vines on the left and right sides of the rock
+    if vines_loaded and vines_img:
+        # Scale vines to be much smaller (about 30% of rock height) for right side
+        right_vines_height = int(rocks_height * 0.3)
+        right_vines_width = vines_img.get_width() * (right_vines_height / vines_img.get_height())
+        right_vines_scaled = pygame.transform.scale(vines_img, (int(right_vines_width), int(right_vines_height)))
+        
+        # Scale left vine to be bigger (about 40% of rock height)
+        left_vines_height = int(rocks_height * 0.4)
+        left_vines_width = vines_img.get_width() * (left_vines_height / vines_img.get_height())
+        left_vines_scaled = pygame.transform.scale(vines_img, (int(left_vines_width), int(left_vines_height)))
+        
+        # Apply color tint to match theme (dark green/brown swamp color)
+        vine_tint_color = SWAMP_COLOR  # (45, 85, 75) - dark green
+        
+        # Create tinted versions of the vines
+        def apply_vine_tint(vine_surface, tint_color):
+            tinted = surfaces.track(vine_surface.copy(), "tint")
+            tint_overlay = surfaces.track(pygame.Surface(vine_surface.get_size(), pygame.SRCALPHA), "tint")
+            tint_overlay.fill(tint_color)
+            tinted.blit(tint_overlay, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+            return tinted
+        
+        right_vines_tinted = apply_vine_tint(right_vines_scaled, vine_tint_color)
+        left_vines_tinted = apply_vine_tint(left_vines_scaled, vine_tint_color)
+        
+        # Position vines at ground level
+        right_vines_y = GROUND_Y - right_vines_height
+        left_vines_y = GROUND_Y - left_vines_height
+        
+        # Position vines much closer to the rock (overlap slightly)
+        right_overlap_offset = int(right_vines_width * 0.7)  # Overlap 70% of vine width for right side
+        left_overlap_offset = int(left_vines_width * 0.2)  # Less overlap for left side (move it more to the right)
+        
+        # Draw vines on the left side of the rock
+        left_vines_x = rocks_x - left_overlap_offset
+        surface.blit(left_vines_tinted, (left_vines_x, left_vines_y))
+        
+        # Draw vines on the right side of the rock (flip horizontally)
+        right_vines_flipped = pygame.transform.flip(right_vines_tinted, True, False)
+        right_vines_x = rocks_x + rocks_width - right_overlap_offset
+        surface.blit(right_vines_flipped, (right_vines_x, right_vines_y))
+
+    profiler.mark("props")
+
+    # Draw all platforms (removed - platforms are now invisible/untextured)
+    # for platform in platforms:
+    #     pygame.draw.rect(surface, PLATFORM_COLOR, (platform["x"], platform["y"], platform["width"], platform["height"]))
+
+    # Trees removed - no longer drawing trees
+
+def draw_character(surface, keys):
+    """Draw the frog (or its dying animation) and advance its sprite animation"""
+    global current_animation, dying_frame_index, dying_animation_timer
+    # Draw character
+    if game_over and dying_frames_loaded and dying_frames:
+        if current_time - dying_animation_timer >= DYING_ANIMATION_SPEED:
+            dying_animation_timer = current_time
+            dying_frame_index = (dying_frame_index + 1) % len(dying_frames)
+        
+        DYING_SCALE = 1.3
+        dying_width = int(character["width"] * DYING_SCALE)
+        dying_height = int(character["height"] * DYING_SCALE)
+        current_sprite = pygame.transform.scale(dying_frames[dying_frame_index], (dying_width, dying_height))
+        
+        white_sprite = surfaces.track(current_sprite.copy(), "sprite fx")
+        white_overlay = surfaces.track(pygame.Surface(white_sprite.get_size(), pygame.SRCALPHA), "sprite fx")
+        white_overlay.fill((255, 255, 255, 255))
+        white_sprite.blit(white_overlay, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+        
+        offset_x = (character["width"] - dying_width) // 2
+        offset_y = (character["height"] - dying_height) // 2
+        surface.blit(white_sprite, (character["x"] + offset_x, character["y"] + offset_y))
+    elif sprite_sheet_loaded and frog_frames:
+        direction = character["facing_direction"]
+        if not character["on_ground"]:
+            animation_key = f"jump_{direction}"
+        elif input_map.held(keys, "right"):
+            animation_key = "walk_right"
+        elif input_map.held(keys, "left"):
+            animation_key = "walk_left"
         else:
-            # Draw ground rectangles, but skip left water and right swamp areas
-            pygame.draw.rect(screen, GROUND_COLOR, (0, GROUND_Y + GROUND_HEIGHT, LEFT_WATER_START_X, SWAMP_HEIGHT - GROUND_HEIGHT))
-            pygame.draw.rect(screen, GROUND_COLOR, (LEFT_WATER_START_X + LEFT_WATER_WIDTH, GROUND_Y + GROUND_HEIGHT, 
-                                                   SWAMP_START_X - (LEFT_WATER_START_X + LEFT_WATER_WIDTH), SWAMP_HEIGHT - GROUND_HEIGHT))
-            pygame.draw.rect(screen, GROUND_COLOR, (SWAMP_START_X + SWAMP_WIDTH, GROUND_Y + GROUND_HEIGHT, 
-                                                   SCREEN_WIDTH - (SWAMP_START_X + SWAMP_WIDTH), SWAMP_HEIGHT - GROUND_HEIGHT))
-
-        # Draw water tiles and crocodile in swamp area
-        if water_tile_1_loaded and water_tile_2_loaded and water_tile_3_loaded and water_tile_4_loaded:
-            # Get tile dimensions (already scaled)
-            tile_width = water_tile_1.get_width()
-        tile_height = water_tile_1.get_height()
-        
-        # Calculate crocodile position (will be set when crocodile is loaded)
-        crocodile_x = SWAMP_START_X + (SWAMP_WIDTH // 2)
-        crocodile_y = GROUND_Y
-        crocodile_width = 0
-        crocodile_height = 0
-        
-        if crocodile_frame_1_loaded and crocodile_frame_2_loaded and crocodile_frame_1 and crocodile_frame_2:
-            # Use pre-scaled and darkened crocodile frames
-            current_crocodile = crocodile_frame_1 if crocodile_frame == 0 else crocodile_frame_2
-            crocodile_width = current_crocodile.get_width()
-            crocodile_height = current_crocodile.get_height()
-            # Center crocodile horizontally
-            crocodile_x = SWAMP_START_X + (SWAMP_WIDTH - crocodile_width) // 2
-            # Position crocodile a little higher than water tiles
-            crocodile_y = GROUND_Y - 10  # Move up by 10 pixels
-        
-        # Draw plant in water first (so water tiles and crocodile can overlap it)
-        if plant_loaded and plant_img:
-            plant_width = plant_img.get_width()
-            plant_height = plant_img.get_height()
-            # Center plant horizontally in the swamp
-            plant_x = SWAMP_START_X + (SWAMP_WIDTH - plant_width) // 2
-            # Position plant at the bottom of the water (ground level)
-            plant_y = GROUND_Y + SWAMP_HEIGHT - plant_height
-            
-            # Red plant is not drawn - it's only used for platform collision detection
-            
-            # Draw shadow first (offset down and to the right)
-            shadow_offset_x = 8
-            shadow_offset_y = 8
-            shadow_alpha = 120  # Shadow opacity (0-255)
-            
-            # Create shadow surface from plant's alpha channel
-            shadow_surface = pygame.Surface(plant_img.get_size(), pygame.SRCALPHA)
-            # Create a dark shadow by extracting alpha from plant and applying dark color
-            # Fill with black at the shadow alpha level
-            shadow_surface.fill((0, 0, 0, shadow_alpha))
-            # Use the plant's alpha channel to shape the shadow
-            shadow_surface.blit(plant_img, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-            # Draw shadow with offset
-            screen.blit(shadow_surface, (plant_x + shadow_offset_x, plant_y + shadow_offset_y))
-            
-            # Draw plant on top of shadow and red plant
-            screen.blit(plant_img, (plant_x, plant_y))
+            animation_key = f"idle_{direction}"
         
-        # Calculate how many tiles fit in the swamp (add extra to ensure no gaps)
-        num_tiles_x = int(math.ceil(SWAMP_WIDTH / tile_width)) + 2
-        num_tiles_y = int(math.ceil(SWAMP_HEIGHT / tile_height)) + 2
-        
-        # Draw water tiles (on top of plant)
-        for ty in range(num_tiles_y):
-            for tx in range(num_tiles_x):
-                tile_x = SWAMP_START_X + tx * tile_width
-                tile_y = GROUND_Y + ty * tile_height
-                tile_right = tile_x + tile_width
-                tile_bottom = tile_y + tile_height
-                
-                # Skip tiles that extend outside the swamp boundaries
-                if tile_x >= SWAMP_START_X + SWAMP_WIDTH or tile_right <= SWAMP_START_X:
-                    continue
-                if tile_y >= GROUND_Y + SWAMP_HEIGHT or tile_bottom <= GROUND_Y:
-                    continue
-                
-                # Determine which tile to use based on position
-                if ty == 0:  # Top row
-                    # Check if this position overlaps with crocodile
-                    if crocodile_frame_1_loaded and crocodile_frame_2_loaded and crocodile_width > 0:
-                        crocodile_left = crocodile_x
-                        crocodile_right = crocodile_x + crocodile_width
-                        tile_right = tile_x + tile_width
-                        tile_center = tile_x + tile_width // 2
-                        crocodile_center = crocodile_x + crocodile_width // 2
-                        
-                        # If tile center is to the left of crocodile center, use tile 1 (left side)
-                        if tile_center < crocodile_center:
-                            # Animate between tile 1 and tile 2
-                            current_tile = water_tile_1 if water_frame == 0 else water_tile_2
-                        # If tile center is to the right of crocodile center, use tile 2 (right side)
-                        else:
-                            # Animate between tile 2 and tile 1
-                            current_tile = water_tile_2 if water_frame == 0 else water_tile_1
-                    else:
-                        # No crocodile, alternate between tile 1 and 2
-                        current_tile = water_tile_1 if (tx + water_frame) % 2 == 0 else water_tile_2
-                else:  # Bottom rows
-                    # Use tiles 3 and 4, animate between tile 3 and 4
-                    current_tile = water_tile_3 if water_frame == 0 else water_tile_4
-                
-                # Draw tile even if it overlaps with crocodile (crocodile will be drawn on top)
-                screen.blit(current_tile, (tile_x, tile_y))
-        
-        # Draw crocodile on top (at top middle, overlapping plant and water)
-        if crocodile_frame_1_loaded and crocodile_frame_2_loaded and crocodile_frame_1 and crocodile_frame_2 and crocodile_width > 0:
-            screen.blit(current_crocodile, (crocodile_x, crocodile_y))
-    
-        # Draw left water section (smaller than right side)
-        if water_tile_1_loaded and water_tile_2_loaded and water_tile_3_loaded and water_tile_4_loaded:
-            tile_width = water_tile_1.get_width()
-        tile_height = water_tile_1.get_height()
-        
-        # Calculate crocodile position for left water area
-        left_crocodile_x = LEFT_WATER_START_X + (LEFT_WATER_WIDTH // 2)
-        left_crocodile_y = GROUND_Y + SWAMP_HEIGHT - LEFT_WATER_HEIGHT
-        left_crocodile_width = 0
-        left_crocodile_height = 0
-        
-        if crocodile_frame_1_loaded and crocodile_frame_2_loaded and crocodile_frame_1 and crocodile_frame_2:
-            # Use pre-scaled and darkened crocodile frames
-            current_left_crocodile = crocodile_frame_1 if crocodile_frame == 0 else crocodile_frame_2
-            left_crocodile_width = current_left_crocodile.get_width()
-            left_crocodile_height = current_left_crocodile.get_height()
-            # Center crocodile horizontally in left water area
-            left_crocodile_x = LEFT_WATER_START_X + (LEFT_WATER_WIDTH - left_crocodile_width) // 2
-            # Position crocodile at the top of the left water area
-            left_crocodile_y = GROUND_Y + SWAMP_HEIGHT - LEFT_WATER_HEIGHT - 10  # Move up by 10 pixels
-        
-        # Calculate how many tiles fit in the left water area (add extra to ensure no gaps)
-        num_tiles_x = int(math.ceil(LEFT_WATER_WIDTH / tile_width)) + 2
-        num_tiles_y = int(math.ceil(LEFT_WATER_HEIGHT / tile_height)) + 2
-        
-        # Offset to slide water texture to the left
-        water_texture_offset_x = -15
-        
-        # Draw water tiles for left water section
-        for ty in range(num_tiles_y):
-            for tx in range(num_tiles_x):
-                tile_x = LEFT_WATER_START_X + tx * tile_width + water_texture_offset_x
-                tile_y = GROUND_Y + SWAMP_HEIGHT - LEFT_WATER_HEIGHT + ty * tile_height
-                tile_right = tile_x + tile_width
-                tile_bottom = tile_y + tile_height
-                
-                # Skip tiles that extend outside the left water boundaries
-                if tile_x >= LEFT_WATER_START_X + LEFT_WATER_WIDTH or tile_right <= LEFT_WATER_START_X:
-                    continue
-                if tile_y >= GROUND_Y + SWAMP_HEIGHT or tile_bottom <= GROUND_Y + SWAMP_HEIGHT - LEFT_WATER_HEIGHT:
-                    continue
-                
-                # Determine which tile to use based on position
-                if ty == 0:  # Top row
-                    # Check if this position overlaps with crocodile
-                    if crocodile_frame_1_loaded and crocodile_frame_2_loaded and left_crocodile_width > 0:
-                        left_crocodile_left = left_crocodile_x
-                        left_crocodile_right = left_crocodile_x + left_crocodile_width
-                        tile_center = tile_x + tile_width // 2
-                        left_crocodile_center = left_crocodile_x + left_crocodile_width // 2
-                        
-                        # If tile center is to the left of crocodile center, use tile 1 (left side)
-                        if tile_center < left_crocodile_center:
-                            # Animate between tile 1 and tile 2
-                            current_tile = water_tile_1 if water_frame == 0 else water_tile_2
-                        # If tile center is to the right of crocodile center, use tile 2 (right side)
-                        else:
-                            # Animate between tile 2 and tile 1
-                            current_tile = water_tile_2 if water_frame == 0 else water_tile_1
-                    else:
-                        # No crocodile, alternate between tile 1 and 2
-                        current_tile = water_tile_1 if (tx + water_frame) % 2 == 0 else water_tile_2
-                else:  # Bottom rows
-                    # Use tiles 3 and 4, animate between tile 3 and 4
-                    current_tile = water_tile_3 if water_frame == 0 else water_tile_4
-                
-                # Draw tile even if it overlaps with crocodile (crocodile will be drawn on top)
-                screen.blit(current_tile, (tile_x, tile_y))
+        if animation_key != current_animation:
+            animation_frames[animation_key] = 0
+            animation_timers[animation_key] = current_time
+            current_animation = animation_key
         
-        # Draw crocodile on top of left water section
-        if crocodile_frame_1_loaded and crocodile_frame_2_loaded and crocodile_frame_1 and crocodile_frame_2 and left_crocodile_width > 0:
-            screen.blit(current_left_crocodile, (left_crocodile_x, left_crocodile_y))
-        else:
-            # Fallback to solid color if tiles not loaded
-            pygame.draw.rect(screen, SWAMP_COLOR, (SWAMP_START_X, GROUND_Y, SWAMP_WIDTH, SWAMP_HEIGHT))
+        if current_time - animation_timers[animation_key] >= ANIMATION_SPEED:
+            animation_timers[animation_key] = current_time
+            if animation_key in frog_frames and frog_frames[animation_key]:
+                animation_frames[animation_key] = (animation_frames[animation_key] + 1) % len(frog_frames[animation_key])
+        
+        if animation_key in frog_frames and frog_frames[animation_key]:
+            frame_index = animation_frames[animation_key]
+            current_sprite = frog_frames[animation_key][frame_index]
+            if current_sprite.get_size() != (character["width"], character["height"]):
+                current_sprite = pygame.transform.scale(current_sprite, (character["width"], character["height"]))
+            surface.blit(current_sprite, (character["x"], character["y"]))
+    else:
+        pygame.draw.rect(surface, (255, 100, 100), (character["x"], character["y"], character["width"], character["height"]))
 
-        # Draw smaller plant to the left of the rock and right of the left water
-        if small_plant_loaded and small_plant_img:
-            small_plant_width = small_plant_img.get_width()
-        small_plant_height = small_plant_img.get_height()
+def draw_tongue(surface):
+    # Draw tongue
+    if character["tongue_extended"] and tongue_loaded and tongue_frames:
+        frog_center_x = character["x"] + character["width"] // 2
+        frog_center_y = character["y"] + character["height"] // 2
         
-        # Calculate position: to the left of rock, right of left water
-        left_water_end = LEFT_WATER_START_X + LEFT_WATER_WIDTH
-        space_between = SWAMP_START_X - left_water_end
+        progress = character["tongue_length"] / character["tongue_max_length"]
+        frame_index = min(int(progress * len(tongue_frames)), len(tongue_frames) - 1)
+        tongue_sprite = tongue_frames[frame_index]
         
-        # Calculate rock position first to position plant relative to it
-        if rocks_loaded and rocks_img:
-            rocks_width = rocks_img.get_width()
-            rocks_x = left_water_end + int(space_between * 0.5) - rocks_width // 2
-        else:
-            rocks_x = left_water_end + int(space_between * 0.5)
+        original_width = tongue_sprite.get_width()
+        original_height = tongue_sprite.get_height()
         
-        # Position plant between left water and rock (about 30% from left water)
-        small_plant_x = left_water_end + int((rocks_x - left_water_end) * 0.3) - small_plant_width // 2
-        small_plant_y = GROUND_Y - small_plant_height
+        scale_factor = character["tongue_length"] / original_width if original_width > 0 else 1.0
+        scaled_width = int(original_width * scale_factor)
+        scaled_height = int(original_height * scale_factor)
         
-        # Draw red plant behind (invisible, for collision detection)
-        if small_plant_red_loaded and small_plant_red_img:
-            screen.blit(small_plant_red_img, (small_plant_x, small_plant_y))
+        scaled_tongue = pygame.transform.scale(tongue_sprite, (scaled_width, scaled_height))
         
-        # Draw shadow first
-        shadow_offset_x = 8
-        shadow_offset_y = 8
-        shadow_alpha = 120
-        shadow_surface = pygame.Surface(small_plant_img.get_size(), pygame.SRCALPHA)
-        shadow_surface.fill((0, 0, 0, shadow_alpha))
-        shadow_surface.blit(small_plant_img, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-        screen.blit(shadow_surface, (small_plant_x + shadow_offset_x, small_plant_y + shadow_offset_y))
+        angle_degrees = math.degrees(character["tongue_angle"])
+        angle_rad = character["tongue_angle"]
         
-        # Draw small plant
-        screen.blit(small_plant_img, (small_plant_x, small_plant_y))
-    
-        # Draw smaller plant to the left of the rock and right of the left water
-        if small_plant_loaded and small_plant_img:
-            small_plant_width = small_plant_img.get_width()
-        small_plant_height = small_plant_img.get_height()
+        rotated_tongue = pygame.transform.rotate(scaled_tongue, -angle_degrees)
+        rotated_rect = rotated_tongue.get_rect()
         
-        # Calculate position: to the left of rock, right of left water
-        left_water_end = LEFT_WATER_START_X + LEFT_WATER_WIDTH
-        space_between = SWAMP_START_X - left_water_end
+        sprite_center_x = scaled_width // 2
+        sprite_center_y = scaled_height // 2
         
-        # Calculate rock position first to position plant relative to it
-        if rocks_loaded and rocks_img:
-            rocks_width = rocks_img.get_width()
-            rocks_x = left_water_end + int(space_between * 0.5) - rocks_width // 2
-        else:
-            rocks_x = left_water_end + int(space_between * 0.5)
+        start_vec_x = -sprite_center_x
+        start_vec_y = 0
         
-        # Position plant between left water and rock (about 30% from left water)
-        small_plant_x = left_water_end + int((rocks_x - left_water_end) * 0.3) - small_plant_width // 2
-        small_plant_y = GROUND_Y - small_plant_height
+        rotated_start_x = start_vec_x * math.cos(angle_rad) - start_vec_y * math.sin(angle_rad)
+        rotated_start_y = start_vec_x * math.sin(angle_rad) + start_vec_y * math.cos(angle_rad)
         
-        # Draw red plant behind (invisible, for collision detection)
-        if small_plant_red_loaded and small_plant_red_img:
-            screen.blit(small_plant_red_img, (small_plant_x, small_plant_y))
+        size_diff_x = (rotated_rect.width - scaled_width) // 2
+        size_diff_y = (rotated_rect.height - scaled_height) // 2
         
-        # Draw shadow first
-        shadow_offset_x = 8
-        shadow_offset_y = 8
-        shadow_alpha = 120
-        shadow_surface = pygame.Surface(small_plant_img.get_size(), pygame.SRCALPHA)
-        shadow_surface.fill((0, 0, 0, shadow_alpha))
-        shadow_surface.blit(small_plant_img, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-        screen.blit(shadow_surface, (small_plant_x + shadow_offset_x, small_plant_y + shadow_offset_y))
+        draw_x = frog_center_x - (sprite_center_x + rotated_start_x) - size_diff_x
+        draw_y = frog_center_y - (sprite_center_y + rotated_start_y) - size_diff_y
         
-        # Draw small plant
-        screen.blit(small_plant_img, (small_plant_x, small_plant_y))
-    
-        # Draw rocks between the two water areas (natural positioning, not perfectly centered)
-        if rocks_loaded and rocks_img:
-            rocks_width = rocks_img.get_width()
-        rocks_height = rocks_img.get_height()
-        
-        # Calculate the space between water areas
-        left_water_end = LEFT_WATER_START_X + LEFT_WATER_WIDTH
-        space_between = SWAMP_START_X - left_water_end
+        surface.blit(rotated_tongue, (draw_x, draw_y))
+    elif character["tongue_extended"]:
+        frog_center_x = character["x"] + character["width"] // 2
+        frog_center_y = character["y"] + character["height"] // 2
+        tongue_end_x = frog_center_x + math.cos(character["tongue_angle"]) * character["tongue_length"]
+        tongue_end_y = frog_center_y + math.sin(character["tongue_angle"]) * character["tongue_length"]
+        pygame.draw.line(surface, (200, 0, 0), (frog_center_x, frog_center_y), (tongue_end_x, tongue_end_y), 8)
+        pygame.draw.circle(surface, (150, 0, 0), (int(tongue_end_x), int(tongue_end_y)), 6)
+
+def update_flies():
+    """Move every fly one step (random movement pattern, bouncing off the screen edges)"""
+    for fly in flies:
+        if not paused and not game_end:
+            # Ensure old flies still work (if any exist without vx/vy)
+            if "vx" not in fly or "vy" not in fly:
+                ang = rng.ai.uniform(0, math.tau)
+                spd = rng.ai.uniform(2.0, 4.0)
+                fly["vx"] = math.cos(ang) * spd
+                fly["vy"] = math.sin(ang) * spd
+            if "change_timer" not in fly:
+                fly["change_timer"] = rng.ai.randint(30, 120)
+            # Initialize animation state if missing
+            if "animation_timer" not in fly:
+                fly["animation_timer"] = rng.ai.randint(0, FLY_ANIMATION_SPEED - 1)
+            if "frame" not in fly:
+                fly["frame"] = 0
+
+            # Randomize movement pattern over time
+            fly["change_timer"] -= 1
+            if fly["change_timer"] <= 0:
+                ang = rng.ai.uniform(0, math.tau)
+                spd = rng.ai.uniform(2.0, 4.0)
+                fly["vx"] = math.cos(ang) * spd
+                fly["vy"] = math.sin(ang) * spd
+                fly["change_timer"] = rng.ai.randint(30, 120)
+
+            # Update animation for chirping effect
+            fly["animation_timer"] -= 1
+            if fly["animation_timer"] <= 0:
+                fly["frame"] = 1 - fly["frame"]  # Switch between 0 and 1
+                fly["animation_timer"] = FLY_ANIMATION_SPEED
+
+            # Move
+            fly["x"] += fly["vx"]
+            fly["y"] += fly["vy"]
+
+            # Bounce off edges (keeps them on-screen)
+            if fly["x"] < 0:
+                fly["x"] = 0
+                fly["vx"] *= -1
+            elif fly["x"] > SCREEN_WIDTH - FLY_W:
+                fly["x"] = SCREEN_WIDTH - FLY_W
+                fly["vx"] *= -1
+
+            if fly["y"] < 0:
+                fly["y"] = 0
+                fly["vy"] *= -1
+            elif fly["y"] > GROUND_Y - FLY_H:
+                fly["y"] = GROUND_Y - FLY_H
+                fly["vy"] *= -1
+
+def draw_flies(surface):
+    for fly in flies:
+        # Draw fly with animation frame and direction
+        if fly_img:
+            current_frame = fly.get("frame", 0)
+            vx = fly.get("vx", 0)
+            facing_left = vx < 0  # Flip sprite if moving left
+        
+            # Select the correct frame
+            if current_frame == 0:
+                sprite_to_draw = fly_img
+            else:
+                sprite_to_draw = fly_img_frame2 if fly_img_frame2 else fly_img
         
-        # Position rocks naturally - slightly offset from center (moved more to the right)
-        rocks_x = left_water_end + int(space_between * 0.5) - rocks_width // 2
-        # Position at ground level (bottom of rocks sits on ground)
-        rocks_y = GROUND_Y - rocks_height
+            # Flip horizontally if moving left
+            if facing_left:
+                sprite_to_draw = pygame.transform.flip(sprite_to_draw, True, False)
         
-        # Draw shadow first
-        shadow_offset_x = 8
-        shadow_offset_y = 8
-        shadow_alpha = 120
-        shadow_surface = pygame.Surface(rocks_img.get_size(), pygame.SRCALPHA)
-        shadow_surface.fill((0, 0, 0, shadow_alpha))
-        shadow_surface.blit(rocks_img, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-        screen.blit(shadow_surface, (rocks_x + shadow_offset_x, rocks_y + shadow_offset_y))
-        
-        # Draw rocks
-        screen.blit(rocks_img, (rocks_x, rocks_y))
-        
-        # Draw mushroom on top of the rock
-        if mushroom_tall_loaded and mushroom_tall_img and mushroom_squished_loaded and mushroom_squished_img:
-            # Calculate mushroom position (centered on top of rock)
-            if rocks_loaded and rocks_img:
-                mushroom_width = int(mushroom_tall_img.get_width() * MUSHROOM_SCALE)
-                mushroom_height = int(mushroom_tall_img.get_height() * MUSHROOM_SCALE)
-                mushroom_x = rocks_x + rocks_width // 2 - mushroom_width // 2
-                # Position halfway between last (lower) and current (higher) position, then move higher by frog height, then 15px lower, then 4px lower, then 2px lower
-                mushroom_y = rocks_y + int(rocks_height * 0.3) - int(mushroom_height * 0.7) - character["height"] + 15 + 4 + 2
-                
-                # Check if mushroom should be squished
-                current_time = pygame.time.get_ticks()
-                if mushroom_squished and (current_time - mushroom_squish_start_time) < MUSHROOM_SQUISH_DURATION:
-                    # Draw squished mushroom
-                    mushroom_squished_scaled = pygame.transform.scale(mushroom_squished_img, (mushroom_width, mushroom_height))
-                    screen.blit(mushroom_squished_scaled, (mushroom_x, mushroom_y))
-                else:
-                    # Draw normal tall mushroom
-                    mushroom_squished = False  # Reset squished state
-                    mushroom_tall_scaled = pygame.transform.scale(mushroom_tall_img, (mushroom_width, mushroom_height))
-                    screen.blit(mushroom_tall_scaled, (mushroom_x, mushroom_y))
-        
-        # Draw vines on the left and right sides of the rock
-        if vines_loaded and vines_img:
-            # Scale vines to be much smaller (about 30% of rock height) for right side
-            right_vines_height = int(rocks_height * 0.3)
-            right_vines_width = vines_img.get_width() * (right_vines_height / vines_img.get_height())
-            right_vines_scaled = pygame.transform.scale(vines_img, (int(right_vines_width), int(right_vines_height)))
-            
-            # Scale left vine to be bigger (about 40% of rock height)
-            left_vines_height = int(rocks_height * 0.4)
-            left_vines_width = vines_img.get_width() * (left_vines_height / vines_img.get_height())
-            left_vines_scaled = pygame.transform.scale(vines_img, (int(left_vines_width), int(left_vines_height)))
-            
-            # Apply color tint to match theme (dark green/brown swamp color)
-            vine_tint_color = SWAMP_COLOR  # (45, 85, 75) - dark green
-            
-            # Create tinted versions of the vines
-            def apply_vine_tint(vine_surface, tint_color):
-                tinted = vine_surface.copy()
-                tint_overlay = pygame.Surface(vine_surface.get_size(), pygame.SRCALPHA)
-                tint_overlay.fill(tint_color)
-                tinted.blit(tint_overlay, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-                return tinted
-            
-            right_vines_tinted = apply_vine_tint(right_vines_scaled, vine_tint_color)
-            left_vines_tinted = apply_vine_tint(left_vines_scaled, vine_tint_color)
-            
-            # Position vines at ground level
-            right_vines_y = GROUND_Y - right_vines_height
-            left_vines_y = GROUND_Y - left_vines_height
-            
-            # Position vines much closer to the rock (overlap slightly)
-            right_overlap_offset = int(right_vines_width * 0.7)  # Overlap 70% of vine width for right side
-            left_overlap_offset = int(left_vines_width * 0.2)  # Less overlap for left side (move it more to the right)
-            
-            # Draw vines on the left side of the rock
-            left_vines_x = rocks_x - left_overlap_offset
-            screen.blit(left_vines_tinted, (left_vines_x, left_vines_y))
-            
-            # Draw vines on the right side of the rock (flip horizontally)
-            right_vines_flipped = pygame.transform.flip(right_vines_tinted, True, False)
-            right_vines_x = rocks_x + rocks_width - right_overlap_offset
-            screen.blit(right_vines_flipped, (right_vines_x, right_vines_y))
+            surface.blit(sprite_to_draw, (fly["x"], fly["y"]))
+        else:
+            pygame.draw.rect(surface, (255, 255, 0), (fly["x"], fly["y"], FLY_W, FLY_H))
 
-        # Draw all platforms (removed - platforms are now invisible/untextured)
-        # for platform in platforms:
-        #     pygame.draw.rect(screen, PLATFORM_COLOR, (platform["x"], platform["y"], platform["width"], platform["height"]))
+def draw_hud(surface):
+    """Draw the high score, round timer and score"""
+    global score_animation_time
+    # Draw UI
+    if pixel_font_loaded:
+        high_score_text = f"HIGHEST SCORE: {high_score}"
+    high_score_scale = 0.3
+    high_score_y = 20 + (int(default_char_height * 0.7) - int(default_char_height * high_score_scale)) // 2
+    draw_pixel_text(surface, high_score_text, 20, high_score_y, scale=high_score_scale)
+    
+    timer_text = str(int(timer_remaining))
+    timer_scale = 0.7
+    if timer_remaining <= 15:
+        heartbeat = 1.0 + 0.15 * abs(math.sin((current_time % 1000) / 1000.0 * math.pi * 2))
+        timer_scale = 0.7 * heartbeat
+    char_width = int(default_char_width * timer_scale)
+    text_width = len(timer_text) * char_width + (len(timer_text) - 1) * 2
+    timer_x = (SCREEN_WIDTH - text_width) // 2
+    timer_color = (255, 0, 0) if timer_remaining <= 10 else (255, 255, 255)
+    draw_pixel_text(surface, timer_text, timer_x, 20, scale=timer_scale, color=timer_color)
+    
+    score_text = str(score)
+    base_scale = 0.7
+    scale = base_scale
+    if score_animation_time > 0:
+        elapsed = current_time - score_animation_time
+        if elapsed < SCORE_ANIMATION_DURATION:
+            scale = base_scale + (0.3 * (1.0 - elapsed / SCORE_ANIMATION_DURATION))
+        else:
+            score_animation_time = 0
+    char_width = int(default_char_width * scale)
+    text_width = len(score_text) * char_width + (len(score_text) - 1) * 2
+    score_x = SCREEN_WIDTH - text_width - 20
+    draw_pixel_text(surface, score_text, score_x, 20, scale=scale)
+
+def get_game_over_restart_rect():
+    """Clickable area of the RESTART text on the game over screen"""
+    restart_scale = 0.6
+    text_width = len("RESTART") * int(default_char_width * restart_scale)
+    text_height = int(default_char_height * restart_scale)
+    text_x = (SCREEN_WIDTH - text_width) // 2
+    text_y = (SCREEN_HEIGHT // 2) + 10
+    return pygame.Rect(text_x, text_y, text_width, text_height)
+
+# Dim overlays behind the menus and game over, built once per screen size instead of every frame
+dim_overlays = {}
+
+def get_dim_overlay(size):
+    """Return the shared black overlay (alpha 180) for a surface of this size"""
+    overlay = dim_overlays.get(size)
+    if overlay is None:
+        overlay = surfaces.track(pygame.Surface(size), "overlay")
+        overlay.set_alpha(180)
+        overlay.fill((0, 0, 0))
+        dim_overlays[size] = overlay
+    return overlay
+
+def draw_overlays(surface):
+    """Draw the menu for pause, settings and game end, and the dimmed game over screen.
+
+    The menus are drawn on top of the frozen, already dimmed world (see the main loop).
+    """
+    # Draw pause menu
+    if paused and not settings_open:
+        draw_pause_menu(surface, pause_menu_y)
+
+    # Draw settings menu
+    if settings_open:
+        draw_settings_menu(surface, settings_menu_y)
+
+    # Draw game end menu (timer ended)
+    if game_end:
+        draw_game_end_menu(surface, game_end_menu_y)
+
+    if game_over:
+        surface.blit(get_dim_overlay(surface.get_size()), (0, 0))
 
-        # Trees removed - no longer drawing trees
+        if pixel_font_loaded:
+            text = "GAME OVER"
+            scale = 1.2
+            text_width = len(text) * int(default_char_width * scale)
+            text_x = (SCREEN_WIDTH - text_width) // 2
+            draw_pixel_text(surface, text, text_x, SCREEN_HEIGHT // 2 - 140, scale=scale, color=(255, 50, 50))
 
-        # Character death animation - slowly ascend when dead
-        if game_over:
-            # Make character slowly ascend (move upward)
-            character["y"] -= 2  # Move up slowly
+            restart_rect = get_game_over_restart_rect()
+            mouse_x, mouse_y = pygame.mouse.get_pos()
+            hover = restart_rect.collidepoint(mouse_x, mouse_y)
+            color = (255, 255, 255) if hover else (200, 200, 200)
+
+            draw_pixel_text(surface, "RESTART", restart_rect.x, restart_rect.y, scale=0.6, color=color)
+startup.mark("game state + helpers")
+
+# Generate all platforms once at initialization (expensive operation)
+generate_all_platforms()
+startup.mark("platform generation")
+
+# Keys whose held state the game reads every step (recorded in replays)
+HELD_KEYS = tuple(sorted(input_map.keys_for("left") + input_map.keys_for("right")))
+
+replay_recorder = None
+if args.record:
+    replay_recorder = ReplayRecorder(args.record, rng.seed, (SCREEN_WIDTH, SCREEN_HEIGHT), HELD_KEYS, input_map.keybinds)
+
+# Scripted input comes from a replay log or a benchmark scenario
+scripted_input = replay_player
+if args.scenario:
+    scripted_input = ScenarioPlayer(args.scenario, (SCREEN_WIDTH, SCREEN_HEIGHT))
+
+# Per-frame measurements for benchmark.py (--bench-out)
+bench = None
+if args.bench_out:
+    bench = {"sim_ns": [], "render_ns": [], "alloc_bytes": []}
+    if args.bench_alloc:
+        tracemalloc.start()
+
+# Dimmed snapshot of the world while a menu is open (None while playing)
+frozen_frame = None
+
+def is_menu_settled():
+    """True while a menu is open over the frozen world and has finished sliding in"""
+    if frozen_frame is None:
+        return False
+    if settings_open:
+        return (settings_menu_visible and settings_menu_y == settings_menu_target_y
+                and not music_slider_dragging and not sfx_slider_dragging)
+    if paused:
+        return pause_menu_visible and pause_menu_y == pause_menu_target_y
+    if game_end:
+        return game_end_menu_visible and game_end_menu_y == game_end_menu_target_y
+    return False
+
+# Main game loop
+running = True
+startup_over_budget = False
+scenario_failed = False
+step = 0
+surfaces.new_round()
+
+# --warm: everything is loaded, wait for the front page to start the round (see game_launcher.py)
+if args.warm:
+    start = wait_for_start(sys.stdin)
+    if start is None:
+        # The front page went away without starting a round
+        running = False
+    else:
+        args.username = start.get("username")
+        high_score = int(start.get("high_score", 0))
+        # Settings may have changed since this process started
+        settings_store.apply(start.get("settings", {}))
+        music.play("game")
+        Window.from_display_module().show()
+        pygame.event.clear()
+    startup.mark("warm: waiting for start")
+
+while running:
+        # Headless runs uncapped on a fixed game clock instead of waiting for the next frame
+        if not headless:
+            frame_scheduler.wait(is_menu_settled(), frozen_frame is not None)
+
+        profiler.begin_frame()
+        if bench:
+            frame_start_ns = time.perf_counter_ns()
+            if args.bench_alloc:
+                tracemalloc.reset_peak()
+                alloc_base = tracemalloc.get_traced_memory()[0]
+
+        # Gather this step's input: live (optionally recorded) or scripted
+        if scripted_input:
+            frame = scripted_input.next_frame()
+            if frame is None:
+                break
+            current_time, keys, events, mouse_pos = frame
+            # Keep the window responsive, only quitting is honoured during playback
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+        else:
+            current_time = int(step * HEADLESS_STEP_MS) if headless else pygame.time.get_ticks()
+            keys = pygame.key.get_pressed()
+            events = pygame.event.get()
+            mouse_pos = pygame.mouse.get_pos()
+            if replay_recorder:
+                replay_recorder.record_frame(current_time, keys, events, mouse_pos)
+        profiler.mark("input")
+
+        if timer_start_time is None:
+            timer_start_time = current_time
+    
+        # Handle pause menu animation
+        if paused and not settings_open:
+            if pause_menu_target_y is None and wooden_sign_loaded and wooden_sign_img:
+                pause_menu_target_y = 0
+
+        if pause_menu_target_y is not None:
+            if pause_menu_y < pause_menu_target_y:
+                pause_menu_y += pause_menu_slide_speed
+                if pause_menu_y >= pause_menu_target_y:
+                    pause_menu_y = pause_menu_target_y
+                    pause_menu_visible = True
+            else:
+                pause_menu_visible = True
+        else:
+            if pause_menu_y > -500:
+                pause_menu_y -= pause_menu_slide_speed
+            if pause_menu_y <= -500:
+                pause_menu_y = -500
+                pause_menu_visible = False
+                pause_menu_target_y = None
+
+        # Handle settings menu animation
+        if settings_open:
+            if settings_menu_target_y is None and wooden_sign_loaded and wooden_sign_img:
+                settings_menu_target_y = 0
+
+        if settings_menu_target_y is not None:
+            if settings_menu_y < settings_menu_target_y:
+                settings_menu_y += settings_menu_slide_speed
+                if settings_menu_y >= settings_menu_target_y:
+                    settings_menu_y = settings_menu_target_y
+                    settings_menu_visible = True
+            else:
+                settings_menu_visible = True
+        else:
+            if settings_menu_y > -500:
+                settings_menu_y -= settings_menu_slide_speed
+            if settings_menu_y <= -500:
+                settings_menu_y = -500
+                settings_menu_visible = False
+                settings_menu_target_y = None
+
+        # Handle game end menu animation
+        if game_end:
+            if game_end_menu_target_y is None and wooden_sign_loaded and wooden_sign_img:
+                game_end_menu_target_y = 0
+
+        if game_end_menu_target_y is not None:
+            if game_end_menu_y < game_end_menu_target_y:
+                game_end_menu_y += game_end_menu_slide_speed
+                if game_end_menu_y >= game_end_menu_target_y:
+                    game_end_menu_y = game_end_menu_target_y
+                    game_end_menu_visible = True
+            else:
+                game_end_menu_visible = True
+
+        # Update water and crocodile animations
+        if current_time - water_animation_timer >= water_animation_speed:
+            water_animation_timer = current_time
+            water_frame = 1 - water_frame  # Toggle between 0 and 1
     
-        # Character movement (only when not paused, not game ended, and not game over)
+        if current_time - crocodile_animation_timer >= crocodile_animation_speed:
+            crocodile_animation_timer = current_time
+            crocodile_frame = 1 - crocodile_frame  # Toggle between 0 and 1
+        profiler.mark("menu animation")
+
+        # Skip game updates when paused, game ended, or game over
         if not paused and not game_end and not game_over:
-            
-            # Store previous position for collision detection
-            prev_x = character["x"]
-        prev_y = character["y"]
-        prev_on_ground = character.get("on_ground", False)
-        prev_on_platform = character.get("on_platform", False)
-        was_on_surface = prev_on_ground or prev_on_platform
-        
-        # Horizontal movement
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-            character["x"] -= character["speed"]
-            character["facing_direction"] = "left"
-        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-            character["x"] += character["speed"]
-            character["facing_direction"] = "right"
-
-        # Collision with thumbnail_wood (solid entity on both left and right sides)
-        # Use pixel-perfect collision to match the actual trunk design
-        if thumbnail_wood_loaded and thumbnail_wood_img:
-            wood_width = thumbnail_wood_img.get_width()
-        wood_height = thumbnail_wood_img.get_height()
-        
-        char_left = character["x"]
-        char_right = character["x"] + character["width"]
-        char_top = character["y"]
-        char_bottom = character["y"] + character["height"]
-        
-        # Check collision with left trunk using pixel-perfect detection
-        if char_right > 0 and char_left < wood_width:
-            # Sample trunk pixels at character's position to find collision
-            has_collision = False
-            sample_step = 4
-            
-            # Check multiple trunk tiles vertically (trunk repeats)
-            for trunk_y_offset in range(0, SCREEN_HEIGHT + wood_height, wood_height):
-                char_rel_y_start = max(0, char_top - trunk_y_offset)
-                char_rel_y_end = min(wood_height, char_bottom - trunk_y_offset)
-                
-                if char_rel_y_end > char_rel_y_start:
-                    for y in range(int(char_rel_y_start), int(char_rel_y_end), sample_step):
-                        for x in range(max(0, char_left), min(wood_width, char_right), sample_step):
-                            try:
-                                pixel_color = thumbnail_wood_img.get_at((x, y))
-                                r, g, b, a = pixel_color
-                                if a > 128:  # Solid pixel
-                                    has_collision = True
-                                    break
-                            except:
-                                pass
-                        if has_collision:
-                            break
-                if has_collision:
-                    break
-            
-            # If collision detected, push character to the right of trunk
-            if has_collision:
-                # Find rightmost solid column - check at character's vertical position
-                char_mid_y = (char_top + char_bottom) // 2
-                trunk_tile_y = char_mid_y % wood_height
-                rightmost_solid = 0
-                
-                for x in range(wood_width - 1, -1, -sample_step):
-                    try:
-                        pixel_color = thumbnail_wood_img.get_at((x, trunk_tile_y))
-                        r, g, b, a = pixel_color
-                        if a > 128:
-                            rightmost_solid = x + sample_step
-                            break
-                    except:
-                        pass
-                
-                if rightmost_solid > 0:
-                    character["x"] = rightmost_solid
+            # Update timer (subtract total paused time to account for pauses)
+            elapsed_seconds = (current_time - timer_start_time - total_paused_time) // 1000
+            timer_remaining = max(0, TIMER_START_SECONDS - elapsed_seconds)
+        if timer_remaining <= 0 and not game_end:
+            game_end = True
+            game_end_start_time = current_time
+            game_end_menu_y = -500
+            game_end_menu_visible = False
+        elif paused:
+            # When paused, also account for current pause session in timer calculation
+            current_pause_duration = current_time - pause_start_time if pause_start_time > 0 else 0
+            elapsed_seconds = (current_time - timer_start_time - total_paused_time - current_pause_duration) // 1000
+            timer_remaining = max(0, TIMER_START_SECONDS - elapsed_seconds)
+        elif game_over:
+            # When game over, timer stops - don't update it
+            # Timer remains at the value it had when game_over was set
+            pass
+
+        # Event handling
+        for event in events:
+            frame_scheduler.handle_event(event)
+            action = input_map.action(event)
+
+            if event.type == pygame.QUIT:
+                running = False
+
+            elif action == "pause":
+                if settings_open:
+                    # Close settings menu and return to pause menu
+                    settings_open = False
+                    settings_menu_y = -500
+                    settings_menu_visible = False
+                    settings_menu_target_y = None
+                elif not game_over:
+                    paused = not paused
+                    if paused:
+                        pause_start_time = current_time
+                        pause_menu_y = -500
+                        pause_menu_visible = False
+                    else:
+                        # When unpausing, add the paused duration to total_paused_time
+                        if pause_start_time > 0:
+                            total_paused_time += current_time - pause_start_time
+                            pause_start_time = 0
+                        pause_menu_y = -500
+                        pause_menu_visible = False
+                        pause_menu_target_y = None
+
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                profiler.toggle_overlay()
+
+            elif action == "jump":
+                # No jumping behind a menu, the frog would take off while the world is frozen
+                if not (paused or settings_open or game_end):
+                    if not game_over:
+                        play_sfx("jump")
+                    if character["on_ground"]:
+                        character["velocity_y"] = character["jump_speed"]
+                        character["on_ground"] = False
+                    elif not character["on_ground"] and character["has_double_jump"] and current_time >= character["double_jump_cooldown_end"]:
+                        character["velocity_y"] = character["jump_speed"]
+                        character["has_double_jump"] = False
+                        character["double_jump_cooldown_end"] = current_time + 500
+
+            elif action == "tongue":
+                if not paused and not game_end and not game_over:
+                    if not character["tongue_extended"]:
+                        mouse_x, mouse_y = mouse_pos
+                        frog_center_x = character["x"] + character["width"] // 2
+                        frog_center_y = character["y"] + character["height"] // 2
+                        character["tongue_angle"] = math.atan2(mouse_y - frog_center_y, mouse_x - frog_center_x)
+                        character["tongue_extended"] = True
+                        character["tongue_retracting"] = False
+                        character["tongue_length"] = 0
+                        character["tongue_end_time"] = current_time + 300
+
+            elif paused and pause_menu_visible and event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                mouse_x, mouse_y = mouse_pos
+                continue_rect, settings_rect, main_menu_rect, exit_rect, _ = draw_pause_menu(screen, pause_menu_y)
+
+                if continue_rect and continue_rect.collidepoint(mouse_x, mouse_y):
+                    # When unpausing, add the paused duration to total_paused_time
+                    if pause_start_time > 0:
+                        total_paused_time += current_time - pause_start_time
+                        pause_start_time = 0
+                    paused = False
+                    pause_menu_y = -500
+                    pause_menu_visible = False
+                elif settings_rect and settings_rect.collidepoint(mouse_x, mouse_y):
+                    settings_open = True
+                    settings_menu_y = -500
+                    settings_menu_target_y = None
+                    settings_menu_visible = False
+                elif main_menu_rect and main_menu_rect.collidepoint(mouse_x, mouse_y):
+                    # Launch frontpage and exit game
+                    FRONTPAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+                    FRONTPAGE_PATH = os.path.join(FRONTPAGE_DIR, "frontpage.py")
+                    PROJECT_ROOT = os.path.dirname(FRONTPAGE_DIR)
+                    if os.path.exists(FRONTPAGE_PATH):
+                        # The front page reads settings.json, so pending changes are written first
+                        settings_store.flush()
+                        subprocess.Popen([sys.executable, os.path.abspath(FRONTPAGE_PATH)], cwd=PROJECT_ROOT)
+                    running = False
+                elif exit_rect and exit_rect.collidepoint(mouse_x, mouse_y):
+                    running = False
+
+            elif settings_open and settings_menu_visible:
+                mouse_x, mouse_y = mouse_pos
+                result = draw_settings_menu(screen, settings_menu_y)
+                if result:
+                    music_slider_rect, sfx_slider_rect, mute_rect, back_rect, vol_bar_x, vol_bar_width, sfx_vol_bar_x = result
                 else:
-                    # Fallback: use full width
-                    character["x"] = wood_width
-        
-        # Check collision with right trunk
-        right_wood_x = SCREEN_WIDTH - wood_width
-        if char_right > right_wood_x and char_left < SCREEN_WIDTH:
-            # Sample trunk pixels at character's position to find collision
-            has_collision = False
-            sample_step = 4
-            
-            # Check multiple trunk tiles vertically (trunk repeats)
-            for trunk_y_offset in range(0, SCREEN_HEIGHT + wood_height, wood_height):
-                char_rel_y_start = max(0, char_top - trunk_y_offset)
-                char_rel_y_end = min(wood_height, char_bottom - trunk_y_offset)
+                    music_slider_rect = sfx_slider_rect = mute_rect = back_rect = vol_bar_x = vol_bar_width = sfx_vol_bar_x = None
                 
-                if char_rel_y_end > char_rel_y_start:
-                    char_rel_x_start = max(0, char_left - right_wood_x)
-                    char_rel_x_end = min(wood_width, char_right - right_wood_x)
-                    
-                    for y in range(int(char_rel_y_start), int(char_rel_y_end), sample_step):
-                        for x in range(int(char_rel_x_start), int(char_rel_x_end), sample_step):
-                            try:
-                                pixel_color = thumbnail_wood_img.get_at((x, y))
-                                r, g, b, a = pixel_color
-                                if a > 128:  # Solid pixel
-                                    has_collision = True
-                                    break
-                            except:
-                                pass
-                        if has_collision:
-                            break
-                if has_collision:
-                    break
-            
-            # If collision detected, push character to the left of trunk
-            if has_collision:
-                # Find leftmost solid column - check at character's vertical position
-                char_mid_y = (char_top + char_bottom) // 2
-                trunk_tile_y = char_mid_y % wood_height
-                leftmost_solid = wood_width
+                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                    if music_slider_rect and music_slider_rect.collidepoint(mouse_x, mouse_y):
+                        music_slider_dragging = True
+                        # Calculate volume based on click position
+                        relative_x = max(0, min(mouse_x - vol_bar_x, vol_bar_width))
+                        settings_store.set("sound", "music", relative_x / vol_bar_width)
+                    elif sfx_slider_rect and sfx_slider_rect.collidepoint(mouse_x, mouse_y):
+                        sfx_slider_dragging = True
+                        # Calculate volume based on click position
+                        relative_x = max(0, min(mouse_x - sfx_vol_bar_x, vol_bar_width))
+                        settings_store.set("sound", "sfx", relative_x / vol_bar_width)
+                    elif mute_rect and mute_rect.collidepoint(mouse_x, mouse_y):
+                        settings_store.set("sound", "muted", not settings["sound"]["muted"])
+                    elif back_rect and back_rect.collidepoint(mouse_x, mouse_y):
+                        settings_open = False
+                        settings_menu_y = -500
+                        settings_menu_visible = False
+                        settings_menu_target_y = None
+                        music_slider_dragging = False
+                        sfx_slider_dragging = False
                 
-                for x in range(0, wood_width, sample_step):
-                    try:
-                        pixel_color = thumbnail_wood_img.get_at((x, trunk_tile_y))
-                        r, g, b, a = pixel_color
-                        if a > 128:
-                            leftmost_solid = x
-                            break
-                    except:
-                        pass
+                elif event.type == pygame.MOUSEMOTION:
+                    if music_slider_dragging and music_slider_rect:
+                        relative_x = max(0, min(mouse_x - vol_bar_x, vol_bar_width))
+                        settings_store.set("sound", "music", relative_x / vol_bar_width)
+                    elif sfx_slider_dragging and sfx_slider_rect:
+                        relative_x = max(0, min(mouse_x - sfx_vol_bar_x, vol_bar_width))
+                        settings_store.set("sound", "sfx", relative_x / vol_bar_width)
                 
-                if leftmost_solid < wood_width:
-                    character["x"] = right_wood_x + leftmost_solid - character["width"]
-                else:
-                    # Fallback: use full width
-                    character["x"] = right_wood_x - character["width"]
-        
-        # Horizontal collision with left branches
-        if thumbnail_wood_loaded and thumbnail_wood_img and (branch_1_loaded and branch_2_loaded and branch_3_loaded and branch_4_loaded):
-            trunk_width = thumbnail_wood_img.get_width()
-            branch_imgs = [branch_1_img, branch_2_img, branch_3_img, branch_4_img]
-            for pos, branch_img in zip(LEFT_BRANCH_POSITIONS, branch_imgs):
-                scaled = scale_branch(branch_img, BRANCH_SCALE)
-                if scaled:
-                    branch_x = trunk_width - scaled.get_width() // 2 + pos["offset"]
-                    branch_y = int(SCREEN_HEIGHT * pos["y"])
-                    check_branch_horizontal_collision(character, scaled, branch_x, branch_y, prev_x, prev_y, sprite_padding_offset, is_left_side=True)
-    
-        # Horizontal collision with right branches
-        if thumbnail_wood_loaded and thumbnail_wood_img and (branch_right_1_loaded and branch_right_2_loaded and branch_right_3_loaded and branch_right_4_loaded):
-            trunk_width = thumbnail_wood_img.get_width()
-            right_trunk_x = SCREEN_WIDTH - trunk_width
-            branch_imgs = [branch_right_1_img, branch_right_2_img, branch_right_3_img, branch_right_4_img]
-            for pos, branch_img in zip(RIGHT_BRANCH_POSITIONS, branch_imgs):
-                scaled = scale_branch(branch_img, BRANCH_SCALE)
-                if scaled:
-                    branch_x = right_trunk_x + trunk_width - scaled.get_width() // 2 + pos["offset"]
-                    branch_y = int(SCREEN_HEIGHT * pos["y"])
-                    check_branch_horizontal_collision(character, scaled, branch_x, branch_y, prev_x, prev_y, sprite_padding_offset, is_left_side=False)
-    
-        character["x"] = max(0, min(character["x"], SCREEN_WIDTH - character["width"]))
-    
-        # Y movement constraint: Character can only move in Y direction if:
-        # 1. Character jumps using jump key (velocity_y was set to jump_speed)
-        # 2. Character doesn't have any surface to stand on (falls down)
-    
-        # Check if character just jumped (velocity_y is jump_speed, which is negative)
-        is_jumping = character["velocity_y"] <= character["jump_speed"] + 1 and character["velocity_y"] < 0
-    
-        # Initialize collision state
-        on_ground = False
-        on_platform = False
-    
-        # First, check platform collision BEFORE deciding if we should lock Y position
-        # This prevents the character from floating when walking off platforms
-        # Use cached platforms (generated once at initialization)
-        if cached_all_platforms is None:
-            all_platforms = generate_all_platforms()
-        else:
-            all_platforms = cached_all_platforms
+                elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+                    music_slider_dragging = False
+                    sfx_slider_dragging = False
+
+            elif game_end and game_end_menu_visible and event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                mouse_x, mouse_y = mouse_pos
+                restart_rect, main_menu_rect, _ = draw_game_end_menu(screen, game_end_menu_y)
+
+                if restart_rect and restart_rect.collidepoint(mouse_x, mouse_y):
+                    reset_game()
+                    game_end = False
+                    game_end_menu_y = -500
+                    game_end_menu_visible = False
+                    game_end_menu_target_y = None
+                elif main_menu_rect and main_menu_rect.collidepoint(mouse_x, mouse_y):
+                    # Launch frontpage and exit game
+                    FRONTPAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+                    FRONTPAGE_PATH = os.path.join(FRONTPAGE_DIR, "frontpage.py")
+                    PROJECT_ROOT = os.path.dirname(FRONTPAGE_DIR)
+                    if os.path.exists(FRONTPAGE_PATH):
+                        # The front page reads settings.json, so pending changes are written first
+                        settings_store.flush()
+                        subprocess.Popen([sys.executable, os.path.abspath(FRONTPAGE_PATH)], cwd=PROJECT_ROOT)
+                    running = False
+
+            elif game_over and event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                mouse_x, mouse_y = mouse_pos
+                if get_game_over_restart_rect().collidepoint(mouse_x, mouse_y):
+                    reset_game()
+                    game_over = False
+
+            elif not paused and not game_end and not game_over and event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                play_sfx("hit")
+                if not character["tongue_extended"]:
+                    mouse_x, mouse_y = mouse_pos
+                    frog_center_x = character["x"] + character["width"] // 2
+                    frog_center_y = character["y"] + character["height"] // 2
+                    character["tongue_angle"] = math.atan2(mouse_y - frog_center_y, mouse_x - frog_center_x)
+                    character["tongue_extended"] = True
+                    character["tongue_retracting"] = False
+                    character["tongue_length"] = 0
+                    character["tongue_end_time"] = current_time + 300
+        profiler.mark("events")
+
     
-        # Apply physics FIRST, then check collisions
-        # Physics
+        # Character death animation - slowly ascend when dead
         if game_over:
-            # When dead, character flies upward (reduce gravity effect or apply upward force)
-            character["velocity_y"] += character["gravity"] * 0.3  # Reduced gravity when dead
-            # Add upward force to keep flying up
-            if character["velocity_y"] > -5.0:
-                character["velocity_y"] -= 0.2  # Continue upward movement
-        else:
-            character["velocity_y"] += character["gravity"]
-    
-        character["y"] += character["velocity_y"]
-    
-        # Calculate character position for collision checks
-        character_center_x = character["x"] + character["width"] // 2
-        character_bottom = character["y"] + character["height"]
-        character_feet_y = character["y"] + character["height"]
-        visual_feet_y = character_feet_y - sprite_padding_offset
-        target_y = GROUND_Y - character["height"] + sprite_padding_offset
-    
-        # Check if character is over left water area or swamp area
-        is_over_left_water = (LEFT_WATER_START_X <= character_center_x <= LEFT_WATER_START_X + LEFT_WATER_WIDTH)
-        is_over_swamp = (SWAMP_START_X <= character_center_x <= SWAMP_START_X + SWAMP_WIDTH)
-
-        # Skip collision checks when dead (let character fly freely)
-        if not game_over:
-            # Check mushroom collision first (before platform collision)
-            if mushroom_tall_loaded and mushroom_tall_img and rocks_loaded and rocks_img:
-                # Calculate mushroom position (same as drawing code)
-                left_water_end = LEFT_WATER_START_X + LEFT_WATER_WIDTH
-                space_between = SWAMP_START_X - left_water_end
-                rocks_width = rocks_img.get_width()
-                rocks_height = rocks_img.get_height()
-                rocks_x = left_water_end + int(space_between * 0.5) - rocks_width // 2
-                rocks_y = GROUND_Y - rocks_height
+            # Make character slowly ascend (move upward)
+            character["y"] -= 2  # Move up slowly
+    
+        # The world stands still while the pause, settings or game end menu is open: the menus
+        # are drawn over a frozen frame of it, so nothing under them may move (see frozen_frame)
+        if not (paused or settings_open or game_end):
+            # Store previous position for collision detection (while dead it stays the last one alive)
+            if not game_over:
+                prev_x = character["x"]
+            prev_y = character["y"]
+            prev_on_ground = character.get("on_ground", False)
+            prev_on_platform = character.get("on_platform", False)
+            was_on_surface = prev_on_ground or prev_on_platform
+        
+            # Horizontal movement
+            if input_map.held(keys, "left"):
+                character["x"] -= character["speed"]
+                character["facing_direction"] = "left"
+            if input_map.held(keys, "right"):
+                character["x"] += character["speed"]
+                character["facing_direction"] = "right"
+
+            # Collision with thumbnail_wood (solid entity on both left and right sides)
+            # Uses the precomputed per-row extents of the trunk tile (the trunk repeats vertically)
+            if thumbnail_wood_loaded and thumbnail_wood_img:
+                check_trunk_collision(character, 0, is_left_side=True)
+                check_trunk_collision(character, SCREEN_WIDTH - thumbnail_wood_img.get_width(), is_left_side=False)
+        
+            # Horizontal collision with left and right branches
+            for branch in branch_registry:
+                check_branch_horizontal_collision(character, branch, prev_x, prev_y, sprite_padding_offset)
+    
+            character["x"] = max(0, min(character["x"], SCREEN_WIDTH - character["width"]))
+            profiler.mark("collision")
+    
+            # Y movement constraint: Character can only move in Y direction if:
+            # 1. Character jumps using jump key (velocity_y was set to jump_speed)
+            # 2. Character doesn't have any surface to stand on (falls down)
+    
+            # Check if character just jumped (velocity_y is jump_speed, which is negative)
+            is_jumping = character["velocity_y"] <= character["jump_speed"] + 1 and character["velocity_y"] < 0
+    
+            # Initialize collision state
+            on_ground = False
+            on_platform = False
+    
+            # First, check platform collision BEFORE deciding if we should lock Y position
+            # This prevents the character from floating when walking off platforms
+            # Use cached platforms (generated once at initialization)
+            if cached_all_platforms is None:
+                all_platforms = generate_all_platforms()
+            else:
+                all_platforms = cached_all_platforms
+    
+            # Apply physics FIRST, then check collisions
+            # Physics
+            if game_over:
+                # When dead, character flies upward (reduce gravity effect or apply upward force)
+                character["velocity_y"] += character["gravity"] * 0.3  # Reduced gravity when dead
+                # Add upward force to keep flying up
+                if character["velocity_y"] > -5.0:
+                    character["velocity_y"] -= 0.2  # Continue upward movement
+            else:
+                character["velocity_y"] += character["gravity"]
+    
+            character["y"] += character["velocity_y"]
+    
+            # Calculate character position for collision checks
+            character_center_x = character["x"] + character["width"] // 2
+            character_bottom = character["y"] + character["height"]
+            character_feet_y = character["y"] + character["height"]
+            visual_feet_y = character_feet_y - sprite_padding_offset
+            target_y = GROUND_Y - character["height"] + sprite_padding_offset
+    
+            # Check if character is over left water area or swamp area
+            is_over_left_water = (LEFT_WATER_START_X <= character_center_x <= LEFT_WATER_START_X + LEFT_WATER_WIDTH)
+            is_over_swamp = (SWAMP_START_X <= character_center_x <= SWAMP_START_X + SWAMP_WIDTH)
+
+            # Skip collision checks when dead (let character fly freely)
+            if not game_over:
+                # Check mushroom collision first (before platform collision)
+                if mushroom_tall_loaded and mushroom_tall_img and rocks_loaded and rocks_img:
+                    # Calculate mushroom position (same as drawing code)
+                    left_water_end = LEFT_WATER_START_X + LEFT_WATER_WIDTH
+                    space_between = SWAMP_START_X - left_water_end
+                    rocks_width = rocks_img.get_width()
+                    rocks_height = rocks_img.get_height()
+                    rocks_x = left_water_end + int(space_between * 0.5) - rocks_width // 2
+                    rocks_y = GROUND_Y - rocks_height
                 
-                mushroom_width = int(mushroom_tall_img.get_width() * MUSHROOM_SCALE)
-                mushroom_height = int(mushroom_tall_img.get_height() * MUSHROOM_SCALE)
-                mushroom_x = rocks_x + rocks_width // 2 - mushroom_width // 2
-                # Match the drawing position exactly
-                mushroom_y = rocks_y + int(rocks_height * 0.3) - int(mushroom_height * 0.7) - character["height"] + 15 + 4 + 2
+                    mushroom_width = int(mushroom_tall_img.get_width() * MUSHROOM_SCALE)
+                    mushroom_height = int(mushroom_tall_img.get_height() * MUSHROOM_SCALE)
+                    mushroom_x = rocks_x + rocks_width // 2 - mushroom_width // 2
+                    # Match the drawing position exactly
+                    mushroom_y = rocks_y + int(rocks_height * 0.3) - int(mushroom_height * 0.7) - character["height"] + 15 + 4 + 2
                 
-                # Check collision with mushroom
-                char_left = character["x"]
-                char_right = character["x"] + character["width"]
-                char_bottom = character["y"] + character["height"]
-                mushroom_left = mushroom_x
-                mushroom_right = mushroom_x + mushroom_width
-                mushroom_top = mushroom_y
-                mushroom_bottom = mushroom_y + mushroom_height
+                    # Check collision with mushroom
+                    char_left = character["x"]
+                    char_right = character["x"] + character["width"]
+                    char_bottom = character["y"] + character["height"]
+                    mushroom_left = mushroom_x
+                    mushroom_right = mushroom_x + mushroom_width
+                    mushroom_top = mushroom_y
+                    mushroom_bottom = mushroom_y + mushroom_height
                 
-                # Check if character is horizontally within mushroom bounds
-                is_horizontally_on_mushroom = (char_right > mushroom_left and char_left < mushroom_right)
+                    # Check if character is horizontally within mushroom bounds
+                    is_horizontally_on_mushroom = (char_right > mushroom_left and char_left < mushroom_right)
                 
-                if is_horizontally_on_mushroom:
-                    # Check if character is landing on top of mushroom
-                    if char_bottom >= mushroom_top - 5 and char_bottom <= mushroom_bottom + 10:
-                        # Only apply if character is falling onto mushroom (not jumping up through it)
-                        if character["velocity_y"] >= 0:
-                            # Set character position on top of mushroom
-                            character["y"] = mushroom_top - character["height"]
-                            # Apply high bounce
-                            character["velocity_y"] = MUSHROOM_BOUNCE_VELOCITY
-                            # Trigger squish animation
-                            mushroom_squished = True
-                            mushroom_squish_start_time = current_time
-                            # Play bounce sound if available
-                            sound.play("jump", settings["sound"]["sfx"] if not settings["sound"]["muted"] else 0.0)
-                            on_platform = True
-            
-            # Check platform collision FIRST (only if not already on mushroom)
-            if not on_platform:
-                for platform in all_platforms:
-                    platform_rect = pygame.Rect(platform["x"], platform["y"], platform["width"], platform["height"])
-                    platform_target_y = platform["y"] - character["height"] + sprite_padding_offset
+                    if is_horizontally_on_mushroom:
+                        # Check if character is landing on top of mushroom
+                        if char_bottom >= mushroom_top - 5 and char_bottom <= mushroom_bottom + 10:
+                            # Only apply if character is falling onto mushroom (not jumping up through it)
+                            if character["velocity_y"] >= 0:
+                                # Set character position on top of mushroom
+                                character["y"] = mushroom_top - character["height"]
+                                # Apply high bounce
+                                character["velocity_y"] = MUSHROOM_BOUNCE_VELOCITY
+                                # Trigger squish animation
+                                mushroom_squished = True
+                                mushroom_squish_start_time = current_time
+                                # Play bounce sound if available
+                                play_sfx("jump")
+                                on_platform = True
+            
+                # Check platform collision FIRST (only if not already on mushroom)
+                if not on_platform:
+                    for platform in all_platforms:
+                        platform_rect = pygame.Rect(platform["x"], platform["y"], platform["width"], platform["height"])
+                        platform_target_y = platform["y"] - character["height"] + sprite_padding_offset
                     
-                    # Check if character is horizontally within platform bounds
-                    char_left = character["x"]
-                    char_right = character["x"] + character["width"]
-                    platform_left = platform["x"]
-                    platform_right = platform["x"] + platform["width"]
+                        # Check if character is horizontally within platform bounds
+                        char_left = character["x"]
+                        char_right = character["x"] + character["width"]
+                        platform_left = platform["x"]
+                        platform_right = platform["x"] + platform["width"]
                     
-                    # Character is on platform if there's any horizontal overlap
-                    is_horizontally_on_platform = (char_right > platform_left and char_left < platform_right)
+                        # Character is on platform if there's any horizontal overlap
+                        is_horizontally_on_platform = (char_right > platform_left and char_left < platform_right)
                     
-                    if is_horizontally_on_platform:
-                        # Check if character is on or near the platform
-                        if character_feet_y >= platform["y"] - 10 and character_feet_y <= platform["y"] + platform["height"] + 10:
-                            # Only apply if character is above or at platform level (not below it)
-                            if character["y"] <= platform_target_y + 10:
-                                # If falling onto platform or already on platform
-                                if character["velocity_y"] >= 0 or abs(character["velocity_y"]) < 0.5:
-                                    character["y"] = platform_target_y
-                                    character["velocity_y"] = 0
-                                    on_ground = True
-                                    on_platform = True
-                                    break
-        
-        # Check ground collision (only if not on platform and not over water/swamp)
-        if not on_platform and (visual_feet_y >= GROUND_Y or character_feet_y >= GROUND_Y + sprite_padding_offset) and not is_over_left_water and not is_over_swamp:
-            character["y"] = target_y
-            character["velocity_y"] = 0
-            on_ground = True
-    
-        character["on_ground"] = on_ground
-        character["on_platform"] = on_platform
-        if on_ground or on_platform:
-            character["has_double_jump"] = True
-    
-        # Swamp death check (only if character is falling into swamp, not standing on ground)
-        if (SWAMP_START_X <= character_center_x <= SWAMP_START_X + SWAMP_WIDTH and 
-        character_bottom >= GROUND_Y and not on_platform and not on_ground and not game_over):
-            sound.play("gameover", settings["sound"]["sfx"] if not settings["sound"]["muted"] else 0.0)
-            game_over = True
-            game_over_start_time = pygame.time.get_ticks()
-            # Set upward velocity to make character fly up when dying
-            character["velocity_y"] = -8.0  # Negative value makes it go up
-            # Reset dying animation when character dies
-            if dying_frames_loaded:
-                dying_frame_index = 0
-                dying_animation_timer = current_time
-    
-        # Left water death check (only if character is falling into water, not standing on ground)
-        left_water_top = GROUND_Y + SWAMP_HEIGHT - LEFT_WATER_HEIGHT
-        if (LEFT_WATER_START_X <= character_center_x <= LEFT_WATER_START_X + LEFT_WATER_WIDTH and
-        character_bottom >= left_water_top and not on_platform and not on_ground and not game_over):
-            sound.play("gameover", settings["sound"]["sfx"] if not settings["sound"]["muted"] else 0.0)
-            game_over = True
-            game_over_start_time = pygame.time.get_ticks()
-            # Set upward velocity to make character fly up when dying
-            character["velocity_y"] = -8.0  # Negative value makes it go up
-            # Reset dying animation when character dies
-            if dying_frames_loaded:
-                dying_frame_index = 0
-                dying_animation_timer = current_time
-
-        # Update tongue (with retract animation)
-        if character["tongue_extended"]:
-            if character["tongue_retracting"]:
-                # Retract the tongue
-                character["tongue_length"] -= character["tongue_retract_speed"]
-                if character["tongue_length"] <= 0:
-                    character["tongue_length"] = 0
-                    character["tongue_extended"] = False
-                    character["tongue_retracting"] = False
-            else:
-                # Extend the tongue
-                if character["tongue_length"] < character["tongue_max_length"]:
-                    character["tongue_length"] += character["tongue_speed"]
+                        if is_horizontally_on_platform:
+                            # Check if character is on or near the platform
+                            if character_feet_y >= platform["y"] - 10 and character_feet_y <= platform["y"] + platform["height"] + 10:
+                                # Only apply if character is above or at platform level (not below it)
+                                if character["y"] <= platform_target_y + 10:
+                                    # If falling onto platform or already on platform
+                                    if character["velocity_y"] >= 0 or abs(character["velocity_y"]) < 0.5:
+                                        character["y"] = platform_target_y
+                                        character["velocity_y"] = 0
+                                        on_ground = True
+                                        on_platform = True
+                                        break
+        
+            # Check ground collision (only if not on platform and not over water/swamp)
+            if not on_platform and (visual_feet_y >= GROUND_Y or character_feet_y >= GROUND_Y + sprite_padding_offset) and not is_over_left_water and not is_over_swamp:
+                character["y"] = target_y
+                character["velocity_y"] = 0
+                on_ground = True
+    
+            character["on_ground"] = on_ground
+            character["on_platform"] = on_platform
+            if on_ground or on_platform:
+                character["has_double_jump"] = True
+    
+            # Swamp death check (only if character is falling into swamp, not standing on ground)
+            if (SWAMP_START_X <= character_center_x <= SWAMP_START_X + SWAMP_WIDTH and 
+            character_bottom >= GROUND_Y and not on_platform and not on_ground and not game_over):
+                play_sfx("gameover")
+                game_over = True
+                game_over_start_time = current_time
+                # Set upward velocity to make character fly up when dying
+                character["velocity_y"] = -8.0  # Negative value makes it go up
+                # Reset dying animation when character dies
+                if dying_frames_loaded:
+                    dying_frame_index = 0
+                    dying_animation_timer = current_time
+    
+            # Left water death check (only if character is falling into water, not standing on ground)
+            left_water_top = GROUND_Y + SWAMP_HEIGHT - LEFT_WATER_HEIGHT
+            if (LEFT_WATER_START_X <= character_center_x <= LEFT_WATER_START_X + LEFT_WATER_WIDTH and
+            character_bottom >= left_water_top and not on_platform and not on_ground and not game_over):
+                play_sfx("gameover")
+                game_over = True
+                game_over_start_time = current_time
+                # Set upward velocity to make character fly up when dying
+                character["velocity_y"] = -8.0  # Negative value makes it go up
+                # Reset dying animation when character dies
+                if dying_frames_loaded:
+                    dying_frame_index = 0
+                    dying_animation_timer = current_time
+            profiler.mark("platform landing")
+
+            # Update tongue (with retract animation)
+            if character["tongue_extended"]:
+                if character["tongue_retracting"]:
+                    # Retract the tongue
+                    character["tongue_length"] -= character["tongue_retract_speed"]
+                    if character["tongue_length"] <= 0:
+                        character["tongue_length"] = 0
+                        character["tongue_extended"] = False
+                        character["tongue_retracting"] = False
                 else:
-                    character["tongue_length"] = character["tongue_max_length"]
+                    # Extend the tongue
+                    if character["tongue_length"] < character["tongue_max_length"]:
+                        character["tongue_length"] += character["tongue_speed"]
+                    else:
+                        character["tongue_length"] = character["tongue_max_length"]
             
-            # when time is up, start retracting (not instant disappear)
-            if current_time >= character["tongue_end_time"]:
-                character["tongue_retracting"] = True
+                # when time is up, start retracting (not instant disappear)
+                if current_time >= character["tongue_end_time"]:
+                    character["tongue_retracting"] = True
         
-        frog_center_x = character["x"] + character["width"] // 2
-        frog_center_y = character["y"] + character["height"] // 2
-
-        # Fly collision: ONLY one fly per tongue, and triggers retraction animation
-        if not character["tongue_retracting"]:
-            hit_idx = None
-            hit_dot = None
-
-            for i, fly in enumerate(flies):
-                fly_center_x = fly["x"] + (FLY_W // 2)
-                fly_center_y = fly["y"] + (FLY_H // 2)
-                to_fly_x = fly_center_x - frog_center_x
-                to_fly_y = fly_center_y - frog_center_y
-                
-                dot_product = to_fly_x * math.cos(character["tongue_angle"]) + to_fly_y * math.sin(character["tongue_angle"])
-                if 0 <= dot_product <= character["tongue_length"]:
-                    perp_distance = abs(-to_fly_x * math.sin(character["tongue_angle"]) + to_fly_y * math.cos(character["tongue_angle"]))
-                    if perp_distance < 30:
-                        if hit_dot is None or dot_product < hit_dot:
-                            hit_idx = i
-                            hit_dot = dot_product
-
-            if hit_idx is not None:
-                sound.play("eaten", settings["sound"]["sfx"] if not settings["sound"]["muted"] else 0.0)
-
-                flies.pop(hit_idx)
-                score += 1
-                # Add 1 second to the timer when catching a fly
-                timer_remaining += 1.0
-                if score > high_score:
-                    high_score = score
-                score_animation_time = current_time
-
-                # Respawn ONLY once all flies have been eaten
-                if len(flies) == 0:
-                    for _ in range(NUM_FLIES):
-                        flies.append(make_fly())
-
-                # Start retract animation (does NOT disappear instantly)
-                character["tongue_retracting"] = True
-    
-        # Draw character
-        if game_over and dying_frames_loaded and dying_frames:
-            if current_time - dying_animation_timer >= DYING_ANIMATION_SPEED:
-                dying_animation_timer = current_time
-                dying_frame_index = (dying_frame_index + 1) % len(dying_frames)
-            
-            DYING_SCALE = 1.3
-            dying_width = int(character["width"] * DYING_SCALE)
-            dying_height = int(character["height"] * DYING_SCALE)
-            current_sprite = pygame.transform.scale(dying_frames[dying_frame_index], (dying_width, dying_height))
-            
-            white_sprite = current_sprite.copy()
-            white_overlay = pygame.Surface(white_sprite.get_size(), pygame.SRCALPHA)
-            white_overlay.fill((255, 255, 255, 255))
-            white_sprite.blit(white_overlay, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-            
-            offset_x = (character["width"] - dying_width) // 2
-            offset_y = (character["height"] - dying_height) // 2
-            screen.blit(white_sprite, (character["x"] + offset_x, character["y"] + offset_y))
-        elif sprite_sheet_loaded and frog_frames:
-            direction = character["facing_direction"]
-            if not character["on_ground"]:
-                animation_key = f"jump_{direction}"
-            elif keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-                animation_key = "walk_right"
-            elif keys[pygame.K_LEFT] or keys[pygame.K_a]:
-                animation_key = "walk_left"
-            else:
-                animation_key = f"idle_{direction}"
-            
-            if animation_key != current_animation:
-                animation_frames[animation_key] = 0
-                animation_timers[animation_key] = current_time
-                current_animation = animation_key
-            
-            if current_time - animation_timers[animation_key] >= ANIMATION_SPEED:
-                animation_timers[animation_key] = current_time
-                if animation_key in frog_frames and frog_frames[animation_key]:
-                    animation_frames[animation_key] = (animation_frames[animation_key] + 1) % len(frog_frames[animation_key])
-            
-            if animation_key in frog_frames and frog_frames[animation_key]:
-                frame_index = animation_frames[animation_key]
-                current_sprite = frog_frames[animation_key][frame_index]
-                if current_sprite.get_size() != (character["width"], character["height"]):
-                    current_sprite = pygame.transform.scale(current_sprite, (character["width"], character["height"]))
-                screen.blit(current_sprite, (character["x"], character["y"]))
-        else:
-            pygame.draw.rect(screen, (255, 100, 100), (character["x"], character["y"], character["width"], character["height"]))
-    
-        # Draw tongue
-        if character["tongue_extended"] and tongue_loaded and tongue_frames:
             frog_center_x = character["x"] + character["width"] // 2
             frog_center_y = character["y"] + character["height"] // 2
-            
-            progress = character["tongue_length"] / character["tongue_max_length"]
-            frame_index = min(int(progress * len(tongue_frames)), len(tongue_frames) - 1)
-            tongue_sprite = tongue_frames[frame_index]
-            
-            original_width = tongue_sprite.get_width()
-            original_height = tongue_sprite.get_height()
-            
-            scale_factor = character["tongue_length"] / original_width if original_width > 0 else 1.0
-            scaled_width = int(original_width * scale_factor)
-            scaled_height = int(original_height * scale_factor)
-            
-            scaled_tongue = pygame.transform.scale(tongue_sprite, (scaled_width, scaled_height))
-            
-            angle_degrees = math.degrees(character["tongue_angle"])
-            angle_rad = character["tongue_angle"]
-            
-            rotated_tongue = pygame.transform.rotate(scaled_tongue, -angle_degrees)
-            rotated_rect = rotated_tongue.get_rect()
-            
-            sprite_center_x = scaled_width // 2
-            sprite_center_y = scaled_height // 2
-            
-            start_vec_x = -sprite_center_x
-            start_vec_y = 0
-            
-            rotated_start_x = start_vec_x * math.cos(angle_rad) - start_vec_y * math.sin(angle_rad)
-            rotated_start_y = start_vec_x * math.sin(angle_rad) + start_vec_y * math.cos(angle_rad)
-            
-            size_diff_x = (rotated_rect.width - scaled_width) // 2
-            size_diff_y = (rotated_rect.height - scaled_height) // 2
-            
-            draw_x = frog_center_x - (sprite_center_x + rotated_start_x) - size_diff_x
-            draw_y = frog_center_y - (sprite_center_y + rotated_start_y) - size_diff_y
-            
-            screen.blit(rotated_tongue, (draw_x, draw_y))
-        elif character["tongue_extended"]:
-            frog_center_x = character["x"] + character["width"] // 2
-            frog_center_y = character["y"] + character["height"] // 2
-            tongue_end_x = frog_center_x + math.cos(character["tongue_angle"]) * character["tongue_length"]
-            tongue_end_y = frog_center_y + math.sin(character["tongue_angle"]) * character["tongue_length"]
-            pygame.draw.line(screen, (200, 0, 0), (frog_center_x, frog_center_y), (tongue_end_x, tongue_end_y), 8)
-            pygame.draw.circle(screen, (150, 0, 0), (int(tongue_end_x), int(tongue_end_y)), 6)
-    
-        # Update and draw flies (random movement pattern)
-        for fly in flies:
-            if not paused and not game_end:
-                # Ensure old flies still work (if any exist without vx/vy)
-                if "vx" not in fly or "vy" not in fly:
-                    ang = random.uniform(0, math.tau)
-                    spd = random.uniform(2.0, 4.0)
-                    fly["vx"] = math.cos(ang) * spd
-                    fly["vy"] = math.sin(ang) * spd
-                if "change_timer" not in fly:
-                    fly["change_timer"] = random.randint(30, 120)
-                # Initialize animation state if missing
-                if "animation_timer" not in fly:
-                    fly["animation_timer"] = random.randint(0, FLY_ANIMATION_SPEED - 1)
-                if "frame" not in fly:
-                    fly["frame"] = 0
-
-                # Randomize movement pattern over time
-                fly["change_timer"] -= 1
-                if fly["change_timer"] <= 0:
-                    ang = random.uniform(0, math.tau)
-                    spd = random.uniform(2.0, 4.0)
-                    fly["vx"] = math.cos(ang) * spd
-                    fly["vy"] = math.sin(ang) * spd
-                    fly["change_timer"] = random.randint(30, 120)
-
-                # Update animation for chirping effect
-                fly["animation_timer"] -= 1
-                if fly["animation_timer"] <= 0:
-                    fly["frame"] = 1 - fly["frame"]  # Switch between 0 and 1
-                    fly["animation_timer"] = FLY_ANIMATION_SPEED
-
-                # Move
-                fly["x"] += fly["vx"]
-                fly["y"] += fly["vy"]
-
-                # Bounce off edges (keeps them on-screen)
-                if fly["x"] < 0:
-                    fly["x"] = 0
-                    fly["vx"] *= -1
-                elif fly["x"] > SCREEN_WIDTH - FLY_W:
-                    fly["x"] = SCREEN_WIDTH - FLY_W
-                    fly["vx"] *= -1
-
-                if fly["y"] < 0:
-                    fly["y"] = 0
-                    fly["vy"] *= -1
-                elif fly["y"] > GROUND_Y - FLY_H:
-                    fly["y"] = GROUND_Y - FLY_H
-                    fly["vy"] *= -1
-
-            # Draw fly with animation frame and direction
-            if fly_img:
-                current_frame = fly.get("frame", 0)
-                vx = fly.get("vx", 0)
-                facing_left = vx < 0  # Flip sprite if moving left
-                
-                # Select the correct frame
-                if current_frame == 0:
-                    sprite_to_draw = fly_img
-                else:
-                    sprite_to_draw = fly_img_frame2 if fly_img_frame2 else fly_img
-                
-                # Flip horizontally if moving left
-                if facing_left:
-                    sprite_to_draw = pygame.transform.flip(sprite_to_draw, True, False)
-                
-                screen.blit(sprite_to_draw, (fly["x"], fly["y"]))
-            else:
-                pygame.draw.rect(screen, (255, 255, 0), (fly["x"], fly["y"], FLY_W, FLY_H))
-    
-        # Draw UI
-        if pixel_font_loaded:
-            high_score_text = f"HIGHEST SCORE: {high_score}"
-        high_score_scale = 0.3
-        high_score_y = 20 + (int(default_char_height * 0.7) - int(default_char_height * high_score_scale)) // 2
-        draw_pixel_text(screen, high_score_text, 20, high_score_y, scale=high_score_scale)
-        
-        timer_text = str(int(timer_remaining))
-        timer_scale = 0.7
-        if timer_remaining <= 15:
-            heartbeat = 1.0 + 0.15 * abs(math.sin((current_time % 1000) / 1000.0 * math.pi * 2))
-            timer_scale = 0.7 * heartbeat
-        char_width = int(default_char_width * timer_scale)
-        text_width = len(timer_text) * char_width + (len(timer_text) - 1) * 2
-        timer_x = (SCREEN_WIDTH - text_width) // 2
-        timer_color = (255, 0, 0) if timer_remaining <= 10 else (255, 255, 255)
-        draw_pixel_text(screen, timer_text, timer_x, 20, scale=timer_scale, color=timer_color)
-        
-        score_text = str(score)
-        base_scale = 0.7
-        scale = base_scale
-        if score_animation_time > 0:
-            elapsed = current_time - score_animation_time
-            if elapsed < SCORE_ANIMATION_DURATION:
-                scale = base_scale + (0.3 * (1.0 - elapsed / SCORE_ANIMATION_DURATION))
-            else:
-                score_animation_time = 0
-        char_width = int(default_char_width * scale)
-        text_width = len(score_text) * char_width + (len(score_text) - 1) * 2
-        score_x = SCREEN_WIDTH - text_width - 20
-        draw_pixel_text(screen, score_text, score_x, 20, scale=scale)
-    
-        # Draw pause menu
-        if paused and not settings_open:
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            overlay.set_alpha(180)
-            overlay.fill((0, 0, 0))
-            screen.blit(overlay, (0, 0))
-            draw_pause_menu(screen, pause_menu_y)
 
-        # Draw settings menu
-        if settings_open:
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            overlay.set_alpha(180)
-            overlay.fill((0, 0, 0))
-            screen.blit(overlay, (0, 0))
-            draw_settings_menu(screen, settings_menu_y)
+            # Fly collision: ONLY one fly per tongue, and triggers retraction animation
+            if not character["tongue_retracting"]:
+                hit_idx = None
+                hit_dot = None
 
-        # Draw game end menu (timer ended)
-        if game_end:
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            overlay.set_alpha(180)
-            overlay.fill((0, 0, 0))
-            screen.blit(overlay, (0, 0))
-            draw_game_end_menu(screen, game_end_menu_y)
+                for i, fly in enumerate(flies):
+                    fly_center_x = fly["x"] + (FLY_W // 2)
+                    fly_center_y = fly["y"] + (FLY_H // 2)
+                    to_fly_x = fly_center_x - frog_center_x
+                    to_fly_y = fly_center_y - frog_center_y
+                
+                    dot_product = to_fly_x * math.cos(character["tongue_angle"]) + to_fly_y * math.sin(character["tongue_angle"])
+                    if 0 <= dot_product <= character["tongue_length"]:
+                        perp_distance = abs(-to_fly_x * math.sin(character["tongue_angle"]) + to_fly_y * math.cos(character["tongue_angle"]))
+                        if perp_distance < 30:
+                            if hit_dot is None or dot_product < hit_dot:
+                                hit_idx = i
+                                hit_dot = dot_product
+
+                if hit_idx is not None:
+                    play_sfx("eaten")
+
+                    flies.pop(hit_idx)
+                    score += 1
+                    # Add 1 second to the timer when catching a fly
+                    timer_remaining += 1.0
+                    if score > high_score:
+                        high_score = score
+                    score_animation_time = current_time
+
+                    # Respawn ONLY once all flies have been eaten
+                    if len(flies) == 0:
+                        for _ in range(NUM_FLIES):
+                            flies.append(make_fly())
+
+                    # Start retract animation (does NOT disappear instantly)
+                    character["tongue_retracting"] = True
+            profiler.mark("tongue")
     
-        if game_over:
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            overlay.set_alpha(180)
-            overlay.fill((0, 0, 0))
-            screen.blit(overlay, (0, 0))
-
-            if pixel_font_loaded:
-                text = "GAME OVER"
-                scale = 1.2
-                text_width = len(text) * int(default_char_width * scale)
-                text_x = (SCREEN_WIDTH - text_width) // 2
-                draw_pixel_text(screen, text, text_x, SCREEN_HEIGHT // 2 - 140, scale=scale, color=(255, 50, 50))
-
-                restart_text = "RESTART"
-                restart_scale = 0.6
-                text_width = len(restart_text) * int(default_char_width * restart_scale)
-                text_height = int(default_char_height * restart_scale)
-                text_x = (SCREEN_WIDTH - text_width) // 2
-                text_y = (SCREEN_HEIGHT // 2) + 10
-
-                mouse_x, mouse_y = pygame.mouse.get_pos()
-                hover = (text_x <= mouse_x <= text_x + text_width and text_y <= mouse_y <= text_y + text_height)
-                color = (255, 255, 255) if hover else (200, 200, 200)
-
-                draw_pixel_text(screen, restart_text, text_x, text_y, scale=restart_scale, color=color)
-                restart_rect = pygame.Rect(text_x, text_y, text_width, text_height)
-
-        pygame.display.flip()
+        update_flies()
+
+        # Mushroom springs back once the squish animation is over
+        if mushroom_squished and (current_time - mushroom_squish_start_time) >= MUSHROOM_SQUISH_DURATION:
+            mushroom_squished = False
+        profiler.mark("flies")
+
+        if args.scenario:
+            failure = scripted_input.check(character)
+            if failure:
+                print(f"Scenario {args.scenario} failed: {failure}", file=sys.stderr)
+                scenario_failed = True
+                running = False
+
+        # A round ends when the timer runs out or the frog dies
+        if (game_end or game_over) and not round_reported:
+            round_reported = True
+            if args.username:
+                write_result(args.username, score)
+
+        audio.flush()
+        profiler.count("sounds dropped", audio.dropped)
+        profiler.mark("audio")
+
+        if bench:
+            render_start_ns = time.perf_counter_ns()
+
+        # Rendering (skipped with --no-render so simulation cost can be measured on its own)
+        if render_enabled:
+            shake_x, shake_y = 0, 0
+            if game_over:
+                elapsed = current_time - game_over_start_time
+                if elapsed < shake_duration:
+                    shake_x = rng.cosmetic.randint(-shake_magnitude, shake_magnitude)
+                shake_y = rng.cosmetic.randint(-shake_magnitude, shake_magnitude)
+
+            # Nothing in the world changes while the pause, settings or game end menu is open:
+            # the world is drawn and dimmed once when the menu opens, after that only the menu
+            # is drawn on top of that frozen frame
+            menu_open = paused or settings_open or game_end
+            if menu_open and frozen_frame is not None:
+                screen.blit(frozen_frame, (0, 0))
+            else:
+                draw_world(screen, shake_x, shake_y)
+                draw_character(screen, keys)
+                draw_tongue(screen)
+                draw_flies(screen)
+                profiler.mark("sprites")
+                draw_hud(screen)
+                profiler.mark("hud")
+                if menu_open:
+                    screen.blit(get_dim_overlay(screen.get_size()), (0, 0))
+                    frozen_frame = surfaces.track(screen.copy(), "frozen frame")
+                else:
+                    frozen_frame = None
+            draw_overlays(screen)
+            profiler.mark("menus")
+            profiler.draw_overlay(screen)
+            pygame.display.flip()
+            profiler.mark("flip")
+
+        if step == 0:
+            startup.mark("first frame")
+            if args.startup_report:
+                startup_over_budget = startup.finish(args.startup_report, args.startup_budget)
+
+        if bench:
+            frame_end_ns = time.perf_counter_ns()
+            bench["sim_ns"].append(render_start_ns - frame_start_ns)
+            bench["render_ns"].append(frame_end_ns - render_start_ns)
+            if args.bench_alloc:
+                bench["alloc_bytes"].append(tracemalloc.get_traced_memory()[1] - alloc_base)
+
+        surfaces.end_frame()
+        step += 1
+        if args.frames and step >= args.frames:
+            running = False
+
+if replay_recorder:
+    replay_recorder.close()
+settings_store.close()
+profiler.write_trace()
+surfaces.finish(args.track_surfaces)
+
+if bench:
+    bench.update({
+        "scenario": args.scenario,
+        "seed": rng.seed,
+        "screen_size": [SCREEN_WIDTH, SCREEN_HEIGHT],
+        "flies": NUM_FLIES,
+        "render": render_enabled,
+    })
+    with open(args.bench_out, "w") as f:
+        json.dump(bench, f)
 
 pygame.quit()
-sys.exit()
\ No newline at end of file
+sys.exit(1 if startup_over_budget or scenario_failed else 0)
\ No newline at end of file
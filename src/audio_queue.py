@@ -0,0 +1,40 @@
+# When more different sounds are requested in one frame than the mixer gets, the highest go first
+SOUND_PRIORITIES = {
+    "gameover": 3,
+    "eaten": 2,
+    "jump": 1,
+    "hit": 1,
+}
+# Different sounds sent to the mixer per frame at most
+MAX_SOUNDS_PER_FRAME = 3
+
+
+class AudioQueue:
+    """Sound requests of one frame, sent to the mixer together at the end of the frame.
+
+    play(name, volume) only records the request. A sound requested several
+    times in one frame plays once, at the loudest volume asked for, and at most
+    MAX_SOUNDS_PER_FRAME different sounds play per frame, highest priority
+    first. The requests left out are counted in dropped.
+    """
+    def __init__(self, sound_manager):
+        self.sound = sound_manager
+        self.pending = {}  # sound name -> volume
+        self.dropped = 0  # requests left out by the per-frame cap since the start
+
+    def play(self, name, volume=1.0):
+        if volume > self.pending.get(name, -1.0):
+            self.pending[name] = volume
+
+    def clear(self):
+        self.pending.clear()
+
+    def flush(self):
+        """Play the requests of this frame"""
+        if not self.pending:
+            return
+        requests = sorted(self.pending.items(), key=lambda item: SOUND_PRIORITIES.get(item[0], 0), reverse=True)
+        for name, volume in requests[:MAX_SOUNDS_PER_FRAME]:
+            self.sound.play(name, volume)
+        self.dropped += max(0, len(requests) - MAX_SOUNDS_PER_FRAME)
+        self.pending.clear()
@@ -0,0 +1,146 @@
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import pygame
+from scenarios import SCENARIOS
+
+# Runs every benchmark scenario (see scenarios.py) headlessly in its own game process
+# and reports frame times split into simulation and render, plus allocations per frame.
+#
+#   python src/benchmark.py --out bench.json
+#   python src/benchmark.py --baseline bench.json     (flags regressions, exit code 1)
+
+GAME_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app_new.py")
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0
+    index = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def summarize(values, scale):
+    """mean/p50/p99/max of a list of samples, divided by scale"""
+    values = sorted(values)
+    if not values:
+        return {"mean": 0, "p50": 0, "p99": 0, "max": 0}
+    return {
+        "mean": sum(values) / len(values) / scale,
+        "p50": percentile(values, 50) / scale,
+        "p99": percentile(values, 99) / scale,
+        "max": values[-1] / scale,
+    }
+
+
+def run_game(name, frames, seed, extra_args):
+    """Run one scenario in a fresh game process and return its --bench-out data"""
+    fd, out_path = tempfile.mkstemp(suffix=".json", prefix=f"bench_{name}_")
+    os.close(fd)
+    try:
+        cmd = [sys.executable, GAME_PATH, "--scenario", name, "--frames", str(frames),
+               "--seed", str(seed), "--bench-out", out_path] + extra_args
+        subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL)
+        with open(out_path) as f:
+            return json.load(f)
+    finally:
+        os.remove(out_path)
+
+
+def run_scenario(name, frames, warmup, seed, trace_alloc):
+    """Timing run (and optionally a separate allocation run) for one scenario"""
+    timing = run_game(name, frames + warmup, seed, [])
+    sim = timing["sim_ns"][warmup:]
+    render = timing["render_ns"][warmup:]
+    total = [s + r for s, r in zip(sim, render)]
+    result = {
+        "description": SCENARIOS[name][2],
+        "flies": timing["flies"],
+        "screen_size": timing["screen_size"],
+        "frames": len(total),
+        # Frame times in milliseconds
+        "sim_ms": summarize(sim, 1e6),
+        "render_ms": summarize(render, 1e6),
+        "frame_ms": summarize(total, 1e6),
+    }
+    if trace_alloc:
+        # tracemalloc slows everything down, so allocations come from their own run.
+        # Only Python allocations are seen, surface pixel memory allocated by SDL is not.
+        allocs = run_game(name, frames + warmup, seed, ["--bench-alloc"])
+        result["alloc_bytes"] = summarize(allocs["alloc_bytes"][warmup:], 1)
+    return result
+
+
+def compare(results, baseline, threshold):
+    """List the scenarios whose mean or p99 frame time got more than threshold slower"""
+    regressions = []
+    for name, result in results["scenarios"].items():
+        old = baseline.get("scenarios", {}).get(name)
+        if not old:
+            continue
+        for stat in ("mean", "p99"):
+            before = old["frame_ms"][stat]
+            after = result["frame_ms"][stat]
+            if before > 0 and (after - before) / before > threshold:
+                regressions.append(f"{name}: frame {stat} {before:.2f} ms -> {after:.2f} ms (+{(after - before) / before:.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fly Feast benchmark runner")
+    parser.add_argument("scenarios", nargs="*", metavar="SCENARIO", help=f"scenarios to run (default all: {', '.join(SCENARIOS)})")
+    parser.add_argument("--frames", type=int, default=600, help="measured frames per scenario")
+    parser.add_argument("--warmup", type=int, default=60, help="frames run before measuring starts")
+    parser.add_argument("--seed", type=int, default=1, help="gameplay seed, the same for every scenario")
+    parser.add_argument("--no-alloc", action="store_true", help="skip the allocation runs")
+    parser.add_argument("--out", metavar="FILE", help="write the results to a JSON file")
+    parser.add_argument("--baseline", metavar="FILE", help="results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="slowdown that counts as a regression (default 0.10 = 10%%)")
+    args = parser.parse_args()
+
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            parser.error(f"unknown scenario {name!r}")
+
+    results = {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "frames": args.frames,
+        "warmup": args.warmup,
+        "seed": args.seed,
+        "scenarios": {},
+    }
+
+    print(f"{'scenario':<15}{'sim mean':>10}{'p99':>8}{'render mean':>13}{'p99':>8}{'frame p50':>11}{'p99':>8}{'max':>8}{'alloc p50':>11}")
+    for name in args.scenarios or SCENARIOS:
+        result = run_scenario(name, args.frames, args.warmup, args.seed, not args.no_alloc)
+        results["scenarios"][name] = result
+        alloc = f"{result['alloc_bytes']['p50'] / 1024:.1f} KiB" if "alloc_bytes" in result else "-"
+        print(f"{name:<15}{result['sim_ms']['mean']:>10.2f}{result['sim_ms']['p99']:>8.2f}"
+              f"{result['render_ms']['mean']:>13.2f}{result['render_ms']['p99']:>8.2f}"
+              f"{result['frame_ms']['p50']:>11.2f}{result['frame_ms']['p99']:>8.2f}{result['frame_ms']['max']:>8.2f}{alloc:>11}")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print("Regressions:")
+            for line in regressions:
+                print("  " + line)
+            sys.exit(1)
+        print("No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import pygame
+
+ACTIVE_FPS = 60
+# Frame rate while nothing on screen changes (menu at rest, or a menu open in an unfocused or minimized window)
+IDLE_FPS = 5
+# How often an idle wait checks the event queue
+IDLE_POLL_MS = 10
+
+
+class FrameScheduler:
+    """Decide how long the main loop waits before the next frame.
+
+    While the game is active this is the usual clock.tick(60). When idle the
+    loop sleeps for up to one idle frame instead, waking as soon as an event
+    is queued so it is handled in the very next frame. A round in play is
+    never throttled, not even in an unfocused window: the physics step once
+    per frame while the round timer runs on the wall clock.
+    """
+    def __init__(self, clock):
+        self.clock = clock
+        self.focused = True
+        self.minimized = False
+
+    def handle_event(self, event):
+        if event.type == pygame.WINDOWFOCUSLOST:
+            self.focused = False
+        elif event.type == pygame.WINDOWFOCUSGAINED:
+            self.focused = True
+        elif event.type in (pygame.WINDOWMINIMIZED, pygame.WINDOWHIDDEN):
+            self.minimized = True
+        elif event.type in (pygame.WINDOWRESTORED, pygame.WINDOWMAXIMIZED, pygame.WINDOWSHOWN):
+            self.minimized = False
+
+    def is_idle(self, screen_settled, world_frozen):
+        return screen_settled or (world_frozen and (not self.focused or self.minimized))
+
+    def wait(self, screen_settled, world_frozen):
+        """Wait for the next frame; screen_settled is True when nothing would change on screen,
+        world_frozen while a menu is open over the stopped world"""
+        if not self.is_idle(screen_settled, world_frozen):
+            self.clock.tick(ACTIVE_FPS)
+            return
+        # Only peek at the queue: the events stay in order for the frame to handle
+        deadline = pygame.time.get_ticks() + 1000 // IDLE_FPS
+        while not pygame.event.peek() and pygame.time.get_ticks() < deadline:
+            pygame.time.wait(IDLE_POLL_MS)
+        # Keep the clock in step so the first active frame is not treated as a long one
+        self.clock.tick()
@@ -1,19 +1,20 @@
 import os
 import sys
-import json
 import random
 import pygame 
-import subprocess
 import math
+from settings_store import get_settings_store
+from input_map import InputMap, keyname_to_keyconst
+from sounds import MusicService
+from leaderboard import open_leaderboard
+from round_results import ingest_results
+from game_launcher import GameLauncher
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 GAME_PATH = os.path.join(BASE_DIR, "app_new.py")
 
 pygame.init()
 pygame.mixer.init()
-pygame.mixer.music.load("assets/sound/main_menu.mp3") 
-pygame.mixer.music.set_volume(1.0)
-pygame.mixer.music.play(-1)  # loop forever
 
 #-------------- CONFIG / CONSTANTS -----------
 
@@ -33,23 +34,10 @@ FONT_LB = pygame.font.Font(None, 22)   # Leaderboard rows
 FONT_LB_HEADER = pygame.font.Font(None, 24)
 
 
-PLAYERS_PATH = "players.json"
-SETTINGS_PATH = "settings.json"
-
-DEFAULT_SETTINGS = {
-    "keybinds": {  
-        "left": "K_q",
-        "right": "K_d",
-        "jump": "K_SPACE",
-        "tongue": "K_LCTRL",
-        "pause": "K_ESCAPE"
-    },
-    "sound": {
-        "music": 0.5,
-        "sfx": 0.7,
-        "muted": False
-    }
-}
+PLAYERS_PATH = os.path.join(BASE_DIR, "..", "players.json")
+PLAYERS_DB_PATH = os.path.join(BASE_DIR, "..", "players.db")
+# How often the results of rounds played by the game are collected (see round_results.py)
+RESULTS_POLL_SECONDS = 1.0
 
 #-------------- ASSETS (IMAGES) -----------
 ASSETS_DIR = os.path.join(BASE_DIR, "..", "assets")
@@ -109,9 +97,6 @@ LOGO_IMG = safe_load_image(
 def clamp(v, a, b):
     return max(a, min(b, v))
 
-def keyname_to_keyconst(name: str) -> int:
-    return getattr(pygame, name, pygame.K_UNKNOWN)
-
 def keyconst_to_keyname(k: int) -> str:
     for attr in dir(pygame):
         if attr.startswith("K_") and getattr(pygame, attr) == k:
@@ -121,29 +106,36 @@ def keyconst_to_keyname(k: int) -> str:
 def human_key(k: int) -> str:
     return pygame.key.name(k).upper()
 
+# Rendered text by (text, font, color), cleared when it gets this big (typing makes new strings)
+TEXT_CACHE_MAX = 512
+text_cache = {}
+
+def render_text(text, font, color):
+    key = (text, font, tuple(color))
+    img = text_cache.get(key)
+    if img is None:
+        if len(text_cache) >= TEXT_CACHE_MAX:
+            text_cache.clear()
+        img = text_cache[key] = font.render(text, True, color)
+    return img
+
 def draw_text(surf, text, font, x, y, color=(235,235,235)):
-    img = font.render(text, True, color)
+    img = render_text(text, font, color)
     surf.blit(img, (x, y))
     return img.get_rect(topleft=(x, y))
 
+def build_layer(draw):
+    """Screen-sized surface with everything of a scene that does not move, drawn by draw(layer)"""
+    layer = pygame.Surface((W, H)).convert()
+    draw(layer)
+    return layer
+
 def draw_bg_or_color(surf, bg_img, fallback_color):
     if bg_img is not None:
         surf.blit(bg_img, (0, 0))
     else:
         surf.fill(fallback_color)
 
-# 🔴 ADDED START: leaderboard helper
-def get_leaderboard_rows(players: dict, limit=8):
-    rows = []
-    for name, stats in players.items():
-        plays = int(stats.get("plays", 0))
-        best = int(stats.get("best_score", 0))
-        last = int(stats.get("last_score", 0))
-        rows.append((name, plays, best, last))
-    rows.sort(key=lambda r: (r[2], r[1]), reverse=True)  # best desc, then plays desc
-    return rows[:limit]
-# 🔴 ADDED END
-
 #-------------- UI WIDGETS -----------
 class Button:
     def __init__(self, rect, label):
@@ -156,7 +148,7 @@ class Button:
         bg = (60, 60, 70) if hover else (40, 40, 48)
         pygame.draw.rect(surf, bg, self.rect, border_radius=16)
         pygame.draw.rect(surf, (130,130,150), self.rect, 2, border_radius=16)
-        txt = FONT_UI.render(self.label, True, (240,240,240))
+        txt = render_text(self.label, FONT_UI, (240,240,240))
         surf.blit(txt, txt.get_rect(center=self.rect.center))
 
     def clicked(self, event):
@@ -166,10 +158,16 @@ class ImageButton:
     def __init__(self, image, center, float_amp=6, float_speed=1.2):
         self.base_image = image
         self.image = image
+        self.hover_scale = 1.08
+        # Scaled once, not every frame the mouse is over the button
+        w, h = image.get_size()
+        self.hover_image = pygame.transform.smoothscale(
+            image,
+            (int(w * self.hover_scale), int(h * self.hover_scale))
+        )
         self.base_center = pygame.Vector2(center)
         self.rect = image.get_rect(center=center)
 
-        self.hover_scale = 1.08
         self.float_amp = float_amp
         self.float_speed = float_speed
         self.time = random.uniform(0, 10)  # desync buttons slightly
@@ -187,12 +185,7 @@ class ImageButton:
         hover = self.rect.collidepoint(mx, my)
 
         if hover:
-            w, h = self.base_image.get_size()
-            scaled = pygame.transform.smoothscale(
-                self.base_image,
-                (int(w * self.hover_scale), int(h * self.hover_scale))
-            )
-            self.image = scaled
+            self.image = self.hover_image
             self.rect = self.image.get_rect(center=self.rect.center)
         else:
             self.image = self.base_image
@@ -233,84 +226,71 @@ class Slider:
 #-------------- APP / DATA MODEL -----------
 class App:
     def __init__(self):
-        self.settings = self.load_json(SETTINGS_PATH, DEFAULT_SETTINGS)
-        self.ensure_settings_defaults()
-        self.players = self.load_json(PLAYERS_PATH, {}) 
+        # Shared with the game (settings_store.py), defaults and validation included
+        self.settings_store = get_settings_store()
+        self.settings = self.settings_store.data
+        self.settings_store.subscribe(self.on_setting_changed)
+        self.input_map = InputMap(self.settings["keybinds"])
+        # Players and the leaderboard, in JSON files or SQLite depending on the settings (leaderboard.py)
+        self.leaderboard = open_leaderboard(self.settings["storage"]["players"], PLAYERS_PATH, PLAYERS_DB_PATH)
+        ingest_results(self.leaderboard)
+        self.results_timer = 0.0
+        # A game process loads in the background while the player is in the menus
+        self.launcher = GameLauncher(GAME_PATH)
+        self.launcher.prespawn()
         self.username = None
+        # Every scene names its music track, switching scenes crossfades between them
+        self.music = MusicService()
         self.apply_audio_settings()
         self.scene = UsernameScene(self)
 
-    def load_json(self, path, fallback):
-        if os.path.exists(path):
-            try:
-                with open(path, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except:
-                return fallback
-        return fallback
-
-    def save_json(self, path, data):
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
-    
-    def ensure_settings_defaults(self):
-    # Ensure sound section
-        self.settings.setdefault("sound", {})
-        self.settings["sound"].setdefault("music", 0.5)
-        self.settings["sound"].setdefault("sfx", 0.7)
-        self.settings["sound"].setdefault("muted", False)
-        # Ensure keybinds section
-        self.settings.setdefault("keybinds", DEFAULT_SETTINGS["keybinds"].copy())
+    def on_setting_changed(self, section, key, value):
+        if section == "sound":
+            self.apply_audio_settings()
+        elif section == "keybinds":
+            self.input_map.rebind(self.settings["keybinds"])
 
     def apply_audio_settings(self):
         s = self.settings["sound"]
-        if s.get("muted"):
-            pygame.mixer.music.set_volume(0.0)
-        else:
-            pygame.mixer.music.set_volume(float(s.get("music",0.5)))
-
-    def get_keybinds(self):
-        kb = self.settings["keybinds"]
-        return {action: keyname_to_keyconst(name) for action, name in kb.items()}
+        self.music.set_volume(s["music"], s["muted"])
 
     def ensure_player(self, name: str):
-        if name not in self.players:
-            self.players[name] = {"plays":0,"best_score":0,"last_score":0}
-            self.save_json(PLAYERS_PATH, self.players)
+        self.leaderboard.ensure_player(name)
 
     def record_play(self, score:int):
         if not self.username: return
-        self.ensure_player(self.username)
-        p = self.players[self.username]
-        p["plays"] +=1
-        p["last_score"] = int(score)
-        p["best_score"] = max(int(p.get("best_score",0)), int(score))
-        self.save_json(PLAYERS_PATH, self.players)
-
-    def save_settings(self):
-        self.save_json(SETTINGS_PATH, self.settings)
-        self.apply_audio_settings()
+        self.leaderboard.record_play(self.username, score)
 
     def run(self):
         running = True
         while running:
             dt = clock.tick(60)/1000.0
+            self.results_timer += dt
+            if self.results_timer >= RESULTS_POLL_SECONDS:
+                self.results_timer = 0.0
+                ingest_results(self.leaderboard)
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
                 else:
                     self.scene.handle_event(event)
+            self.music.play(self.scene.music)
             self.scene.update(dt)
             self.scene.draw(screen)
             pygame.display.flip()
+        self.leaderboard.close()
+        self.launcher.discard()
         pygame.quit()
         sys.exit()
 
 #-------------- SCENES -----------
 class UsernameScene:
+    music = "menu"
+
     def __init__(self, app):
         self.app = app
         self.name_entry = TextInput((W//2-220, 300, 440,46),"Enter username")
+        self.layer = None
 
     def handle_event(self,event):
         enter = self.name_entry.handle_event(event)
@@ -322,7 +302,8 @@ class UsernameScene:
                 self.app.scene = HomeScene(self.app)
 
     def update(self,dt): pass
-    def draw(self,surf):
+
+    def draw_static(self,surf):
         draw_bg_or_color(surf, FRONTPAGE_BG, (16,16,20))
         if LOGO_IMG:
             logo_rect = LOGO_IMG.get_rect(center=(W // 2, 120))
@@ -330,9 +311,15 @@ class UsernameScene:
         else:
             draw_text(surf,"Fly Feast",FONT_BIG,W//2-150,100)
 
+    def draw(self,surf):
+        if self.layer is None:
+            self.layer = build_layer(self.draw_static)
+        surf.blit(self.layer, (0, 0))
         self.name_entry.draw(surf)
 
 class HomeScene:
+    music = "menu"
+
     def __init__(self, app):
         self.app = app
         self.btn_play = ImageButton(
@@ -345,10 +332,16 @@ class HomeScene:
         )
         self.username_time = 0.0  # initialize the rainbow/floating time
         self.username_color = (255, 255, 255) 
+        self.layer = None
+        self.layer_version = None  # leaderboard version the layer was drawn with
     def handle_event(self,event):
         if self.btn_play.clicked(event):
-            pygame.mixer.music.fadeout(500)
-            subprocess.Popen([sys.executable, GAME_PATH])
+            self.app.music.stop(500)
+            # A cold-started game reads settings.json, so it must be up to date
+            self.app.settings_store.flush()
+            self.app.launcher.start(self.app.username,
+                                    self.app.leaderboard.best_score(self.app.username),
+                                    self.app.settings)
             pygame.quit()
             sys.exit()
                     
@@ -373,6 +366,17 @@ class HomeScene:
 
 
     def draw(self, surf):
+        # Background, name badge and leaderboard only change with the players
+        if self.layer is None or self.layer_version != self.app.leaderboard.version:
+            self.layer = build_layer(self.draw_static)
+            self.layer_version = self.app.leaderboard.version
+        surf.blit(self.layer, (0, 0))
+
+        # Draw buttons last so they stay on top
+        self.btn_play.draw(surf)
+        self.btn_settings.draw(surf)
+
+    def draw_static(self, surf):
         draw_bg_or_color(surf, FRONTPAGE_BG, (16, 16, 20))
         
         # Draw logo instead of text title
@@ -418,10 +422,6 @@ class HomeScene:
         # Blit text inside the brown block
         surf.blit(badge, text_pos)
 
-        # Draw buttons last so they stay on top
-        self.btn_play.draw(surf)
-        self.btn_settings.draw(surf)
-
     # ... your other draw logic ...
 
 
@@ -452,7 +452,7 @@ class HomeScene:
         draw_text(surf, "BEST", FONT_LB_HEADER, panel.left + 460, header_y,(200, 200, 210))
         draw_text(surf, "LAST", FONT_LB_HEADER, panel.left + 580, header_y,(200, 200, 210))
 
-        rows = get_leaderboard_rows(self.app.players, limit=7)
+        rows = self.app.leaderboard.top(7)
         y = header_y + 28
         line_h = 22
 
@@ -474,6 +474,8 @@ class HomeScene:
         # 🔴 ADDED END
 
 class GameScene:
+    music = "game"
+
     def __init__(self, app):
         self.app = app
         self.btn_home = Button((30,30,180,45),"Main Menu")
@@ -492,12 +494,11 @@ class GameScene:
             self.flies.append({"pos":[x,y],"vel":[dx,dy]})
 
     def handle_event(self,event):
-        kb = self.app.get_keybinds()
         if self.btn_home.clicked(event):
             self.app.scene = HomeScene(self.app)
             return
         if event.type == pygame.KEYDOWN:
-            if event.key == kb.get("pause",pygame.K_ESCAPE):
+            if self.app.input_map.action(event) == "pause":
                 self.app.scene = HomeScene(self.app)
             if event.key == pygame.K_RETURN:
                 self.app.record_play(self.score)
@@ -521,6 +522,8 @@ class GameScene:
         draw_text(surf,"Press ESC to return",FONT_SMALL,60,590)
 
 class SettingsScene:
+    music = "menu"
+
     def __init__(self, app):
         self.app = app
         self.back = Button((30,20,110,36),"Back")
@@ -532,44 +535,48 @@ class SettingsScene:
         x_start = 300
         y_start = 320
         for i,(action,key_name) in enumerate(app.settings["keybinds"].items()):
-            self.key_buttons[action] = Button((x_start,y_start+i*60,200,40),human_key(keyname_to_keyconst(key_name)))
+            self.key_buttons[action] = Button((x_start,y_start+i*60,200,40),human_key(keyname_to_keyconst(key_name) or pygame.K_UNKNOWN))
         self.awaiting_key = None
         self.mute_btn = Button((300,500,120,40),"Mute" if not app.settings["sound"].get("muted") else "Unmute")
+        self.layer = build_layer(self.draw_static)
 
     def handle_event(self,event):
         if self.back.clicked(event):
-            self.app.save_settings()
+            self.app.settings_store.flush()
             self.app.scene = HomeScene(self.app)
         for name, s in self.sliders.items():
             s.handle_event(event)
-            self.app.settings["sound"][name] = s.value
+            self.app.settings_store.set("sound", name, s.value)
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             for action,btn in self.key_buttons.items():
                 if btn.rect.collidepoint(event.pos):
                     self.awaiting_key = action
             if self.mute_btn.clicked(event):
-                self.app.settings["sound"]["muted"] = not self.app.settings["sound"].get("muted",False)
+                self.app.settings_store.set("sound", "muted", not self.app.settings["sound"]["muted"])
                 self.mute_btn.label = "Mute" if not self.app.settings["sound"]["muted"] else "Unmute"
         if self.awaiting_key and event.type == pygame.KEYDOWN:
-            self.app.settings["keybinds"][self.awaiting_key] = keyconst_to_keyname(event.key)
+            self.app.settings_store.set("keybinds", self.awaiting_key, keyconst_to_keyname(event.key))
             self.key_buttons[self.awaiting_key].label = human_key(event.key)
             self.awaiting_key = None
 
     def update(self,dt): pass
 
-    def draw(self,surf):
+    def draw_static(self,surf):
         draw_bg_or_color(surf,BG_VIEW,(16,16,20))
-        self.back.draw(surf)
         draw_text(surf,"Settings",FONT_BIG,60,70)
         draw_text(surf,"Music Volume",FONT_UI,100,190)
-        self.sliders["music"].draw(surf)
         draw_text(surf,"SFX Volume",FONT_UI,100,240)
-        self.sliders["sfx"].draw(surf)
         draw_text(surf,"Keybinds",FONT_UI,100,300)
+        draw_text(surf,"Click button to change key",FONT_UI_SMALL,520,320)
+
+    def draw(self,surf):
+        surf.blit(self.layer, (0, 0))
+        self.back.draw(surf)
+        self.sliders["music"].draw(surf)
+        self.sliders["sfx"].draw(surf)
         for btn in self.key_buttons.values():
             btn.draw(surf)
         self.mute_btn.draw(surf)
-        draw_text(surf,"Click button to change key",FONT_UI_SMALL,520,320)
 
 class TextInput:
     def __init__(self, rect, placeholder=""):
@@ -577,6 +584,8 @@ class TextInput:
         self.placeholder = placeholder
         self.text = ""
         self.active = False
+        self.gradient = None  # fallback background, built on first use
+        self.glow = None
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -598,31 +607,35 @@ class TextInput:
             surf.blit(USERNAME_BG_IMG, self.rect.topleft)
         else:
             # fallback gradient
-            grad_height = self.rect.height
-            for i in range(grad_height):
-                c1 = pygame.Color(60, 60, 70)
-                c2 = pygame.Color(40, 40, 48)
-                r = c1.r + (c2.r - c1.r) * i / grad_height
-                g = c1.g + (c2.g - c1.g) * i / grad_height
-                b = c1.b + (c2.b - c1.b) * i / grad_height
-                pygame.draw.line(surf, (int(r), int(g), int(b)), (self.rect.left, self.rect.top + i), (self.rect.right, self.rect.top + i))
+            if self.gradient is None:
+                self.gradient = pygame.Surface((self.rect.width + 1, self.rect.height)).convert()
+                grad_height = self.rect.height
+                for i in range(grad_height):
+                    c1 = pygame.Color(60, 60, 70)
+                    c2 = pygame.Color(40, 40, 48)
+                    r = c1.r + (c2.r - c1.r) * i / grad_height
+                    g = c1.g + (c2.g - c1.g) * i / grad_height
+                    b = c1.b + (c2.b - c1.b) * i / grad_height
+                    pygame.draw.line(self.gradient, (int(r), int(g), int(b)), (0, i), (self.rect.width, i))
+            surf.blit(self.gradient, self.rect.topleft)
 
         # Border with glow effect on focus
         base_border_color = pygame.Color(140, 140, 160)
         glow_color = pygame.Color(100, 200, 255) if self.active else base_border_color
 
         if self.active:
-            glow_surf = pygame.Surface((self.rect.width + 12, self.rect.height + 12), pygame.SRCALPHA)
-            pygame.draw.rect(glow_surf, glow_color, glow_surf.get_rect(), border_radius=16)
-            glow_surf.set_alpha(100)
-            surf.blit(glow_surf, (self.rect.left - 6, self.rect.top - 6))
+            if self.glow is None:
+                self.glow = pygame.Surface((self.rect.width + 12, self.rect.height + 12), pygame.SRCALPHA)
+                pygame.draw.rect(self.glow, glow_color, self.glow.get_rect(), border_radius=16)
+                self.glow.set_alpha(100)
+            surf.blit(self.glow, (self.rect.left - 6, self.rect.top - 6))
 
         pygame.draw.rect(surf, glow_color, self.rect, 3, border_radius=12)
 
         # Draw the text
         shown = self.text if self.text else self.placeholder
         col = (230, 230, 255) if self.text else (140, 160, 180)
-        txt = FONT_SMALL.render(shown, True, col)
+        txt = render_text(shown, FONT_SMALL, col)
         surf.blit(txt, txt.get_rect(midleft=(self.rect.left + 14, self.rect.centery)))
 
 
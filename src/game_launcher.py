@@ -0,0 +1,62 @@
+import json
+import subprocess
+import sys
+
+
+def wait_for_start(stream):
+    """Block until a start message arrives on stream (the game's stdin); None when the stream closes"""
+    for line in stream:
+        try:
+            message = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(message, dict) and message.get("command") == "start":
+            return message
+    return None
+
+
+class GameLauncher:
+    """Starts rounds of the game from the front page, in a process of their own.
+
+    prespawn() starts the game with --warm in the background: it sets up the
+    display, loads every asset and generates the platforms, then waits hidden
+    for a start message on its stdin. start() sends that message with the
+    player and the current settings, so the round shows up at once. When there
+    is no warm process (or it died) start() falls back to a cold start.
+    """
+    def __init__(self, game_path):
+        self.game_path = game_path
+        self.process = None
+
+    def prespawn(self):
+        if self.process is None or self.process.poll() is not None:
+            self.process = subprocess.Popen([sys.executable, self.game_path, "--warm"],
+                                            stdin=subprocess.PIPE, text=True)
+
+    def start(self, username, high_score, settings):
+        process, self.process = self.process, None
+        if process is not None and process.poll() is None:
+            try:
+                process.stdin.write(json.dumps({
+                    "command": "start",
+                    "username": username,
+                    "high_score": high_score,
+                    "settings": settings,
+                }) + "\n")
+                process.stdin.close()
+                return process
+            except OSError:
+                # The warm process is going away, start a fresh one instead
+                pass
+        # One argument each, a name starting with "-" would otherwise be taken for an option
+        return subprocess.Popen([sys.executable, self.game_path,
+                                 f"--username={username}", f"--high-score={high_score}"])
+
+    def discard(self):
+        """Let the warm process go: it exits once its stdin is closed"""
+        if self.process is not None:
+            try:
+                self.process.stdin.close()
+            except OSError:
+                pass
+            self.process = None
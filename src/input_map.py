@@ -0,0 +1,60 @@
+import pygame
+
+# Keys that keep working next to the configured keybind of an action
+ALTERNATE_KEYS = {
+    "left": (pygame.K_LEFT, pygame.K_a),
+    "right": (pygame.K_RIGHT, pygame.K_d),
+    "jump": (pygame.K_UP, pygame.K_w),
+    "pause": (pygame.K_ESCAPE,),
+}
+
+
+def keyname_to_keyconst(name):
+    """pygame key constant for a keybind name such as "K_SPACE", or None"""
+    key = getattr(pygame, name, None) if isinstance(name, str) and name.startswith("K_") else None
+    return key if isinstance(key, int) else None
+
+
+class InputMap:
+    """Key to action lookup, resolved from the keybind names only when they change.
+
+    action(event) gives the action of a KEYDOWN event (or None) with one dict
+    lookup, held(keys, action) tells if any key of an action is held down.
+    A configured keybind wins over an alternate key of another action.
+    """
+    def __init__(self, keybinds, alternates=ALTERNATE_KEYS):
+        self.alternates = alternates
+        self.key_actions = {}  # key constant -> action
+        self.action_keys = {}  # action -> tuple of key constants
+        self.rebind(keybinds)
+
+    def rebind(self, keybinds):
+        self.keybinds = dict(keybinds)
+        key_actions = {}
+        for action, keys in self.alternates.items():
+            for key in keys:
+                key_actions[key] = action
+        for action, name in keybinds.items():
+            key = keyname_to_keyconst(name)
+            if key is not None:
+                key_actions[key] = action
+        action_keys = {}
+        for key, action in key_actions.items():
+            action_keys.setdefault(action, []).append(key)
+        self.key_actions = key_actions
+        self.action_keys = {action: tuple(keys) for action, keys in action_keys.items()}
+
+    def action(self, event):
+        if event.type != pygame.KEYDOWN:
+            return None
+        return self.key_actions.get(event.key)
+
+    def keys_for(self, action):
+        return self.action_keys.get(action, ())
+
+    def held(self, keys, action):
+        """keys is pygame.key.get_pressed() or anything indexable the same way"""
+        for key in self.action_keys.get(action, ()):
+            if keys[key]:
+                return True
+        return False
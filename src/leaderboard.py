@@ -0,0 +1,235 @@
+import bisect
+import json
+import os
+import sqlite3
+import time
+from settings_store import write_json_atomic
+
+# The journal is folded into the snapshot once it has this many entries
+COMPACT_AFTER = 1000
+# How long a writer waits for another process holding the SQLite write lock
+SQLITE_BUSY_TIMEOUT_MS = 5000
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    name TEXT PRIMARY KEY,
+    plays INTEGER NOT NULL DEFAULT 0,
+    best_score INTEGER NOT NULL DEFAULT 0,
+    last_score INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS players_rank ON players (best_score DESC, plays DESC, name);
+CREATE TABLE IF NOT EXISTS rounds (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    played_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS rounds_name ON rounds (name, played_at);
+CREATE INDEX IF NOT EXISTS rounds_score ON rounds (score DESC);
+"""
+
+
+def rank_key(name, stats):
+    """Sort key of a player: best score, then plays, both descending, then name"""
+    return (-stats["best_score"], -stats["plays"], name)
+
+
+class LeaderboardStore:
+    """Players and their scores, with a sorted index for the leaderboard.
+
+    The players are kept in a JSON snapshot (players.json) plus an append-only
+    journal next to it: every change appends the new record of one player as a
+    JSON line instead of rewriting the whole file. Once the journal holds
+    COMPACT_AFTER entries it is folded into the snapshot. The index is a list
+    sorted by rank_key(), updated with bisect on every change, so top(k) is a
+    slice of its first k entries.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.players = {}
+        self.journal_entries = 0
+        self.journal_torn = False  # the journal ends in a partly written line
+        self.version = 0  # bumped on every change
+        self.load()
+        self.index = sorted(rank_key(name, stats) for name, stats in self.players.items())
+        self.journal = None
+        if self.journal_entries >= COMPACT_AFTER:
+            self.compact()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                for name, stats in data.items():
+                    self.players[name] = self._record(stats)
+        except (OSError, ValueError):
+            pass
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    self.journal_torn = not line.endswith("\n")
+                    try:
+                        entry = json.loads(line)
+                        self.players[entry["name"]] = self._record(entry)
+                    except (ValueError, KeyError, TypeError):
+                        # A line cut short by a crash, everything before it is still good
+                        continue
+                    self.journal_entries += 1
+        except OSError:
+            pass
+
+    def _record(self, stats):
+        return {
+            "plays": int(stats.get("plays", 0)),
+            "best_score": int(stats.get("best_score", 0)),
+            "last_score": int(stats.get("last_score", 0)),
+        }
+
+    def _append(self, name):
+        if self.journal is None:
+            self.journal = open(self.journal_path, "a", encoding="utf-8")
+            if self.journal_torn:
+                # Never glue a new entry onto the torn one
+                self.journal.write("\n")
+                self.journal_torn = False
+        self.journal.write(json.dumps(dict(self.players[name], name=name)) + "\n")
+        self.journal.flush()
+        self.journal_entries += 1
+        if self.journal_entries >= COMPACT_AFTER:
+            self.compact()
+
+    def _update(self, name, stats):
+        old = self.players.get(name)
+        if old is not None:
+            i = bisect.bisect_left(self.index, rank_key(name, old))
+            del self.index[i]
+        self.players[name] = stats
+        bisect.insort(self.index, rank_key(name, stats))
+        self.version += 1
+        self._append(name)
+
+    def ensure_player(self, name):
+        if name not in self.players:
+            self._update(name, {"plays": 0, "best_score": 0, "last_score": 0})
+
+    def record_play(self, name, score):
+        stats = dict(self.players.get(name) or {"plays": 0, "best_score": 0, "last_score": 0})
+        stats["plays"] += 1
+        stats["last_score"] = int(score)
+        stats["best_score"] = max(stats["best_score"], int(score))
+        self._update(name, stats)
+
+    def best_score(self, name):
+        stats = self.players.get(name)
+        return stats["best_score"] if stats else 0
+
+    def record_plays(self, rounds):
+        """Record (name, score, played_at) rounds in order, the time is not kept in this store"""
+        for name, score, _ in rounds:
+            self.record_play(name, score)
+
+    def top(self, limit):
+        """(name, plays, best, last) of the best `limit` players"""
+        rows = []
+        for _, _, name in self.index[:limit]:
+            stats = self.players[name]
+            rows.append((name, stats["plays"], stats["best_score"], stats["last_score"]))
+        return rows
+
+    def compact(self):
+        """Write all players to the snapshot and start an empty journal"""
+        write_json_atomic(self.path, self.players)
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+        try:
+            os.remove(self.journal_path)
+        except OSError:
+            pass
+        self.journal_entries = 0
+
+    def close(self):
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+
+
+class SQLiteLeaderboardStore:
+    """The same store on an SQLite database, with every round kept in a table.
+
+    Meant for machines that record many rounds, possibly from several game
+    processes at once: the database runs in WAL mode, so readers never block
+    the writer, and every update is a single upsert that other processes
+    cannot interleave with. record_plays() writes a whole batch of rounds in
+    one transaction.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.db = sqlite3.connect(path, timeout=SQLITE_BUSY_TIMEOUT_MS / 1000)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        # WAL with synchronous=NORMAL is safe against corruption, only the last commits can be lost on power loss
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SQLITE_SCHEMA)
+        self.changes = 0
+
+    @property
+    def version(self):
+        """Changes when this or any other connection committed to the database"""
+        return (self.changes, self.db.execute("PRAGMA data_version").fetchone()[0])
+
+    def is_empty(self):
+        return self.db.execute("SELECT 1 FROM players LIMIT 1").fetchone() is None
+
+    def import_players(self, players):
+        """Copy the players of a LeaderboardStore (their rounds were never kept)"""
+        with self.db:
+            self.db.executemany(
+                "INSERT OR IGNORE INTO players (name, plays, best_score, last_score) VALUES (?, ?, ?, ?)",
+                [(name, stats["plays"], stats["best_score"], stats["last_score"]) for name, stats in players.items()])
+        self.changes += 1
+
+    def ensure_player(self, name):
+        with self.db:
+            self.db.execute("INSERT OR IGNORE INTO players (name) VALUES (?)", (name,))
+        self.changes += 1
+
+    def best_score(self, name):
+        row = self.db.execute("SELECT best_score FROM players WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else 0
+
+    def record_play(self, name, score):
+        self.record_plays([(name, score, time.time())])
+
+    def record_plays(self, rounds):
+        """Record (name, score, played_at) rounds, in order, in one transaction"""
+        rows = [(name, int(score), played_at) for name, score, played_at in rounds]
+        with self.db:
+            self.db.executemany("INSERT INTO rounds (name, score, played_at) VALUES (?, ?, ?)", rows)
+            self.db.executemany(
+                "INSERT INTO players (name, plays, best_score, last_score) VALUES (?, 1, ?2, ?2) "
+                "ON CONFLICT (name) DO UPDATE SET plays = plays + 1, "
+                "best_score = max(best_score, excluded.best_score), last_score = excluded.last_score",
+                [(name, score) for name, score, _ in rows])
+        self.changes += 1
+
+    def top(self, limit):
+        """(name, plays, best, last) of the best `limit` players"""
+        return self.db.execute(
+            "SELECT name, plays, best_score, last_score FROM players "
+            "ORDER BY best_score DESC, plays DESC, name LIMIT ?", (limit,)).fetchall()
+
+    def close(self):
+        self.db.close()
+
+
+def open_leaderboard(backend, json_path, sqlite_path):
+    """The store picked by the "storage" setting: "sqlite", or the JSON files for anything else"""
+    if backend != "sqlite":
+        return LeaderboardStore(json_path)
+    store = SQLiteLeaderboardStore(sqlite_path)
+    if store.is_empty() and os.path.exists(json_path):
+        # First switch to SQLite: carry the players over from the JSON files
+        store.import_players(LeaderboardStore(json_path).players)
+    return store
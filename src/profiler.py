@@ -0,0 +1,155 @@
+import json
+import time
+from collections import deque
+import pygame
+
+# Frames kept in the rolling windows (4 seconds at 60 FPS)
+PROFILER_HISTORY = 240
+# A trace is meant for short captures, stop collecting before it eats all memory
+TRACE_MAX_EVENTS = 2_000_000
+FRAME_BUDGET_MS = 1000 / 60
+
+
+class FrameProfiler:
+    """Time named sections of the main loop.
+
+    Call begin_frame() at the top of every frame and mark(name) at the end of
+    every section: the time since the previous mark is booked on that section.
+    count(name, value) reports a counter (shown on the overlay, traced as a
+    counter track). While neither the overlay nor a trace is active these calls
+    return at once.
+    """
+    def __init__(self, trace_path=None):
+        self.sections = {}  # section name -> durations (ns) of the last frames
+        self.counters = {}  # counter name -> last value reported
+        self.frame_times = deque(maxlen=PROFILER_HISTORY)
+        self.overlay = False
+        self.trace_path = trace_path
+        self.trace_events = [] if trace_path else None
+        self.active = trace_path is not None
+        self.frame_start = None
+        self.last_mark = None
+        self.font = None
+        self.panel = None
+
+    def toggle_overlay(self):
+        self.overlay = not self.overlay
+        self.active = self.overlay or self.trace_events is not None
+        # Time spent with the profiler off is not a frame
+        self.frame_start = None
+        self.last_mark = None
+
+    def begin_frame(self):
+        if not self.active:
+            return
+        now = time.perf_counter_ns()
+        if self.frame_start is not None:
+            self.frame_times.append(now - self.frame_start)
+            self._trace("frame", self.frame_start, now, 0)
+        self.frame_start = now
+        self.last_mark = now
+
+    def mark(self, name):
+        """End the current section: book the time since the previous mark on `name`"""
+        if not self.active:
+            return
+        now = time.perf_counter_ns()
+        if self.last_mark is not None:
+            samples = self.sections.get(name)
+            if samples is None:
+                samples = self.sections[name] = deque(maxlen=PROFILER_HISTORY)
+            samples.append(now - self.last_mark)
+            self._trace(name, self.last_mark, now, 1)
+        self.last_mark = now
+
+    def count(self, name, value):
+        """Report the current value of a counter, for example the sounds dropped so far"""
+        if not self.active:
+            return
+        if self.counters.get(name) != value and self.trace_events is not None and len(self.trace_events) < TRACE_MAX_EVENTS:
+            # Chrome trace counter event, only when the value changes
+            self.trace_events.append({"name": name, "ph": "C", "pid": 0,
+                                      "ts": time.perf_counter_ns() / 1000, "args": {name: value}})
+        self.counters[name] = value
+
+    def _trace(self, name, start_ns, end_ns, tid):
+        if self.trace_events is not None and len(self.trace_events) < TRACE_MAX_EVENTS:
+            # Chrome trace "complete" event, timestamps in microseconds
+            self.trace_events.append({"name": name, "ph": "X", "pid": 0, "tid": tid,
+                                      "ts": start_ns / 1000, "dur": (end_ns - start_ns) / 1000})
+
+    def write_trace(self):
+        """Write the collected events as a Chrome trace (chrome://tracing, Perfetto)"""
+        if self.trace_events is None:
+            return
+        with open(self.trace_path, "w") as f:
+            json.dump({
+                "traceEvents": [
+                    {"name": "thread_name", "ph": "M", "pid": 0, "tid": 0, "args": {"name": "frames"}},
+                    {"name": "thread_name", "ph": "M", "pid": 0, "tid": 1, "args": {"name": "sections"}},
+                ] + self.trace_events,
+                "displayTimeUnit": "ms",
+            }, f)
+
+    def top_sections(self, count):
+        """(name, mean ms, max ms) of the most expensive sections over the rolling window"""
+        rows = []
+        for name, samples in self.sections.items():
+            if samples:
+                rows.append((name, sum(samples) / len(samples) / 1e6, max(samples) / 1e6))
+        rows.sort(key=lambda row: row[1], reverse=True)
+        return rows[:count]
+
+    def draw_overlay(self, surface):
+        """FPS, frame time graph and the top sections in the top left corner"""
+        if not self.overlay:
+            return
+        if self.font is None:
+            self.font = pygame.font.Font(None, 20)
+        # One more line per counter under the sections table
+        panel_height = 310 + 18 * len(self.counters)
+        if self.panel is None or self.panel.get_height() != panel_height:
+            self.panel = pygame.Surface((PROFILER_HISTORY + 20, panel_height), pygame.SRCALPHA)
+        panel = self.panel
+        panel.fill((0, 0, 0, 180))
+
+        if self.frame_times:
+            mean_ms = sum(self.frame_times) / len(self.frame_times) / 1e6
+            worst_ms = max(self.frame_times) / 1e6
+            header = f"FPS {1000 / mean_ms:.1f}   avg {mean_ms:.1f} ms   max {worst_ms:.1f} ms"
+        else:
+            header = "FPS   -"
+        panel.blit(self.font.render(header, True, (255, 255, 255)), (10, 8))
+
+        # Frame time graph, 2 px per millisecond, with the 60 FPS budget as a line
+        graph_top, graph_height = 30, 100
+        budget_y = graph_top + graph_height - int(FRAME_BUDGET_MS * 2)
+        pygame.draw.line(panel, (120, 120, 120), (10, budget_y), (10 + PROFILER_HISTORY, budget_y))
+        for i, frame_ns in enumerate(self.frame_times):
+            frame_ms = frame_ns / 1e6
+            bar = min(graph_height, int(frame_ms * 2))
+            if frame_ms <= FRAME_BUDGET_MS * 1.1:
+                color = (80, 220, 80)
+            elif frame_ms <= FRAME_BUDGET_MS * 2:
+                color = (230, 200, 60)
+            else:
+                color = (230, 70, 70)
+            x = 10 + i
+            pygame.draw.line(panel, color, (x, graph_top + graph_height), (x, graph_top + graph_height - bar))
+
+        # Top sections table (the font is not monospaced, so every column is placed on its own)
+        y = graph_top + graph_height + 8
+        rows = [("section", "mean ms", "max ms", (200, 200, 200))]
+        for name, mean_ms, max_ms in self.top_sections(8):
+            rows.append((name, f"{mean_ms:.2f}", f"{max_ms:.2f}", (255, 255, 255)))
+        for name, mean_text, max_text, color in rows:
+            panel.blit(self.font.render(name, True, color), (10, y))
+            for text, right in ((mean_text, 180), (max_text, 240)):
+                label = self.font.render(text, True, color)
+                panel.blit(label, (right - label.get_width(), y))
+            y += 18
+        for name, value in self.counters.items():
+            panel.blit(self.font.render(f"{name}: {value}", True, (200, 200, 200)), (10, y))
+            y += 18
+
+        surface.blit(panel, (10, 10))
@@ -0,0 +1,119 @@
+import json
+import struct
+import pygame
+
+# Replay log layout (little endian):
+#   header: magic, version, seed, screen width, screen height,
+#           length of the keybinds, keybinds as JSON (key codes mean nothing without them)
+#   per step: ticks, mouse x, mouse y, number of held keys, number of events
+#             then one key code per held key
+#             then one (kind, code, x, y) record per event
+REPLAY_MAGIC = b"FFRP"
+REPLAY_VERSION = 2
+HEADER_FORMAT = struct.Struct("<4sBqHH")
+KEYBINDS_LENGTH_FORMAT = struct.Struct("<H")
+FRAME_FORMAT = struct.Struct("<IhhHI")
+# Version 1 logs: no keybinds, one byte counts
+FRAME_FORMATS = {1: struct.Struct("<IhhBB"), 2: FRAME_FORMAT}
+KEY_FORMAT = struct.Struct("<I")
+EVENT_FORMAT = struct.Struct("<BIhh")
+
+# Event kinds stored in the log (only the events the game reacts to)
+EVENT_KINDS = {
+    pygame.QUIT: 1,
+    pygame.KEYDOWN: 2,
+    pygame.KEYUP: 3,
+    pygame.MOUSEBUTTONDOWN: 4,
+    pygame.MOUSEBUTTONUP: 5,
+    pygame.MOUSEMOTION: 6,
+}
+EVENT_TYPES = {kind: event_type for event_type, kind in EVENT_KINDS.items()}
+
+
+class ReplayKeyState:
+    """Stand-in for pygame.key.get_pressed() during playback"""
+    def __init__(self, held_keys):
+        self.held_keys = held_keys
+
+    def __getitem__(self, key):
+        return key in self.held_keys
+
+
+class ReplayRecorder:
+    """Write the input of every simulation step to a replay log"""
+    def __init__(self, path, seed, screen_size, watched_keys, keybinds):
+        self.file = open(path, "wb")
+        self.watched_keys = tuple(watched_keys)
+        self.file.write(HEADER_FORMAT.pack(REPLAY_MAGIC, REPLAY_VERSION, seed, screen_size[0], screen_size[1]))
+        keybinds_json = json.dumps(keybinds).encode("utf-8")
+        self.file.write(KEYBINDS_LENGTH_FORMAT.pack(len(keybinds_json)) + keybinds_json)
+
+    def record_frame(self, ticks, keys, events, mouse_pos):
+        held = [key for key in self.watched_keys if keys[key]]
+        recorded = [event for event in events if event.type in EVENT_KINDS]
+        chunks = [FRAME_FORMAT.pack(ticks, mouse_pos[0], mouse_pos[1], len(held), len(recorded))]
+        for key in held:
+            chunks.append(KEY_FORMAT.pack(key))
+        for event in recorded:
+            code = 0
+            x, y = 0, 0
+            if event.type in (pygame.KEYDOWN, pygame.KEYUP):
+                code = event.key
+            elif event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+                code = event.button
+                x, y = event.pos
+            elif event.type == pygame.MOUSEMOTION:
+                x, y = event.pos
+            chunks.append(EVENT_FORMAT.pack(EVENT_KINDS[event.type], code, x, y))
+        self.file.write(b"".join(chunks))
+
+    def close(self):
+        self.file.close()
+
+
+class ReplayPlayer:
+    """Read a replay log back one simulation step at a time"""
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.data = f.read()
+        magic, version, self.seed, width, height = HEADER_FORMAT.unpack_from(self.data, 0)
+        if magic != REPLAY_MAGIC or version not in FRAME_FORMATS:
+            raise ValueError(f"{path} is not a version {REPLAY_VERSION} replay log")
+        self.screen_size = (width, height)
+        self.frame_format = FRAME_FORMATS[version]
+        self.offset = HEADER_FORMAT.size
+        # Keybinds the log was recorded with (None for version 1 logs: play them with the current ones)
+        self.keybinds = None
+        if version >= 2:
+            length = KEYBINDS_LENGTH_FORMAT.unpack_from(self.data, self.offset)[0]
+            self.offset += KEYBINDS_LENGTH_FORMAT.size
+            self.keybinds = json.loads(self.data[self.offset:self.offset + length].decode("utf-8"))
+            self.offset += length
+
+    def next_frame(self):
+        """Return (ticks, keys, events, mouse_pos) for the next step, or None at the end of the log"""
+        if self.offset + self.frame_format.size > len(self.data):
+            return None
+        ticks, mouse_x, mouse_y, num_keys, num_events = self.frame_format.unpack_from(self.data, self.offset)
+        self.offset += self.frame_format.size
+
+        held = set()
+        for _ in range(num_keys):
+            held.add(KEY_FORMAT.unpack_from(self.data, self.offset)[0])
+            self.offset += KEY_FORMAT.size
+
+        events = []
+        for _ in range(num_events):
+            kind, code, x, y = EVENT_FORMAT.unpack_from(self.data, self.offset)
+            self.offset += EVENT_FORMAT.size
+            event_type = EVENT_TYPES[kind]
+            if event_type in (pygame.KEYDOWN, pygame.KEYUP):
+                events.append(pygame.event.Event(event_type, key=code))
+            elif event_type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+                events.append(pygame.event.Event(event_type, button=code, pos=(x, y)))
+            elif event_type == pygame.MOUSEMOTION:
+                events.append(pygame.event.Event(event_type, pos=(x, y)))
+            else:
+                events.append(pygame.event.Event(event_type))
+
+        return ticks, ReplayKeyState(held), events, (mouse_x, mouse_y)
@@ -0,0 +1,25 @@
+import random
+
+class GameRNG:
+    """Seeded random number service for gameplay.
+
+    Every consumer draws from its own stream, so extra cosmetic randomness
+    (for example screen shake) never changes where flies spawn or fly:
+    - spawn: fly spawn positions and initial movement patterns
+    - ai: fly re-aiming while flying
+    - cosmetic: screen shake and other visual-only randomness
+
+    The same seed always gives the same sequence on every stream.
+    """
+    STREAMS = ("spawn", "ai", "cosmetic")
+
+    def __init__(self, seed=None):
+        self.reseed(seed)
+
+    def reseed(self, seed=None):
+        if seed is None:
+            seed = random.SystemRandom().randrange(2 ** 32)
+        self.seed = seed
+        for name in self.STREAMS:
+            # String seeds are hashed deterministically (not affected by PYTHONHASHSEED)
+            setattr(self, name, random.Random(f"{seed}:{name}"))
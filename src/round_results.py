@@ -0,0 +1,54 @@
+import json
+import os
+import time
+
+# Results of finished rounds, one small file each: written by the game, collected by the front page
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "results")
+
+
+def write_result(username, score, played_at=None):
+    """Drop the result of a round in RESULTS_DIR (written to a temp file, then renamed, so it only shows up complete)"""
+    if played_at is None:
+        played_at = time.time()
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    name = f"{played_at:.6f}-{os.getpid()}"
+    tmp_path = os.path.join(RESULTS_DIR, name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"username": username, "score": int(score), "played_at": played_at}, f)
+    os.replace(tmp_path, os.path.join(RESULTS_DIR, name + ".json"))
+
+
+def ingest_results(store):
+    """Record every waiting result in the leaderboard store as one batch, oldest first.
+
+    The files are removed only after the store took the batch, so a crash in
+    between records a result twice at worst, never loses it. Returns the
+    number of rounds recorded.
+    """
+    try:
+        names = os.listdir(RESULTS_DIR)
+    except OSError:
+        return 0
+    results = []
+    paths = []
+    for name in names:
+        if not name.endswith(".json"):
+            continue
+        path = os.path.join(RESULTS_DIR, name)
+        paths.append(path)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            results.append((str(data["username"]), int(data["score"]), float(data["played_at"])))
+        except (OSError, ValueError, KeyError, TypeError):
+            # Unreadable result, removed with the others
+            continue
+    if results:
+        results.sort(key=lambda result: result[2])
+        store.record_plays(results)
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    return len(results)
@@ -0,0 +1,130 @@
+import pygame
+from replay import ReplayKeyState
+
+# Scripted input for the benchmark scenarios (see benchmark.py).
+# A script gets the step number and the screen size and returns
+# (held keys, events, mouse position) for that step. The game resolves the
+# keys with the default keybinds, never the player's (see app_new.py).
+SCENARIO_STEP_MS = 1000 / 60
+
+
+def _jump(step, every):
+    """KEYDOWN for the jump key every `every` steps"""
+    if step % every == 0:
+        return [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_UP)]
+    return []
+
+
+def idle(step, screen_size):
+    """Frog sits on the ground, no input"""
+    return (), [], (screen_size[0] // 2, screen_size[1] // 2)
+
+
+def trunk_hug(step, screen_size):
+    """Frog jumps over the left water and keeps pushing into the left trunk"""
+    return (pygame.K_LEFT,), _jump(step, 13), (screen_size[0] // 2, screen_size[1] // 2)
+
+
+def branch_bounce(step, screen_size):
+    """Frog climbs the left tree, then keeps hopping from branch to branch"""
+    if step < 200:
+        return (pygame.K_LEFT,), _jump(step, 13), (screen_size[0] // 2, screen_size[1] // 2)
+    return (), _jump(step, 40), (screen_size[0] // 2, screen_size[1] // 2)
+
+
+# Points the tongue is fired at, as fractions of the screen size
+TONGUE_TARGETS = ((0.2, 0.2), (0.5, 0.1), (0.8, 0.2), (0.3, 0.5), (0.7, 0.5))
+
+
+def tongue_spam(step, screen_size):
+    """Tongue is fired again as soon as it is back, aiming all over the screen"""
+    tx, ty = TONGUE_TARGETS[(step // 20) % len(TONGUE_TARGETS)]
+    mouse_pos = (int(screen_size[0] * tx), int(screen_size[1] * ty))
+    events = []
+    if step % 20 == 0:
+        events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=mouse_pos))
+    return (), events, mouse_pos
+
+
+def pause_menu(step, screen_size):
+    """Pause menu is opened on the first step and stays open"""
+    events = []
+    if step == 1:
+        events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_ESCAPE))
+    return (), events, (screen_size[0] // 2, screen_size[1] // 2)
+
+
+# Steps at which pause_walk opens and closes the pause menu
+PAUSE_WALK_PAUSE = 60
+PAUSE_WALK_RESUME = 180
+
+
+def pause_walk(step, screen_size):
+    """Pause menu opens, right is held and jump pressed behind it, then the menu closes again"""
+    events = []
+    held = ()
+    if step in (PAUSE_WALK_PAUSE, PAUSE_WALK_RESUME):
+        events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_ESCAPE))
+    elif PAUSE_WALK_PAUSE < step < PAUSE_WALK_RESUME:
+        held = (pygame.K_RIGHT,)
+        events = _jump(step, 13)
+    return held, events, (screen_size[0] // 2, screen_size[1] // 2)
+
+
+def check_pause_walk(step, character, state):
+    """The frog stays where the pause caught it until the menu closes"""
+    position = (character["x"], character["y"])
+    if step == PAUSE_WALK_PAUSE:
+        state["paused_at"] = position
+    elif PAUSE_WALK_PAUSE < step < PAUSE_WALK_RESUME and position != state["paused_at"]:
+        return f"frog moved behind the pause menu at step {step}: {state['paused_at']} -> {position}"
+    return None
+
+
+def game_over(step, screen_size):
+    """Frog walks right into the swamp and the game over screen (with shake) stays up"""
+    return (pygame.K_RIGHT,), [], (screen_size[0] // 2, screen_size[1] // 2)
+
+
+# name -> (script, number of flies or None for the game default, description)
+SCENARIOS = {
+    "idle": (idle, None, "idle frog on the ground"),
+    "trunk_hug": (trunk_hug, None, "frog hugging the left trunk"),
+    "branch_bounce": (branch_bounce, None, "frog bouncing on branches"),
+    "tongue_spam": (tongue_spam, None, "tongue fired as often as possible"),
+    "flies_12": (idle, 12, "12 flies"),
+    "flies_100": (idle, 100, "100 flies"),
+    "flies_1000": (idle, 1000, "1,000 flies"),
+    "pause_menu": (pause_menu, None, "pause menu open"),
+    "pause_walk": (pause_walk, None, "keys held behind the pause menu"),
+    "game_over": (game_over, None, "game over screen with shake"),
+}
+
+# name -> check(step, character, state) run after every step, returns an error message or None
+SCENARIO_CHECKS = {
+    "pause_walk": check_pause_walk,
+}
+
+
+class ScenarioPlayer:
+    """Feed a scripted scenario to the game loop, like ReplayPlayer does for a replay log"""
+    def __init__(self, name, screen_size):
+        self.name = name
+        self.script, self.num_flies, self.description = SCENARIOS[name]
+        self.screen_size = screen_size
+        self.step = 0
+        self.check_script = SCENARIO_CHECKS.get(name)
+        self.check_state = {}
+
+    def next_frame(self):
+        """Return (ticks, keys, events, mouse_pos) for the next step"""
+        held, events, mouse_pos = self.script(self.step, self.screen_size)
+        ticks = int(self.step * SCENARIO_STEP_MS)
+        self.step += 1
+        return ticks, ReplayKeyState(set(held)), events, mouse_pos
+
+    def check(self, character):
+        """Run the scenario's check on the game state after the last step: an error message or None"""
+        if self.check_script is None:
+            return None
+        return self.check_script(self.step - 1, character, self.check_state)
@@ -0,0 +1,213 @@
+import atexit
+import copy
+import json
+import os
+import threading
+import time
+
+# Changes are written once they have been quiet for this long (a slider drag is one write)
+SAVE_DELAY = 0.5
+
+# settings.json in the project root, shared by the front page and the game
+SETTINGS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "settings.json")
+
+# Schema: every setting with its default value
+SETTINGS_DEFAULTS = {
+    "keybinds": {
+        "left": "K_q",
+        "right": "K_d",
+        "jump": "K_SPACE",
+        "tongue": "K_LCTRL",
+        "pause": "K_ESCAPE"
+    },
+    "sound": {
+        "music": 0.5,
+        "sfx": 0.7,
+        "muted": False
+    },
+    "storage": {
+        "players": "json"  # or "sqlite" (players.db)
+    }
+}
+
+
+def merge_defaults(data, defaults):
+    """Fill in every key of defaults that is missing from data (nested dicts included)"""
+    for key, value in defaults.items():
+        if key not in data:
+            data[key] = copy.deepcopy(value)
+        elif isinstance(value, dict) and isinstance(data[key], dict):
+            merge_defaults(data[key], value)
+    return data
+
+
+def validate(data, defaults):
+    """Replace values whose type does not match the schema by the default"""
+    for key, default in defaults.items():
+        value = data.get(key)
+        if isinstance(default, dict):
+            if isinstance(value, dict):
+                validate(value, default)
+            else:
+                data[key] = copy.deepcopy(default)
+        elif isinstance(default, bool):
+            if not isinstance(value, bool):
+                data[key] = default
+        elif isinstance(default, float):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                data[key] = default
+            else:
+                data[key] = max(0.0, min(1.0, float(value)))
+        elif isinstance(default, str) and not isinstance(value, str):
+            data[key] = default
+    return data
+
+
+def write_json_atomic(path, data):
+    """Write JSON to a temp file next to path, then rename it over path"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class SettingsStore:
+    """Settings kept in memory, saved to disk by a background writer.
+
+    Change settings with set(section, key, value): the change is live at once,
+    subscribers are told about it, and the file is rewritten atomically once no
+    new change came in for SAVE_DELAY seconds. Pending changes are flushed by
+    close(), which also runs at exit.
+    """
+    def __init__(self, path, defaults):
+        self.path = path
+        self.defaults = defaults
+        self.data = validate(merge_defaults(self.read(), defaults), defaults)
+        self.listeners = []
+        self.condition = threading.Condition()
+        self.write_lock = threading.Lock()  # one file write at a time
+        self.pending = None  # (version, settings) waiting to be written
+        self.writing = False  # the writer took a snapshot and is writing it
+        self.changed_at = None  # time of the last change
+        self.version = 0
+        self.written_version = 0
+        self.closed = False
+        self.writer = threading.Thread(target=self._writer, name="settings-writer", daemon=True)
+        self.writer.start()
+        atexit.register(self.close)
+
+    def read(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def subscribe(self, callback):
+        """Call callback(section, key, value) after every change made through set()"""
+        self.listeners.append(callback)
+
+    def set(self, section, key, value):
+        if self.data[section].get(key) == value:
+            return
+        self.data[section][key] = value
+        for callback in self.listeners:
+            callback(section, key, value)
+        self.save()
+
+    def apply(self, data):
+        """Take over settings saved by another process: subscribers are told, nothing is written"""
+        if not isinstance(data, dict):
+            return
+        # Only the schema is taken over, sections and keys missing from data are left alone
+        for section, defaults in self.defaults.items():
+            incoming = data.get(section)
+            if not isinstance(incoming, dict):
+                continue
+            incoming = validate(merge_defaults(copy.deepcopy(incoming), defaults), defaults)
+            values = self.data[section]
+            for key in defaults:
+                if key not in data[section]:
+                    continue
+                value = incoming[key]
+                if values.get(key) != value:
+                    values[key] = value
+                    for callback in self.listeners:
+                        callback(section, key, value)
+
+    def save(self):
+        """Schedule a write of the current settings"""
+        # The snapshot is taken here, on the thread that changes the settings
+        snapshot = copy.deepcopy(self.data)
+        with self.condition:
+            self.version += 1
+            self.pending = (self.version, snapshot)
+            self.changed_at = time.monotonic()
+            self.condition.notify()
+
+    def _take_pending(self):
+        with self.condition:
+            while not self.closed:
+                if self.pending is None:
+                    self.condition.wait()
+                    continue
+                remaining = self.changed_at + SAVE_DELAY - time.monotonic()
+                if remaining > 0:
+                    self.condition.wait(remaining)
+                    continue
+                pending, self.pending = self.pending, None
+                self.writing = True
+                return pending
+            return None
+
+    def _writer(self):
+        while True:
+            pending = self._take_pending()
+            if pending is None:
+                return
+            # Written without holding the condition, so save() never waits for the disk
+            self._write(pending)
+            with self.condition:
+                self.writing = False
+                self.condition.notify_all()
+
+    def _write(self, pending):
+        version, snapshot = pending
+        with self.write_lock:
+            # A newer version may already have been flushed by another thread
+            if version <= self.written_version:
+                return
+            try:
+                write_json_atomic(self.path, snapshot)
+                self.written_version = version
+            except OSError:
+                pass
+
+    def flush(self):
+        """Write pending changes right away, returns once they and any write in progress are on disk"""
+        with self.condition:
+            pending, self.pending = self.pending, None
+            while self.writing:
+                self.condition.wait()
+        if pending is not None:
+            self._write(pending)
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.writer.join()
+        self.flush()
+
+
+_store = None
+
+def get_settings_store():
+    """The settings of this process, read from settings.json only the first time"""
+    global _store
+    if _store is None:
+        _store = SettingsStore(SETTINGS_PATH, SETTINGS_DEFAULTS)
+    return _store
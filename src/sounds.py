@@ -1,35 +1,298 @@
 import pygame
+import hashlib
+import mmap
 import os
+import sys
+import threading
+import traceback
+from collections import deque
 
+# Only configures the mixer, it is initialized by pygame.init() or the first SoundManager
 pygame.mixer.pre_init(44100, -16, 2, 512)
-pygame.init()
-pygame.mixer.init()
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 SOUND_DIR = os.path.join(BASE_DIR, "..", "assets", "sound")
+# Tracks of the MusicService, by scene
+MUSIC_TRACKS = {
+    "menu": "main_menu.mp3",
+    "game": "background_music.mp3",
+}
+CROSSFADE_MS = 1000
+# Decoded PCM of every effect, so only the first launch has to decode the MP3s
+SOUND_CACHE_DIR = os.path.join(BASE_DIR, "..", ".cache", "sound")
 
-class SoundManager:
+SOUND_FILES = {
+    "jump": "jumping.mp3",
+    "hit": "trying_to_eat.mp3",
+    "eaten": "successfully_eating.mp3",
+    "walk": "walk.mp3",
+    "gameover": "game_over.mp3",
+    "flashsound": "FAHH.mp3",
+    "ring": "ringtone.mp3",
+}
+
+# Category of every effect, each category plays on its own reserved channels
+SOUND_CATEGORIES = {
+    "jump": "player",
+    "hit": "player",
+    "walk": "player",
+    "eaten": "pickup",
+    "gameover": "ui",
+    "flashsound": "ui",
+    "ring": "ui",
+}
+CATEGORY_CHANNELS = {"player": 3, "pickup": 3, "ui": 2}
+# Voices of one sound that may play at the same time, a new one stops the oldest
+MAX_VOICES_PER_SOUND = 2
+# The music crossfades between two channels, reserved right after the effect channels
+MUSIC_CHANNELS = 2
+
+def reserve_channels():
+    """Reserve the effect and music channels, so Sound.play() never picks one of them"""
+    total = sum(CATEGORY_CHANNELS.values()) + MUSIC_CHANNELS
+    if pygame.mixer.get_num_channels() < total:
+        pygame.mixer.set_num_channels(total)
+    pygame.mixer.set_reserved(total)
+
+
+def cache_path(source_path):
+    """PCM cache file of a sound: keyed by the source file contents and the mixer format"""
+    frequency, size, channels = pygame.mixer.get_init()
+    digest = hashlib.sha1()
+    with open(source_path, "rb") as f:
+        digest.update(f.read())
+    digest.update(f"{frequency}:{size}:{channels}".encode())
+    return os.path.join(SOUND_CACHE_DIR, digest.hexdigest() + ".pcm")
+
+
+def load_cached_sound(path):
+    """Sound from a PCM cache file (read through a memory map), or None when there is none"""
+    frequency, size, channels = pygame.mixer.get_init()
+    frame_bytes = abs(size) // 8 * channels
+    try:
+        with open(path, "rb") as f:
+            length = os.fstat(f.fileno()).st_size
+            if length == 0 or length % frame_bytes:
+                return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                # The mixer copies the samples, the map is closed right after
+                return pygame.mixer.Sound(buffer=data)
+    except (OSError, ValueError, pygame.error):
+        return None
+
+
+def write_cached_sound(path, sound):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(sound.get_raw())
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+class VoiceManager:
+    """Plays effects on mixer channels reserved per category.
+
+    A sound never has more than MAX_VOICES_PER_SOUND voices: once it has, its
+    oldest voice is stopped for the new one. When all channels of a category
+    are busy the oldest voice of the category is stolen. The volume is set on
+    the channel, the Sound objects themselves are shared and never changed.
+    """
     def __init__(self):
-        self.sounds = {
-            "jump": pygame.mixer.Sound(os.path.join(SOUND_DIR, "jumping.mp3")),
-            "hit": pygame.mixer.Sound(os.path.join(SOUND_DIR, "trying_to_eat.mp3")),
-            "eaten": pygame.mixer.Sound(os.path.join(SOUND_DIR, "successfully_eating.mp3")),
-            "walk": pygame.mixer.Sound(os.path.join(SOUND_DIR, "walk.mp3")),
-            "gameover": pygame.mixer.Sound(os.path.join(SOUND_DIR, "game_over.mp3")),
-            "flashsound": pygame.mixer.Sound(os.path.join(SOUND_DIR, "FAHH.mp3")),
-            "ring": pygame.mixer.Sound(os.path.join(SOUND_DIR, "ringtone.mp3")),
-        }
+        reserve_channels()
+        self.channels = {}  # category -> [(channel index, Channel)]
+        index = 0
+        for category, count in CATEGORY_CHANNELS.items():
+            self.channels[category] = [(i, pygame.mixer.Channel(i)) for i in range(index, index + count)]
+            index += count
+        self.voices = {}  # channel index -> (start order, sound name) of its last voice
+        self.started = 0
+
+    def pick_channel(self, name, category):
+        channels = self.channels[category]
+        busy = [(self.voices[index][0], index, channel) for index, channel in channels
+                if index in self.voices and channel.get_busy()]
+        same_sound = [voice for voice in busy if self.voices[voice[1]][1] == name]
+        if len(same_sound) >= MAX_VOICES_PER_SOUND:
+            return min(same_sound)[1:]
+        for index, channel in channels:
+            if not channel.get_busy():
+                return index, channel
+        return min(busy)[1:]
+
+    def play(self, name, sound, volume=1.0):
+        index, channel = self.pick_channel(name, SOUND_CATEGORIES.get(name, "ui"))
+        self.started += 1
+        self.voices[index] = (self.started, name)
+        channel.play(sound)
+        channel.set_volume(volume)
+
+
+class SoundManager:
+    """Sound effects, decoded on a background thread (music is played by MusicService).
+
+    With prefetch every effect is queued for loading right away, otherwise an
+    effect is loaded the first time it is played. play() never waits for a
+    decode: it does nothing until the sound is ready.
+    """
+    def __init__(self, prefetch=True):
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        self.sounds = {}  # filled by the loader thread, a sound is ready once it is in here
+        self.requested = set()
+        self.voices = VoiceManager()
+        self.tasks = deque()
+        self.wakeup = threading.Condition()
+        self.loader = threading.Thread(target=self._loader, name="sound-loader", daemon=True)
+        self.loader.start()
+        if prefetch:
+            for name in SOUND_FILES:
+                self._request(name)
+
+    def _submit(self, task, urgent=False):
+        with self.wakeup:
+            if urgent:
+                self.tasks.appendleft(task)
+            else:
+                self.tasks.append(task)
+            self.wakeup.notify()
+
+    def _loader(self):
+        while True:
+            with self.wakeup:
+                while not self.tasks:
+                    self.wakeup.wait()
+                task = self.tasks.popleft()
+            try:
+                task()
+            except (pygame.error, OSError) as error:
+                print(f"Could not load a sound: {error}", file=sys.stderr)
+            except Exception:
+                # Whatever a task raises, the loader goes on with the next one
+                traceback.print_exc()
+
+    def _request(self, name, urgent=False):
+        if name in self.requested or name not in SOUND_FILES:
+            return
+        self.requested.add(name)
+        self._submit(lambda: self._load(name), urgent)
+
+    def _load(self, name):
+        source_path = os.path.join(SOUND_DIR, SOUND_FILES[name])
+        pcm_path = cache_path(source_path)
+        sound = load_cached_sound(pcm_path)
+        if sound is None:
+            sound = pygame.mixer.Sound(source_path)
+            write_cached_sound(pcm_path, sound)
+        self.sounds[name] = sound
+
+    def is_ready(self, name):
+        return name in self.sounds
 
     def play(self, name, volume=None):
-        if name in self.sounds:
-            if volume is not None:
-                self.sounds[name].set_volume(volume)
-            self.sounds[name].play()
+        sound = self.sounds.get(name)
+        if sound is None:
+            # Not decoded yet: skip this one, it will be ready for the next time
+            self._request(name, urgent=True)
+            return
+        self.voices.play(name, sound, 1.0 if volume is None else volume)
+
+
+class MusicService:
+    """Background music, crossfaded between tracks on two reserved channels.
+
+    play(track) returns at once: a track is decoded (or read from the PCM cache)
+    on a loader thread, kept in memory, and fades in over the old one as soon
+    as it is buffered. A track that cannot be loaded is silence. Volume and
+    mute only change the channel volume, the track keeps playing.
+    """
+    def __init__(self, volume=1.0, muted=False):
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        reserve_channels()
+        first = sum(CATEGORY_CHANNELS.values())
+        self.channels = [pygame.mixer.Channel(first + i) for i in range(MUSIC_CHANNELS)]
+        self.active = 0  # index of the channel playing the current track
+        self.volume = volume
+        self.muted = muted
+        self.tracks = {}  # track name -> Sound, filled by the loader thread
+        self.failed = set()
+        self.requested = set()
+        self.current = None  # track playing (or fading in)
+        self.wanted = None  # track asked for by the last play()
+        self.fade_ms = CROSSFADE_MS
+        self.lock = threading.Lock()
+        self.loads = deque()
+        self.wakeup = threading.Condition()
+        self.loader = threading.Thread(target=self._loader, name="music-loader", daemon=True)
+        self.loader.start()
+
+    def _loader(self):
+        while True:
+            with self.wakeup:
+                while not self.loads:
+                    self.wakeup.wait()
+                track = self.loads.popleft()
+            try:
+                self.tracks[track] = self._load(track)
+            except (pygame.error, OSError):
+                self.failed.add(track)
+            # Also when it failed: the wanted track is silence then, the old one fades out
+            self._switch()
+
+    def _load(self, track):
+        source_path = os.path.join(SOUND_DIR, MUSIC_TRACKS[track])
+        pcm_path = cache_path(source_path)
+        sound = load_cached_sound(pcm_path)
+        if sound is None:
+            sound = pygame.mixer.Sound(source_path)
+            write_cached_sound(pcm_path, sound)
+        return sound
+
+    def channel_volume(self):
+        return 0.0 if self.muted else self.volume
+
+    def _switch(self):
+        """Crossfade to the wanted track, once it is buffered"""
+        with self.lock:
+            if self.wanted == self.current:
+                return
+            sound = self.tracks.get(self.wanted) if self.wanted else None
+            if self.wanted and sound is None and self.wanted not in self.failed:
+                # Still loading, the current track plays on until it is buffered
+                return
+            if self.current is not None:
+                self.channels[self.active].fadeout(self.fade_ms)
+            self.current = None
+            if sound is not None:
+                self.active = 1 - self.active
+                channel = self.channels[self.active]
+                channel.set_volume(self.channel_volume())
+                channel.play(sound, loops=-1, fade_ms=self.fade_ms)
+                self.current = self.wanted
 
-    def play_music(self):
-        pygame.mixer.music.load(os.path.join(SOUND_DIR, "background_music.mp3"))
-        pygame.mixer.music.play(-1)
+    def play(self, track, fade_ms=CROSSFADE_MS):
+        """Switch to a track of MUSIC_TRACKS (None fades the music out)"""
+        if track == self.wanted:
+            return
+        self.wanted = track
+        self.fade_ms = fade_ms
+        if track is None or track in self.tracks or track in self.failed:
+            self._switch()
+        elif track not in self.requested and track not in self.failed:
+            self.requested.add(track)
+            with self.wakeup:
+                self.loads.append(track)
+                self.wakeup.notify()
 
-    def stop_music(self):
-        pygame.mixer.music.stop()
+    def stop(self, fade_ms=CROSSFADE_MS):
+        self.play(None, fade_ms)
 
+    def set_volume(self, volume, muted=False):
+        self.volume = volume
+        self.muted = muted
+        with self.lock:
+            if self.current is not None:
+                self.channels[self.active].set_volume(self.channel_volume())
@@ -0,0 +1,62 @@
+import json
+import sys
+import time
+
+
+class StartupTracer:
+    """Wall time of every load phase between process start and the first frame.
+
+    mark(name) closes a phase: everything since the previous mark is booked on it.
+    """
+    def __init__(self):
+        self.start = time.perf_counter_ns()
+        self.last_mark = self.start
+        self.phases = []  # (name, duration ns)
+        self.finished = False
+
+    def mark(self, name):
+        if self.finished:
+            return
+        now = time.perf_counter_ns()
+        self.phases.append((name, now - self.last_mark))
+        self.last_mark = now
+
+    def total_ns(self):
+        return self.last_mark - self.start
+
+    def to_dict(self, budget_ms=None):
+        total_ms = self.total_ns() / 1e6
+        report = {
+            "time_to_first_frame_ms": total_ms,
+            "phases": [{"name": name, "ms": duration / 1e6} for name, duration in self.phases],
+        }
+        if budget_ms is not None:
+            report["budget_ms"] = budget_ms
+            report["over_budget"] = total_ms > budget_ms
+        return report
+
+    def format_report(self, budget_ms=None):
+        lines = [f"{'startup phase':<32}{'ms':>10}{'total ms':>10}"]
+        elapsed = 0
+        for name, duration in self.phases:
+            elapsed += duration
+            lines.append(f"{name:<32}{duration / 1e6:>10.1f}{elapsed / 1e6:>10.1f}")
+        lines.append(f"{'time to first frame':<32}{self.total_ns() / 1e6:>20.1f}")
+        if budget_ms is not None:
+            verdict = "OVER BUDGET" if self.total_ns() / 1e6 > budget_ms else "within budget"
+            lines.append(f"budget {budget_ms:.0f} ms: {verdict}")
+        return "\n".join(lines)
+
+    def finish(self, path=None, budget_ms=None):
+        """Stop tracing and print the report, or write it as JSON when a path is given.
+        Returns True when the startup went over budget_ms."""
+        self.finished = True
+        if path is None or path == "-":
+            print(self.format_report(budget_ms))
+        else:
+            with open(path, "w") as f:
+                json.dump(self.to_dict(budget_ms), f, indent=2)
+        if budget_ms is not None and self.total_ns() / 1e6 > budget_ms:
+            print(f"Startup took {self.total_ns() / 1e6:.0f} ms, over the {budget_ms:.0f} ms budget", file=sys.stderr)
+            return True
+        return False
@@ -0,0 +1,134 @@
+import json
+import time
+import weakref
+from collections import deque
+
+# Frames of total live surface memory kept to compute the steady state
+STEADY_STATE_FRAMES = 600
+# A category is flagged once its live count went up at this many round starts in a row
+GROWTH_ROUNDS = 3
+
+
+class SurfaceTracker:
+    """Debug accounting of the Surfaces the game creates (--track-surfaces).
+
+    track(surface, category) registers a surface and returns it unchanged, so it
+    can wrap any expression that creates one. Every category keeps how many
+    surfaces were created and freed, the bytes still alive, their peak and the
+    lifetime of freed surfaces. When disabled, track() only returns the surface.
+    """
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.refs = {}  # id(weakref) -> (weakref, category, bytes, created at)
+        self.categories = {}
+        self.live_bytes = 0
+        self.peak_bytes = 0
+        self.frame_bytes = deque(maxlen=STEADY_STATE_FRAMES)
+        self.rounds = []  # live count per category at the start of every round
+
+    def _category(self, name):
+        stats = self.categories.get(name)
+        if stats is None:
+            stats = self.categories[name] = {
+                "created": 0, "freed": 0, "live": 0,
+                "live_bytes": 0, "peak_bytes": 0, "lifetime_total": 0.0,
+            }
+        return stats
+
+    def track(self, surface, category):
+        if not self.enabled or surface is None:
+            return surface
+        size = surface.get_pitch() * surface.get_height()
+        ref = weakref.ref(surface, self._freed)
+        self.refs[id(ref)] = (ref, category, size, time.perf_counter())
+        stats = self._category(category)
+        stats["created"] += 1
+        stats["live"] += 1
+        stats["live_bytes"] += size
+        stats["peak_bytes"] = max(stats["peak_bytes"], stats["live_bytes"])
+        self.live_bytes += size
+        self.peak_bytes = max(self.peak_bytes, self.live_bytes)
+        return surface
+
+    def _freed(self, ref):
+        _, category, size, created = self.refs.pop(id(ref))
+        stats = self.categories[category]
+        stats["freed"] += 1
+        stats["live"] -= 1
+        stats["live_bytes"] -= size
+        stats["lifetime_total"] += time.perf_counter() - created
+        self.live_bytes -= size
+
+    def end_frame(self):
+        if self.enabled:
+            self.frame_bytes.append(self.live_bytes)
+
+    def new_round(self):
+        """Snapshot the live counts, called whenever a new round starts (reset_game)"""
+        if self.enabled:
+            self.rounds.append({name: stats["live"] for name, stats in self.categories.items()})
+
+    def growing_categories(self):
+        """Categories whose live count went up at each of the last GROWTH_ROUNDS round starts"""
+        growing = []
+        if len(self.rounds) <= GROWTH_ROUNDS:
+            return growing
+        recent = self.rounds[-(GROWTH_ROUNDS + 1):]
+        for name in self.categories:
+            counts = [snapshot.get(name, 0) for snapshot in recent]
+            if all(later > earlier for earlier, later in zip(counts, counts[1:])):
+                growing.append(name)
+        return growing
+
+    def steady_state_bytes(self):
+        """Median live surface memory over the last STEADY_STATE_FRAMES frames"""
+        if not self.frame_bytes:
+            return self.live_bytes
+        return sorted(self.frame_bytes)[len(self.frame_bytes) // 2]
+
+    def to_dict(self):
+        categories = {}
+        for name, stats in sorted(self.categories.items(), key=lambda item: item[1]["peak_bytes"], reverse=True):
+            categories[name] = {
+                "created": stats["created"],
+                "freed": stats["freed"],
+                "live": stats["live"],
+                "live_bytes": stats["live_bytes"],
+                "peak_bytes": stats["peak_bytes"],
+                "mean_lifetime_ms": stats["lifetime_total"] / stats["freed"] * 1000 if stats["freed"] else None,
+            }
+        return {
+            "live_bytes": self.live_bytes,
+            "peak_bytes": self.peak_bytes,
+            "steady_state_bytes": self.steady_state_bytes(),
+            "rounds": len(self.rounds),
+            "growing_categories": self.growing_categories(),
+            "categories": categories,
+        }
+
+    def format_report(self):
+        report = self.to_dict()
+        mib = 1024 * 1024
+        lines = [
+            f"surface memory: peak {report['peak_bytes'] / mib:.1f} MiB, "
+            f"steady state {report['steady_state_bytes'] / mib:.1f} MiB, "
+            f"live now {report['live_bytes'] / mib:.1f} MiB",
+            f"{'category':<12}{'created':>9}{'freed':>9}{'live':>7}{'live MiB':>10}{'peak MiB':>10}{'lifetime ms':>13}",
+        ]
+        for name, stats in report["categories"].items():
+            lifetime = f"{stats['mean_lifetime_ms']:.1f}" if stats["mean_lifetime_ms"] is not None else "-"
+            lines.append(f"{name:<12}{stats['created']:>9}{stats['freed']:>9}{stats['live']:>7}"
+                         f"{stats['live_bytes'] / mib:>10.2f}{stats['peak_bytes'] / mib:>10.2f}{lifetime:>13}")
+        for name in report["growing_categories"]:
+            lines.append(f"LEAK? '{name}' surfaces keep growing across the last {GROWTH_ROUNDS} rounds")
+        return "\n".join(lines)
+
+    def finish(self, path=None):
+        """Print the report, or write it as JSON when a path is given"""
+        if not self.enabled:
+            return
+        if path is None or path == "-":
+            print(self.format_report())
+        else:
+            with open(path, "w") as f:
+                json.dump(self.to_dict(), f, indent=2)